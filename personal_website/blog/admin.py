@@ -21,7 +21,7 @@ class ArticleAdmin(admin.ModelAdmin):
     # Стандартная форма тектового поля заменена на HTML форму TinyMCE.
     formfield_overrides = FORMFIELD_OVERRIDES  # type: ignore[assignment]
 
-    list_display = ("title", "published_at", "modified_at", "public")
+    list_display = ("title", "published_at", "modified_at", "public", "comment_count")
     list_filter = ("series", "topics", "categories", "public")
 
     fieldsets = (
@@ -7,3 +7,7 @@ class BlogConfig(AppConfig):  # noqa: D101
     name = "blog"
     verbose_name = "Блог"
     default_auto_field = "django.db.models.AutoField"
+
+    def ready(self) -> None:
+        """При инициации приложения подключить сигналы."""
+        from blog import signals  # noqa: F401
@@ -0,0 +1,33 @@
+"""Команда для исправления счетчиков комментариев статей."""
+
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.models import Article
+
+logger = logging.getLogger(settings.PROJECT_NAME)
+
+
+class Command(BaseCommand):
+    """Сверить счетчики комментариев статей с количеством комментариев и исправить расхождения.
+
+    Счетчики изменяются сигналами при создании и удалении комментариев, но могут разойтись
+    с количеством комментариев после массовых операций, которые не отправляют сигналы
+    (`bulk_create`, изменение статьи комментария, загрузка данных). Расхождения находятся
+    и исправляются одним запросом.
+
+    Examples:
+        ```
+        python manage.py reconcile_comment_counts
+        ```
+    """
+
+    help = "Исправить счетчики комментариев статей, которые разошлись с количеством комментариев"
+
+    def handle(self, *args, **options) -> None:  # noqa: ARG002, D102
+        counter = Article.objects.reconcile_comment_counts()
+        message = f"Исправлены счетчики комментариев {counter} статей"
+        logger.info(message)
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,62 @@
+"""Команда для подготовки HTML статей, содержание которых изменилось с момента последней обработки."""
+
+import logging
+from argparse import ArgumentParser
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.models import Article
+from personal_website.cache import bump_generation
+
+logger = logging.getLogger(settings.PROJECT_NAME)
+
+RENDERED_FIELDS = ("content_html", "toc", "word_count", "reading_time", "content_hash")
+
+
+class Command(BaseCommand):
+    """Заново подготовить HTML, оглавление и время чтения статей, хэш содержания которых устарел.
+
+    Хэш содержания учитывает версию обработки (`RENDER_VERSION`), поэтому после изменения правил обработки
+    или добавления статей без подготовленного HTML (например, загрузкой данных) команда обрабатывает только
+    такие статьи. Миграции не обрабатывают статьи сами, чтобы не зависеть от текущей версии обработки.
+
+    HTML сохраняется без вызова `Article.save` и сигналов, поэтому поколение кэша блога увеличивается вручную.
+
+    Examples:
+        ```
+        python manage.py render_articles
+        python manage.py render_articles --batch-size 50
+        ```
+    """
+
+    help = "Заново подготовить HTML статей, содержание или версия обработки которых изменились"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:  # noqa: D102
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Количество статей, сохраняемых в базу данных одним запросом",
+        )
+
+    def handle(self, *args, **options) -> None:  # noqa: ARG002, D102
+        batch_size: int = options["batch_size"]
+        articles = Article.objects.only("pk", "content", *RENDERED_FIELDS)
+
+        batch: list[Article] = []
+        counter = 0
+        for article in articles.iterator(chunk_size=batch_size):
+            if article.render_content():
+                batch.append(article)
+            if len(batch) >= batch_size:
+                counter += Article.objects.bulk_update(batch, RENDERED_FIELDS)
+                batch.clear()
+        if batch:
+            counter += Article.objects.bulk_update(batch, RENDERED_FIELDS)
+        if counter:
+            bump_generation("blog")
+
+        message = f"Подготовлен HTML {counter} статей"
+        logger.info(message)
+        self.stdout.write(self.style.SUCCESS(message))
@@ -1,10 +1,78 @@
 """Менеджеры блога."""
 
+from typing import Self
+
+from django.db.models import Count, F, IntegerField, OuterRef, Prefetch, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+
 from personal_website.managers import PublicManager
 
 
+def comment_count_subquery() -> Coalesce:
+    """Коррелированный подзапрос количества комментариев статьи."""
+    from blog.models import Comment
+
+    comments = (
+        Comment.objects.filter(article=OuterRef("pk"))
+        .order_by()
+        .values("article")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(comments, output_field=IntegerField()), Value(0))
+
+
+class ArticleQuerySet(QuerySet):
+    """Набор статей."""
+
+    def with_comment_counts(self) -> Self:
+        """Добавить точное количество комментариев статьи.
+
+        Количество считается коррелированным подзапросом, а не соединением с таблицей комментариев,
+        поэтому к запросу не добавляется группировка и он остается совместимым с фильтрами по сериям,
+        темам и категориям. Свойство `Article.number_of_comments` использует это значение, если оно есть,
+        вместо отдельного запроса для каждой статьи.
+        """
+        return self.annotate(annotated_comments_count=comment_count_subquery())
+
+    def most_discussed(self) -> Self:
+        """Статьи от самых обсуждаемых к менее обсуждаемым по счетчику комментариев (по индексу)."""
+        return self.order_by("-comment_count", "-published_at")
+
+    def reconcile_comment_counts(self) -> int:
+        """Исправить счетчики комментариев, которые разошлись с количеством комментариев.
+
+        Returns:
+            int: Количество исправленных статей.
+        """
+        drifted = self.with_comment_counts().exclude(comment_count=F("annotated_comments_count"))
+        articles = self.model._default_manager.filter(pk__in=drifted.values("pk"))  # noqa: SLF001
+        return articles.update(comment_count=comment_count_subquery())
+
+    def for_list(self) -> Self:
+        """Не загружать исходное содержание и поисковые данные: в списках выводится подготовленный HTML."""
+        return self.defer("content", "search_text", "search_vector", "toc")
+
+    def with_relations(self) -> Self:
+        """Загрузить публичные серии, темы и категории статей тремя запросами на весь набор статей."""
+        from blog.models import Category, Series, Topic
+
+        return self.prefetch_related(
+            Prefetch("series", queryset=Series.published.all()),
+            Prefetch("topics", queryset=Topic.published.all()),
+            Prefetch("categories", queryset=Category.published.all()),
+        )
+
+
 class PublicArticleManager(PublicManager):
-    """Менеджер для работы с публичными статьями."""
+    """Менеджер для работы с публичными статьями.
+
+    Серии, темы и категории загружаются методом `with_relations` только там, где они выводятся.
+    Количество комментариев хранится в самой статье.
+    """
+
+    def get_queryset(self) -> ArticleQuerySet:  # noqa: D102
+        return ArticleQuerySet(self.model, using=self._db).filter(public=True)
 
 
 class PublicSeriesManager(PublicManager):
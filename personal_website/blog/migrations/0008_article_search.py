@@ -0,0 +1,51 @@
+# Generated by Django 5.1.5 on 2026-10-18 04:06
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+from personal_website.db import PostgreSQLAddIndex
+from personal_website.utils import html_to_text
+
+
+def fill_search_text(apps, schema_editor):
+    """Составить текст для поиска и поисковые векторы ранее созданных статей."""
+    from blog.search import article_search_vector
+
+    article_model = apps.get_model("blog", "Article")
+    articles = list(article_model.objects.only("pk", "content"))
+    for article in articles:
+        article.search_text = html_to_text(article.content)
+    article_model.objects.bulk_update(articles, ["search_text"], batch_size=500)
+    if schema_editor.connection.vendor == "postgresql":
+        article_model.objects.update(search_vector=article_search_vector())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0007_alter_article_options_alter_category_options_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="search_text",
+            field=models.TextField(blank=True, editable=False, verbose_name="Текст для поиска"),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False,
+                null=True,
+                verbose_name="Поисковый вектор",
+            ),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        PostgreSQLAddIndex(
+            model_name="article",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["search_vector"], name="blog_article_search_idx"),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.5 on 2026-10-18 04:18
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_counts(apps, schema_editor):
+    """Заполнить счетчики комментариев ранее созданных статей одним запросом."""
+    article_model = apps.get_model("blog", "Article")
+    comment_model = apps.get_model("blog", "Comment")
+    comments = (
+        comment_model.objects.filter(article=OuterRef("pk"))
+        .order_by()
+        .values("article")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    article_model.objects.update(
+        comment_count=Coalesce(Subquery(comments, output_field=models.IntegerField()), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0008_article_search"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Комментарии"),
+        ),
+        migrations.RunPython(fill_comment_counts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(fields=["-comment_count", "-published_at"], name="blog_article_discussed_idx"),
+        ),
+    ]
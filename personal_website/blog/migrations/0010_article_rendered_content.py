@@ -0,0 +1,37 @@
+# Generated by Django 5.1.5 on 2026-10-18 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0009_article_comment_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="content_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name="Хэш содержания"),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="content_html",
+            field=models.TextField(blank=True, editable=False, verbose_name="Подготовленное содержание"),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="reading_time",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Время чтения, мин."),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="toc",
+            field=models.JSONField(default=list, editable=False, verbose_name="Оглавление"),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Количество слов"),
+        ),
+    ]
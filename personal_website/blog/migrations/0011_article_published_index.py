@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 04:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0010_article_rendered_content"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(fields=["published_at", "id"], name="blog_article_published_idx"),
+        ),
+    ]
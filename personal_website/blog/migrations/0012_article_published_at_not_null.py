@@ -0,0 +1,31 @@
+# Generated by Django 5.1.5 on 2026-10-18 05:20
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+from personal_website.db import PostgreSQLAlterField
+
+
+def fill_published_at(apps, schema_editor):
+    """Указать время последнего изменения как дату публикации статей, у которых она не указана."""
+    apps.get_model("blog", "Article").objects.filter(published_at__isnull=True).update(published_at=F("modified_at"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0011_article_published_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_published_at, migrations.RunPython.noop),
+        PostgreSQLAlterField(
+            model_name="article",
+            name="published_at",
+            field=models.DateTimeField(
+                blank=True,
+                default=django.utils.timezone.now,
+                verbose_name="Дата публикации",
+            ),
+        ),
+    ]
@@ -1,12 +1,21 @@
 """Модели блога."""
 
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.urls import reverse
 from django.utils.timezone import now
 
-from blog.managers import PublicArticleManager, PublicCategoryManager, PublicSeriesManager, PublicTopicManager
-from personal_website.utils import get_unique_slug
+from blog.managers import (
+    ArticleQuerySet,
+    PublicArticleManager,
+    PublicCategoryManager,
+    PublicSeriesManager,
+    PublicTopicManager,
+)
+from blog.rendering import content_hash, render_content
+from personal_website.utils import get_unique_slug, html_to_text
 
 
 class Category(models.Model):
@@ -127,7 +136,7 @@ class Article(models.Model):
     title = models.CharField("Заголовок", max_length=255, unique=True)
     description = models.CharField("Описание", max_length=255, blank=True)
     content = models.TextField("Содержание")
-    published_at = models.DateTimeField("Дата публикации", blank=True, null=True, default=now)
+    published_at = models.DateTimeField("Дата публикации", blank=True, default=now)
     modified_at = models.DateTimeField("Дата последнего изменения", auto_now=True)
     slug = models.SlugField("Слаг", blank=True, unique=True)
     series = models.ManyToManyField(Series, blank=True)
@@ -136,31 +145,90 @@ class Article(models.Model):
     image = models.ImageField("Картинка", upload_to="blog/articles/", blank=True)
     public = models.BooleanField("Опубликовано", default=True)
     author = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
-
-    objects = models.Manager()
+    search_text = models.TextField("Текст для поиска", blank=True, editable=False)
+    search_vector = SearchVectorField("Поисковый вектор", null=True, editable=False)
+    comment_count = models.PositiveIntegerField("Комментарии", default=0, editable=False)
+    content_html = models.TextField("Подготовленное содержание", blank=True, editable=False)
+    toc = models.JSONField("Оглавление", default=list, editable=False)
+    word_count = models.PositiveIntegerField("Количество слов", default=0, editable=False)
+    reading_time = models.PositiveIntegerField("Время чтения, мин.", default=0, editable=False)
+    content_hash = models.CharField("Хэш содержания", max_length=64, blank=True, editable=False)
+
+    objects = ArticleQuerySet.as_manager()
     published = PublicArticleManager()
 
     class Meta:  # noqa: D106
         ordering = ("-published_at",)
         verbose_name_plural = "Статьи"
+        indexes = (
+            models.Index(fields=("published_at", "id"), name="blog_article_published_idx"),
+            GinIndex(fields=("search_vector",), name="blog_article_search_idx"),
+            models.Index(fields=("-comment_count", "-published_at"), name="blog_article_discussed_idx"),
+        )
 
     def __str__(self) -> str:
         """Строковое представление статьи возвращает заголовок."""
         return self.title
 
     def save(self, *args, **kwargs) -> None:
-        """Если слаг не указан, то слаг определяется автоматически по заголовку."""
+        """Операции, выполняемые при каждом сохранении статьи.
+
+        - Если слаг не указан, то слаг определяется автоматически по заголовку.
+        - Из содержания статьи без тэгов HTML составляется текст для поиска,
+          по которому затем обновляется поисковый вектор статьи.
+        - Счетчик комментариев не сохраняется из объекта: его изменяют только атомарные обновления
+          при создании и удалении комментариев, поэтому сохранение статьи не затирает их значением,
+          загруженным из базы данных ранее.
+        - Если изменилось содержание статьи, то заново готовится HTML для вывода на страницах:
+          очищенная разметка, оглавление, количество слов и время чтения.
+        """
         if not self.slug:
             self.slug = get_unique_slug(self, self.title)
+        self.search_text = html_to_text(self.content)
+        self.render_content()
+        updating = not self._state.adding and not args and not kwargs.get("force_insert")
+        if updating and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "comment_count"
+            ]
         super().save(*args, **kwargs)
 
+        from blog.search import update_search_vectors
+
+        update_search_vectors([self.pk])
+
     def get_absolute_url(self) -> str:
         """Абсолютная ссылка на статью определяется слагом статьи."""
         return reverse("blog:article", args=[str(self.slug)])
 
+    def render_content(self) -> bool:
+        """Подготовить HTML статьи, если хэш содержания отличается от хэша подготовленной копии.
+
+        Returns:
+            bool: HTML статьи подготовлен заново.
+        """
+        new_hash = content_hash(self.content)
+        if new_hash == self.content_hash:
+            return False
+        rendered = render_content(self.content)
+        self.content_html = rendered.html
+        self.toc = [entry.model_dump() for entry in rendered.toc]
+        self.word_count = rendered.word_count
+        self.reading_time = rendered.reading_time
+        self.content_hash = new_hash
+        return True
+
     @property
     def number_of_comments(self) -> int:
-        """Количество комментариев."""
+        """Точное количество комментариев. Значение аннотации `with_comment_counts`, если она есть.
+
+        Для списков и сортировки используется счетчик `comment_count`, который не требует запроса.
+        """
+        annotated: int | None = getattr(self, "annotated_comments_count", None)
+        if annotated is not None:
+            return annotated
         return Comment.objects.filter(article=self).count()
 
 
@@ -0,0 +1,246 @@
+"""
+Подготовка HTML статей при сохранении.
+
+Содержание статьи редактируется в TinyMCE и хранится как есть, а на страницах выводится подготовленная
+копия, которая строится один раз при сохранении статьи:
+
+- из разметки удаляются тэги и атрибуты не из списка разрешенных, ссылки с опасными схемами
+  (`javascript:` и др.), а также содержимое тэгов `script`, `style` и подобных;
+- в атрибуте `style` остаются только свойства оформления, которые задает редактор (цвет текста и фона,
+  выравнивание, обтекание, размеры и т.п.);
+- встроенные плееры (`iframe`) остаются только с сайтов из списка разрешенных, видео и аудио из плагина
+  `media` остаются с адресами файлов;
+- изображениям и встроенным плеерам добавляется отложенная загрузка (`loading="lazy"`);
+- заголовкам добавляются якоря, по которым строится оглавление;
+- считаются количество слов и время чтения.
+
+Результат зависит только от содержания статьи и версии обработки, поэтому статья обрабатывается заново,
+только если изменился хэш ее содержания.
+"""
+
+import hashlib
+import re
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from django.utils.html import escape
+
+from blog.schemas import RenderedContent, TocEntry
+from personal_website.utils import get_slug
+
+# Версия обработки. При изменении правил обработки версия увеличивается, чтобы хэши всех статей изменились.
+RENDER_VERSION = 2
+
+# Разрешенные тэги и их атрибуты. Атрибуты `class` и `style` разрешены для всех тэгов.
+ALLOWED_TAGS: dict[str, frozenset[str]] = {
+    **{
+        tag: frozenset()
+        for tag in (
+            "p", "br", "hr", "div", "span", "strong", "b", "em", "i", "u", "s", "sub", "sup", "small",
+            "blockquote", "pre", "code", "ul", "ol", "li", "dl", "dt", "dd", "figure", "figcaption",
+            "table", "thead", "tbody", "tfoot", "tr", "caption",
+        )
+    },
+    **{f"h{level}": frozenset({"id"}) for level in range(1, 7)},
+    "a": frozenset({"href", "title", "target", "rel"}),
+    "img": frozenset({"src", "alt", "title", "width", "height"}),
+    "td": frozenset({"colspan", "rowspan"}),
+    "th": frozenset({"colspan", "rowspan", "scope"}),
+    "iframe": frozenset({"src", "width", "height", "title", "allow", "allowfullscreen", "frameborder"}),
+    "video": frozenset({"src", "width", "height", "poster", "controls", "loop", "muted", "preload", "playsinline"}),
+    "audio": frozenset({"src", "controls", "loop", "muted", "preload"}),
+    "source": frozenset({"src", "type"}),
+}  # fmt: skip
+GLOBAL_ATTRIBUTES = frozenset({"class", "style"})
+
+# Тэги, которые удаляются вместе с содержимым.
+DROPPED_CONTENT_TAGS = frozenset(
+    {"script", "style", "object", "embed", "template", "noscript", "svg", "math"},
+)
+
+# Тэги без закрывающего тэга.
+VOID_TAGS = frozenset({"br", "hr", "img", "source"})
+
+# Сайты, встроенные плееры которых (`iframe` из плагина `media`) разрешены в статьях.
+# Остальные `iframe` удаляются вместе с содержимым.
+EMBED_HOSTS = frozenset(
+    {
+        "www.youtube.com", "youtube.com", "www.youtube-nocookie.com", "youtube-nocookie.com",
+        "player.vimeo.com", "vk.com", "vkvideo.ru", "rutube.ru",
+    },
+)  # fmt: skip
+
+# Свойства атрибута `style`, которые задает редактор: цвет текста и фона, выравнивание, отступы,
+# обтекание и размеры изображений и таблиц, шрифт. Остальные свойства удаляются.
+ALLOWED_STYLE_PROPERTIES = frozenset(
+    {
+        "color", "background-color", "text-align", "vertical-align", "float", "display", "width", "height",
+        "margin-left", "margin-right", "padding-left", "padding-right", "font-size", "font-family",
+        "border-collapse", "border-width", "border-style", "border-color",
+    },
+)  # fmt: skip
+
+# Значение свойства стиля: слова, числа с единицами, цвета `#hex` и `rgb()`, названия шрифтов в кавычках.
+# Функции `url()`, `expression()`, экранирование и комментарии CSS в значение не проходят.
+STYLE_VALUE_PATTERN = re.compile(r"(?:[#\w.%-]+|rgba?\([\d\s.,%]+\)|'[\w -]+'|\"[\w -]+\"|,|\s)+")
+
+# Тэги, которые закрываются следующим таким же тэгом (`<li>один<li>два`).
+IMPLICITLY_CLOSED_TAGS = frozenset({"p", "li", "dt", "dd", "tr", "td", "th"})
+
+# Атрибуты со ссылками и разрешенные в них схемы. Ссылки без схемы (относительные, якоря) разрешены.
+URL_ATTRIBUTES = frozenset({"href", "src", "poster"})
+ALLOWED_URL_SCHEMES = frozenset({"http", "https", "mailto", "tel"})
+
+# Уровни заголовков, которые попадают в оглавление.
+TOC_LEVELS = frozenset({1, 2, 3})
+
+
+def content_hash(content: str) -> str:
+    """Хэш содержания статьи с учетом версии обработки."""
+    return hashlib.sha256(f"{RENDER_VERSION}:{content}".encode()).hexdigest()
+
+
+def is_safe_url(url: str) -> bool:
+    """Ссылка не содержит схем, которые могут выполнить код (`javascript:`, `data:` и др.)."""
+    scheme = urlsplit("".join(url.split())).scheme
+    return not scheme or scheme.lower() in ALLOWED_URL_SCHEMES
+
+
+def is_embed_url(url: str) -> bool:
+    """Ссылка на встроенный плеер сайта из списка разрешенных по HTTPS или без схемы (`//www.youtube.com/...`)."""
+    parts = urlsplit(url.strip())
+    return parts.scheme in {"", "https"} and parts.hostname in EMBED_HOSTS
+
+
+def clean_style(style: str) -> str:
+    """Оставить в значении атрибута `style` только разрешенные свойства с безопасными значениями."""
+    declarations = []
+    for declaration in style.split(";"):
+        name, _, value = declaration.partition(":")
+        name, value = name.strip().lower(), value.strip()
+        if name in ALLOWED_STYLE_PROPERTIES and STYLE_VALUE_PATTERN.fullmatch(value):
+            declarations.append(f"{name}: {value};")
+    return " ".join(declarations)
+
+
+class ArticleRenderer(HTMLParser):
+    """Разбор HTML статьи с очисткой разметки, якорями заголовков, оглавлением и подсчетом слов."""
+
+    def __init__(self) -> None:
+        """Подготовить пустой результат."""
+        super().__init__(convert_charrefs=True)
+        self.output: list[str] = []
+        self.open_tags: list[str] = []
+        self.dropped_depth = 0
+        self.word_count = 0
+        self.toc: list[TocEntry] = []
+        self.anchors: set[str] = set()
+        # Открытый заголовок: уровень, позиция открывающего тэга в результате, якорь из разметки и текст.
+        self.heading: tuple[int, int, str, list[str]] | None = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        """Вывести разрешенный открывающий тэг с разрешенными атрибутами."""
+        if tag in DROPPED_CONTENT_TAGS or (tag == "iframe" and (self.dropped_depth or not self.is_embed(attrs))):
+            self.dropped_depth += 1
+            return
+        if self.dropped_depth or tag not in ALLOWED_TAGS:
+            return
+        if tag in IMPLICITLY_CLOSED_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            self.handle_endtag(tag)
+        attributes = self.clean_attributes(tag, attrs)
+        if tag in {"img", "iframe"}:
+            attributes["loading"] = "lazy"
+        if tag == "img":
+            attributes["decoding"] = "async"
+        if tag == "a" and attributes.get("target") == "_blank":
+            attributes["rel"] = "noopener noreferrer"
+        if tag[0] == "h" and tag[1:].isdigit():
+            # Текст заголовка еще не разобран, поэтому якорь добавляется при закрытии заголовка.
+            self.heading = (int(tag[1:]), len(self.output), attributes.pop("id", ""), [])
+        rendered = "".join(f' {name}="{escape(value)}"' for name, value in attributes.items())
+        self.output.append(f"<{tag}{rendered}>")
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        """Самозакрывающийся тэг (`<br/>`) обрабатывается как открывающий."""
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        """Закрыть тэг и все незакрытые тэги внутри него. Закрывающие тэги без открывающих пропускаются."""
+        if tag in DROPPED_CONTENT_TAGS or (tag == "iframe" and self.dropped_depth):
+            self.dropped_depth = max(self.dropped_depth - 1, 0)
+            return
+        if self.dropped_depth or tag not in self.open_tags:
+            return
+        while self.open_tags:
+            current = self.open_tags.pop()
+            if current[0] == "h" and current[1:].isdigit():
+                self.close_heading()
+            self.output.append(f"</{current}>")
+            if current == tag:
+                break
+
+    @staticmethod
+    def is_embed(attrs: list[tuple[str, str | None]]) -> bool:
+        """Тэг `iframe` встраивает плеер сайта из списка разрешенных."""
+        return any(name == "src" and is_embed_url(value or "") for name, value in attrs)
+
+    @staticmethod
+    def clean_attributes(tag: str, attrs: list[tuple[str, str | None]]) -> dict[str, str]:
+        """Разрешенные атрибуты тэга с безопасными ссылками и стилями."""
+        allowed = ALLOWED_TAGS[tag] | GLOBAL_ATTRIBUTES
+        attributes = {}
+        for name, value in attrs:
+            if name not in allowed or (name in URL_ATTRIBUTES and not is_safe_url(value or "")):
+                continue
+            cleaned = clean_style(value or "") if name == "style" else value or ""
+            if name != "style" or cleaned:
+                attributes[name] = cleaned
+        return attributes
+
+    def handle_data(self, data: str) -> None:
+        """Вывести экранированный текст и посчитать в нем слова."""
+        if self.dropped_depth:
+            return
+        self.output.append(escape(data))
+        self.word_count += len(data.split())
+        if self.heading is not None:
+            self.heading[3].append(data)
+
+    def close_heading(self) -> None:
+        """Добавить заголовку якорь и, если уровень заголовка подходит, пункт оглавления."""
+        if self.heading is None:
+            return
+        level, position, anchor, parts = self.heading
+        self.heading = None
+        title = " ".join("".join(parts).split())
+        anchor = self.unique_anchor(anchor or get_slug(title) or "section")
+        start_tag = self.output[position]
+        self.output[position] = f'{start_tag[:-1]} id="{escape(anchor)}">'
+        self.anchors.add(anchor)
+        if level in TOC_LEVELS and title:
+            self.toc.append(TocEntry(level=level, id=anchor, title=title))
+
+    def unique_anchor(self, anchor: str) -> str:
+        """Якорь, не совпадающий с якорями предыдущих заголовков статьи."""
+        candidate, number = anchor, 1
+        while candidate in self.anchors:
+            number += 1
+            candidate = f"{anchor}-{number}"
+        return candidate
+
+    def render(self, content: str) -> RenderedContent:
+        """Разобрать HTML статьи и закрыть незакрытые тэги."""
+        self.feed(content)
+        self.close()
+        while self.open_tags:
+            self.handle_endtag(self.open_tags[-1])
+        return RenderedContent(html="".join(self.output), toc=self.toc, word_count=self.word_count)
+
+
+def render_content(content: str) -> RenderedContent:
+    """Подготовить HTML статьи для вывода на страницах."""
+    return ArticleRenderer().render(content)
@@ -0,0 +1,31 @@
+"""Схемы для генерации и валидации данных блога."""
+
+import math
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Скорость чтения в словах в минуту для расчета времени чтения.
+WORDS_PER_MINUTE = 200
+
+
+class TocEntry(BaseModel):
+    """Пункт оглавления статьи."""
+
+    model_config = ConfigDict(frozen=True)
+
+    level: int = Field(ge=1, le=6, description="Уровень заголовка")
+    id: str = Field(description="Якорь заголовка")
+    title: str = Field(description="Текст заголовка")
+
+
+class RenderedContent(BaseModel):
+    """Содержание статьи, подготовленное для вывода на страницах."""
+
+    html: str = Field(description="Очищенный HTML с якорями заголовков и отложенной загрузкой изображений")
+    toc: list[TocEntry] = Field(default_factory=list, description="Оглавление")
+    word_count: int = Field(default=0, ge=0, description="Количество слов")
+
+    @property
+    def reading_time(self) -> int:
+        """Время чтения в минутах, не меньше одной минуты для непустой статьи."""
+        return math.ceil(self.word_count / WORDS_PER_MINUTE)
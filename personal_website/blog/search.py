@@ -0,0 +1,141 @@
+"""
+Полнотекстовый поиск по статьям блога.
+
+В PostgreSQL у каждой статьи хранится поисковый вектор (`Article.search_vector`) с GIN-индексом, составленный
+из заголовка, описания и текста статьи без тэгов HTML в конфигурациях русского и английского языков.
+Вектор обновляется при сохранении статьи, поэтому при поиске содержание статей не разбирается заново,
+а найденные статьи упорядочиваются по релевантности. Фрагменты текста с найденными словами
+строятся функцией `ts_headline` только для статей текущей страницы.
+
+В SQLite (SourceCraft CI/CD) поиск выполняется по вхождению слов запроса в заголовок, описание
+и текст статьи, а фрагменты текста строятся в Python.
+"""
+
+import operator
+import re
+from collections.abc import Iterable
+from functools import reduce
+from typing import Optional
+
+from django.contrib.postgres.search import (
+    CombinedSearchVector,
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db.models import F, Q, QuerySet, Value
+from django.utils.html import escape
+from django.utils.safestring import SafeString, mark_safe
+
+from blog.models import Article
+from personal_website.db import is_postgresql
+
+# Конфигурации полнотекстового поиска PostgreSQL, в которых составляется поисковый вектор.
+SEARCH_CONFIGS = ("russian", "english")
+
+# Поля статьи и их веса в поисковом векторе: совпадения в заголовке важнее, чем в тексте.
+SEARCH_FIELDS = (("title", "A"), ("description", "B"), ("search_text", "C"))
+
+# Маркеры найденных слов во фрагменте текста. Фрагмент экранируется целиком, после чего маркеры
+# заменяются тэгами <mark>, поэтому текст статьи не может добавить во фрагмент разметку.
+SNIPPET_START = "\x02"
+SNIPPET_STOP = "\x03"
+
+# Количество слов во фрагменте текста с найденными словами.
+SNIPPET_WORDS = 30
+
+
+def article_search_vector() -> SearchVector | CombinedSearchVector:
+    """Выражение поискового вектора статьи."""
+    vectors = [
+        SearchVector(field, config=config, weight=weight)
+        for field, weight in SEARCH_FIELDS
+        for config in SEARCH_CONFIGS
+    ]
+    return reduce(operator.add, vectors)
+
+
+def update_search_vectors(article_pks: Iterable[int]) -> None:
+    """Пересчитать поисковые векторы статей одним запросом. В SQLite векторы не используются."""
+    if is_postgresql():
+        Article.objects.filter(pk__in=list(article_pks)).update(search_vector=article_search_vector())
+
+
+def article_search_query(text: str) -> SearchQuery:
+    """Поисковый запрос в синтаксисе поисковых систем (кавычки, OR, минус) во всех конфигурациях."""
+    queries = [SearchQuery(text, config=config, search_type="websearch") for config in SEARCH_CONFIGS]
+    return reduce(operator.or_, queries)
+
+
+def search_terms(text: str) -> list[str]:
+    """Слова поискового запроса."""
+    return re.findall(r"\w+", text)
+
+
+def search_articles(text: str, articles: Optional[QuerySet[Article]] = None) -> QuerySet[Article]:
+    """Найти статьи по поисковому запросу.
+
+    Args:
+        text (str): Поисковый запрос.
+        articles (Optional[QuerySet[Article]]): Статьи, среди которых выполняется поиск. По умолчанию - публичные.
+
+    Returns:
+        QuerySet[Article]: Найденные статьи без содержания в порядке убывания релевантности. В PostgreSQL
+            у статей есть аннотации `rank` и `snippet` (фрагмент текста с маркерами найденных слов).
+    """
+    articles = (Article.published.all() if articles is None else articles).defer("content")
+    if is_postgresql():
+        query = article_search_query(text)
+        return (
+            articles.defer("search_text", "search_vector")
+            .filter(search_vector=query)
+            .annotate(
+                rank=SearchRank(F("search_vector"), query),
+                snippet=SearchHeadline(
+                    "search_text",
+                    query,
+                    config=SEARCH_CONFIGS[0],
+                    start_sel=SNIPPET_START,
+                    stop_sel=SNIPPET_STOP,
+                    max_words=SNIPPET_WORDS,
+                    min_words=SNIPPET_WORDS // 2,
+                ),
+            )
+            .order_by("-rank", "-published_at", "-pk")
+        )
+
+    terms = search_terms(text)
+    if not terms:
+        return articles.none()
+    condition = reduce(
+        operator.and_,
+        (Q(title__icontains=term) | Q(description__icontains=term) | Q(search_text__icontains=term) for term in terms),
+    )
+    return articles.filter(condition).annotate(rank=Value(0.0)).order_by("-published_at", "-pk")
+
+
+def mark_terms(text: str, terms: Iterable[str]) -> str:
+    """Построить фрагмент текста вокруг первого найденного слова и выделить в нем слова маркерами."""
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    words = text.split()
+    first = next((index for index, word in enumerate(words) if pattern.search(word)), 0)
+    start = max(first - SNIPPET_WORDS // 3, 0)
+    fragment = " ".join(words[start : start + SNIPPET_WORDS])
+    return pattern.sub(lambda match: f"{SNIPPET_START}{match.group()}{SNIPPET_STOP}", fragment)
+
+
+def render_snippet(snippet: str) -> SafeString:
+    """Экранировать фрагмент текста и заменить маркеры найденных слов тэгами <mark>."""
+    html = escape(snippet).replace(SNIPPET_START, "<mark>").replace(SNIPPET_STOP, "</mark>")
+    return mark_safe(html)
+
+
+def add_snippets(articles: Iterable[Article], text: str) -> None:
+    """Добавить найденным статьям фрагменты текста с выделенными словами запроса (`snippet_html`)."""
+    terms = search_terms(text)
+    for article in articles:
+        snippet = getattr(article, "snippet", None)
+        if snippet is None:
+            snippet = mark_terms(article.search_text, terms) if terms else ""
+        article.snippet_html = render_snippet(snippet)
@@ -0,0 +1,48 @@
+"""Сигналы блога: сброс кэша страниц блога и главной страницы, счетчики комментариев статей."""
+
+from typing import Any
+
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from blog.models import Article, Category, Comment, Series, Topic
+from personal_website.cache import bump_generation
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Series)
+@receiver(post_delete, sender=Series)
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Topic)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_blog_cache(sender: Any, **kwargs) -> None:
+    """После изменения или удаления объекта блога."""
+    bump_generation("blog")
+
+
+@receiver(m2m_changed, sender=Article.series.through)
+@receiver(m2m_changed, sender=Article.topics.through)
+@receiver(m2m_changed, sender=Article.categories.through)
+def invalidate_blog_cache_on_relations_change(sender: Any, action: str, **kwargs) -> None:
+    """После изменения серий, тем или категорий статьи."""
+    if action.startswith("post_"):
+        bump_generation("blog")
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender: Any, instance: Comment, created: bool, raw: bool = False, **kwargs) -> None:  # noqa: FBT001, FBT002
+    """После создания комментария атомарно увеличить счетчик комментариев статьи."""
+    if created and not raw:
+        Article.objects.filter(pk=instance.article_id).update(comment_count=F("comment_count") + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender: Any, instance: Comment, **kwargs) -> None:
+    """После удаления комментария атомарно уменьшить счетчик комментариев статьи."""
+    Article.objects.filter(pk=instance.article_id).update(comment_count=Greatest(F("comment_count") - 1, 0))
@@ -0,0 +1,46 @@
+"""Тесты административных команд блога."""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from blog.factories import ArticleFactory, CommentFactory
+from blog.models import Article
+
+
+class ReconcileCommentCountsCommandTests(TestCase):
+    """Тесты команды исправления счетчиков комментариев."""
+
+    def test_comment_counts_reconciled(self) -> None:
+        """Команда исправляет только разошедшиеся счетчики комментариев."""
+        drifted, correct, empty = ArticleFactory(), ArticleFactory(), ArticleFactory()
+        CommentFactory.create_batch(3, article=drifted)
+        CommentFactory.create_batch(2, article=correct)
+        Article.objects.filter(pk=drifted.pk).update(comment_count=7)
+        Article.objects.filter(pk=empty.pk).update(comment_count=1)
+
+        out = StringIO()
+        call_command("reconcile_comment_counts", stdout=out)
+        counts = dict(Article.objects.values_list("pk", "comment_count"))
+        self.assertEqual(counts, {drifted.pk: 3, correct.pk: 2, empty.pk: 0})
+        self.assertIn("2 статей", out.getvalue())
+
+
+class RenderArticlesCommandTests(TestCase):
+    """Тесты команды подготовки HTML статей."""
+
+    def test_stale_articles_rendered(self) -> None:
+        """Команда заново обрабатывает только статьи с устаревшим хэшем содержания."""
+        stale, fresh = ArticleFactory(content="<h2>Введение</h2><p>Текст</p>"), ArticleFactory()
+        Article.objects.filter(pk=stale.pk).update(content_html="", toc=[], content_hash="")
+        fresh_html = Article.objects.get(pk=fresh.pk).content_html
+
+        out = StringIO()
+        call_command("render_articles", stdout=out)
+        stale.refresh_from_db()
+        self.assertEqual(stale.content_html, '<h2 id="vvedenie">Введение</h2><p>Текст</p>')
+        self.assertEqual(len(stale.toc), 1)
+        self.assertEqual(len(stale.content_hash), 64)
+        self.assertEqual(Article.objects.get(pk=fresh.pk).content_html, fresh_html)
+        self.assertIn("1 статей", out.getvalue())
@@ -1,5 +1,7 @@
 """Тесты моделей блогов."""
 
+from unittest.mock import patch
+
 from django.contrib.auth.models import User
 from django.db.utils import IntegrityError
 from django.test import TestCase
@@ -47,6 +49,32 @@ class ArticleModelTest(TestCase):
         absolute_url = self.article.get_absolute_url()
         self.assertEqual(url, absolute_url)
 
+    def test_article_search_text(self) -> None:
+        """При сохранении статьи из ее содержания составляется текст для поиска без тэгов HTML."""
+        self.article.content = "<p>Горы&nbsp;<b>Непала</b></p><p>Лангтанг</p>"
+        self.article.save()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.search_text, "Горы Непала Лангтанг")
+
+    def test_article_rendered_content(self) -> None:
+        """
+        При сохранении статьи готовятся очищенный HTML, оглавление, количество слов и время чтения,
+        а без изменения содержания статья повторно не обрабатывается.
+        """
+        self.article.content = '<h2>Маршрут</h2><p onclick="alert(1)">Горы Непала</p><script>alert(1)</script>'
+        self.article.save()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.content_html, '<h2 id="marshrut">Маршрут</h2><p>Горы Непала</p>')
+        self.assertEqual(self.article.toc, [{"level": 2, "id": "marshrut", "title": "Маршрут"}])
+        self.assertEqual(self.article.word_count, 3)
+        self.assertEqual(self.article.reading_time, 1)
+        self.assertEqual(len(self.article.content_hash), 64)
+
+        with patch("blog.models.render_content") as render_content:
+            self.article.title = "Renamed test article"
+            self.article.save()
+            render_content.assert_not_called()
+
     def test_article_saved_on_author_delete(self) -> None:
         """Проверяет, что статья не удаляется при удалении автора статьи."""
         self.assertTrue(User.objects.filter(username="testuser-1").exists())
@@ -72,6 +100,27 @@ class ArticleModelTest(TestCase):
         self.assertFalse(User.objects.filter(username="testuser-2").exists())
         self.assertEqual(self.article.number_of_comments, 0)
 
+    def test_article_comment_count(self) -> None:
+        """Счетчик комментариев изменяется при создании и удалении комментариев, в том числе каскадном."""
+        user = User.objects.create_user(username="commenter", password=get_random_string(5))
+        comments = [Comment.objects.create(article=self.article, author=user, content="text") for _ in range(3)]
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comment_count, 3)
+
+        with self.subTest("Сохранение статьи не затирает счетчик"):
+            stale = Article.objects.get(pk=self.article.pk)
+            Comment.objects.create(article=self.article, author=self.user_1, content="text")
+            stale.save()
+            self.article.refresh_from_db()
+            self.assertEqual(self.article.comment_count, 4)
+
+        with self.subTest("Удаление комментариев"):
+            comments[0].delete()
+            user.delete()
+            self.article.refresh_from_db()
+            self.assertEqual(self.article.comment_count, 1)
+            self.assertEqual(self.article.comment_count, self.article.number_of_comments)
+
     def test_article_saved_on_series_delete(self) -> None:
         """Проверяет, что статья не удаляется при удалении cерии."""
         series = Series.objects.create(name="Test series")
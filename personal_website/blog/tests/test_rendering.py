@@ -0,0 +1,165 @@
+"""Тесты подготовки HTML статей."""
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from blog.rendering import RENDER_VERSION, content_hash, is_safe_url, render_content
+from blog.schemas import TocEntry
+
+
+class RenderContentTests(SimpleTestCase):
+    """Тесты подготовки HTML статей при сохранении."""
+
+    def test_unsafe_markup_removed(self) -> None:
+        """Из разметки удаляются скрипты, обработчики событий и ссылки с опасными схемами."""
+        cases = (
+            ('<p onclick="alert(1)">Текст</p>', "<p>Текст</p>"),
+            ("<p>Текст<script>alert(1)</script></p>", "<p>Текст</p>"),
+            ("<style>p {color: red}</style><p>Текст</p>", "<p>Текст</p>"),
+            ('<a href="javascript:alert(1)">Ссылка</a>', "<a>Ссылка</a>"),
+            ('<a href=" java\nscript:alert(1)">Ссылка</a>', "<a>Ссылка</a>"),
+            ('<a href="/blog/">Ссылка</a>', '<a href="/blog/">Ссылка</a>'),
+            ("<form><p>Текст</p></form>", "<p>Текст</p>"),
+            ("<p>1 &lt; 2 &amp; &quot;3&quot;</p>", "<p>1 &lt; 2 &amp; &quot;3&quot;</p>"),
+        )
+        for content, html in cases:
+            with self.subTest(content=content):
+                self.assertEqual(render_content(content).html, html)
+
+    def test_editor_styles_kept(self) -> None:
+        """Стили, которые задает TinyMCE (цвет, выравнивание, отступы, шрифт, обтекание), сохраняются."""
+        cases = (
+            ('<p style="text-align:center">Текст</p>', '<p style="text-align: center;">Текст</p>'),
+            (
+                '<p><span style="color: #e03e2d;">Текст</span> <span style="background-color: #f1c40f;">фон</span></p>',
+                '<p><span style="color: #e03e2d;">Текст</span> <span style="background-color: #f1c40f;">фон</span></p>',
+            ),
+            ('<p style="padding-left: 40px;">Текст</p>', '<p style="padding-left: 40px;">Текст</p>'),
+            (
+                "<p><span style=\"font-family: 'comic sans ms', sans-serif; font-size: 14pt;\">Текст</span></p>",
+                '<p><span style="font-family: &#x27;comic sans ms&#x27;, sans-serif; font-size: 14pt;">'
+                "Текст</span></p>",
+            ),
+            (
+                '<img style="float: left;" src="/media/photo.jpg" width="300" height="200">',
+                '<img style="float: left;" src="/media/photo.jpg" width="300" height="200" '
+                'loading="lazy" decoding="async">',
+            ),
+            (
+                '<table style="border-collapse: collapse; width: 100%;"><tbody><tr><td>1</td></tr></tbody></table>',
+                '<table style="border-collapse: collapse; width: 100%;"><tbody><tr><td>1</td></tr></tbody></table>',
+            ),
+        )
+        for content, html in cases:
+            with self.subTest(content=content):
+                self.assertEqual(render_content(content).html, html)
+
+    def test_unsafe_styles_removed(self) -> None:
+        """Из атрибута `style` удаляются свойства не из списка разрешенных и значения с функциями CSS."""
+        cases = (
+            ('<p style="position: fixed; color: red">Текст</p>', '<p style="color: red;">Текст</p>'),
+            ('<p style="background-color: url(https://example.com/track)">Текст</p>', "<p>Текст</p>"),
+            ('<p style="width: expression(alert(1))">Текст</p>', "<p>Текст</p>"),
+            ('<p style="color: re\\64">Текст</p>', "<p>Текст</p>"),
+        )
+        for content, html in cases:
+            with self.subTest(content=content):
+                self.assertEqual(render_content(content).html, html)
+
+    def test_media_embeds(self) -> None:
+        """Плееры из плагина `media` сохраняются для разрешенных сайтов, видео и аудио сохраняются с адресами."""
+        cases = (
+            (
+                '<p style="text-align:center">c</p><iframe src="https://youtube.com/embed/x">',
+                '<p style="text-align: center;">c</p>'
+                '<iframe src="https://youtube.com/embed/x" loading="lazy"></iframe>',
+            ),
+            (
+                '<p><iframe src="//www.youtube.com/embed/x" width="560" height="314" '
+                'allowfullscreen="allowfullscreen"></iframe></p>',
+                '<p><iframe src="//www.youtube.com/embed/x" width="560" height="314" '
+                'allowfullscreen="allowfullscreen" loading="lazy"></iframe></p>',
+            ),
+            ('<iframe src="https://example.com/embed"><p>Текст</p></iframe><p>Далее</p>', "<p>Далее</p>"),
+            ('<iframe src="http://www.youtube.com/embed/x"></iframe>', ""),
+            (
+                '<p><video controls="controls" width="300" height="150" poster="javascript:alert(1)">'
+                '<source src="/media/video.mp4" type="video/mp4"></video></p>',
+                '<p><video controls="controls" width="300" height="150">'
+                '<source src="/media/video.mp4" type="video/mp4"></video></p>',
+            ),
+            (
+                '<p><audio controls="controls"><source src="/media/audio.mp3" type="audio/mpeg" /></audio></p>',
+                '<p><audio controls="controls"><source src="/media/audio.mp3" type="audio/mpeg"></audio></p>',
+            ),
+        )
+        for content, html in cases:
+            with self.subTest(content=content):
+                self.assertEqual(render_content(content).html, html)
+
+    def test_safe_url(self) -> None:
+        """Разрешены ссылки без схемы и со схемами http, https, mailto и tel."""
+        for url in ("/blog/", "#intro", "https://example.com", "mailto:mail@example.com"):
+            with self.subTest(url=url):
+                self.assertTrue(is_safe_url(url))
+        for url in ("javascript:alert(1)", "JavaScript:alert(1)", "data:text/html,<p>", "vbscript:msgbox"):
+            with self.subTest(url=url):
+                self.assertFalse(is_safe_url(url))
+
+    def test_images_lazy(self) -> None:
+        """Изображения загружаются отложенно, ссылки в новой вкладке не получают доступ к странице."""
+        html = render_content('<img src="/media/photo.jpg" alt="Фото" onerror="alert(1)">').html
+        self.assertEqual(html, '<img src="/media/photo.jpg" alt="Фото" loading="lazy" decoding="async">')
+        html = render_content('<a href="https://example.com" target="_blank">Ссылка</a>').html
+        self.assertIn('rel="noopener noreferrer"', html)
+
+    def test_headings_toc(self) -> None:
+        """Заголовкам добавляются уникальные якоря, заголовки первых трех уровней попадают в оглавление."""
+        rendered = render_content(
+            "<h2>Введение</h2><p>Текст</p><h3>Маршрут <b>трека</b></h3>"
+            '<h2 id="intro">Введение</h2><h2>Введение</h2><h4>Детали</h4>',
+        )
+        self.assertEqual(
+            rendered.html,
+            '<h2 id="vvedenie">Введение</h2><p>Текст</p><h3 id="marshrut-treka">Маршрут <b>трека</b></h3>'
+            '<h2 id="intro">Введение</h2><h2 id="vvedenie-2">Введение</h2><h4 id="detali">Детали</h4>',
+        )
+        self.assertEqual(
+            rendered.toc,
+            [
+                TocEntry(level=2, id="vvedenie", title="Введение"),
+                TocEntry(level=3, id="marshrut-treka", title="Маршрут трека"),
+                TocEntry(level=2, id="intro", title="Введение"),
+                TocEntry(level=2, id="vvedenie-2", title="Введение"),
+            ],
+        )
+
+    def test_unclosed_tags(self) -> None:
+        """Незакрытые тэги закрываются, лишние закрывающие тэги удаляются."""
+        cases = (
+            ("<div><p>Текст</div>", "<div><p>Текст</p></div>"),
+            ("<p><b>Текст", "<p><b>Текст</b></p>"),
+            ("<p>Текст</i></p>", "<p>Текст</p>"),
+            ("<ul><li>Один<li>Два</ul>", "<ul><li>Один</li><li>Два</li></ul>"),
+        )
+        for content, html in cases:
+            with self.subTest(content=content):
+                self.assertEqual(render_content(content).html, html)
+
+    def test_reading_time(self) -> None:
+        """Количество слов считается по тексту без разметки, время чтения округляется до минут вверх."""
+        cases = (("", 0, 0), ("<p>Горы <b>Непала</b></p>", 2, 1), ("<p>" + "слово " * 201 + "</p>", 201, 2))
+        for content, word_count, reading_time in cases:
+            with self.subTest(word_count=word_count):
+                rendered = render_content(content)
+                self.assertEqual(rendered.word_count, word_count)
+                self.assertEqual(rendered.reading_time, reading_time)
+
+    def test_content_hash(self) -> None:
+        """Хэш содержания зависит от содержания и от версии обработки."""
+        self.assertEqual(content_hash("<p>Текст</p>"), content_hash("<p>Текст</p>"))
+        self.assertNotEqual(content_hash("<p>Текст</p>"), content_hash("<p>Текст.</p>"))
+        current_hash = content_hash("<p>Текст</p>")
+        with patch("blog.rendering.RENDER_VERSION", RENDER_VERSION + 1):
+            self.assertNotEqual(content_hash("<p>Текст</p>"), current_hash)
@@ -6,6 +6,7 @@ from django.test import TestCase
 from django.utils import timezone
 
 from blog.factories import ArticleFactory, CategoryFactory, SeriesFactory, TopicFactory
+from blog.sitemaps import ArticleSitemap
 
 
 class BlogSitemapTest(TestCase):
@@ -26,6 +27,14 @@ class BlogSitemapTest(TestCase):
         self.assertFalse(private_artice.get_absolute_url() in content)
         self.assertTrue(modified_at_date in content)
 
+    def test_article_sitemap_single_query(self) -> None:
+        """Статьи для карты сайта выбираются одним запросом без серий, тем и категорий."""
+        article = ArticleFactory(public=True)
+        article.series.add(SeriesFactory())
+        article.categories.add(CategoryFactory())
+        with self.assertNumQueries(1):
+            self.assertEqual(list(ArticleSitemap().items()), [article])
+
     def test_series_sitemap(self) -> None:
         """Проверяет, что серии добавляются в карту сайта, но только публичные."""
         SeriesFactory(name="Public test series", slug="public-test-series", public=True)
@@ -6,14 +6,16 @@ from pathlib import Path
 from django.conf import settings
 from django.contrib.auth import get_user
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import resolve, reverse
 from faker import Faker
 
 from blog.apps import BlogConfig
 from blog.factories import ArticleFactory, CategoryFactory, CommentFactory, SeriesFactory, TopicFactory
 from blog.models import Article, Comment
-from blog.views import ArticleDetailView, blog, category, series, topic
+from blog.views import ArticleDetailView, blog, category, search, series, topic
 from personal_website.utils import generate_random_text
 
 fake = Faker(locale="ru_RU")
@@ -30,12 +32,15 @@ SERIES_URL = f"/{APP_NAME}/series/"
 SERIES_URL_NAME = f"{APP_NAME}:series"
 TOPIC_URL = f"/{APP_NAME}/topic/"
 TOPIC_URL_NAME = f"{APP_NAME}:topic"
+SEARCH_URL = f"/{APP_NAME}/search/"
+SEARCH_URL_NAME = f"{APP_NAME}:search"
 
 ARTICLE_DETAIL_TEMPLATE = "blog/article_detail.html"
 ARTICLE_LIST_TEMPLATE = f"{APP_NAME}/article_list.html"
 CATEGORY_TEMPLATE = f"{APP_NAME}/article_list.html"
 SERIES_TEMPLATE = f"{APP_NAME}/article_list.html"
 TOPIC_TEMPLATE = f"{APP_NAME}/article_list.html"
+SEARCH_TEMPLATE = f"{APP_NAME}/search.html"
 BASE_TEMPLATE = "base.html"
 
 
@@ -85,6 +90,24 @@ class BlogIndexPageTests(TestCase):
         self.assertTrue("page_obj" in response.context)
         self.assertLessEqual(len(response.context["page_obj"]), 5)
 
+    def test_article_list_cursor_pagination(self) -> None:
+        """Статьи выводятся страницами по курсору от новых к старым без OFFSET, с общим количеством статей."""
+        expected = list(Article.published.order_by("-published_at", "-pk"))
+        response = self.client.get(ARTICLE_LIST_URL)
+        self.assertContains(response, f"всего: {len(expected)}")
+        articles = list(response.context["page_obj"])
+        while response.context["page_obj"].has_next():
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(ARTICLE_LIST_URL, {"after": response.context["page_obj"].next_cursor})
+            self.assertFalse(any("OFFSET" in query["sql"].upper() for query in context.captured_queries))
+            articles.extend(response.context["page_obj"])
+        self.assertEqual(articles, expected)
+
+        previous_cursor = response.context["page_obj"].previous_cursor
+        response = self.client.get(ARTICLE_LIST_URL, {"before": previous_cursor})
+        self.assertEqual(list(response.context["page_obj"]), expected[-6:-1])
+        self.assertContains(response, "?after=")
+
     def test_article_list_content_filter(self) -> None:
         """Тест на фильтрацию контента на главной странице блога."""
         response = self.client.get(ARTICLE_LIST_URL)
@@ -113,7 +136,7 @@ class BlogIndexPageTests(TestCase):
         templates_dir = settings.TEMPLATES[0]["DIRS"][0]
         template_location = Path(templates_dir) / ARTICLE_LIST_TEMPLATE
         with Path(template_location).open() as f:
-            self.assertIn("article.content|safe", f.read())
+            self.assertIn("article.content_html|safe", f.read())
 
     def test_article_list_article_order(self) -> None:
         """Проверяет, что статьи на главной странице блога отсортированы в правильном порядке."""
@@ -122,6 +145,15 @@ class BlogIndexPageTests(TestCase):
         response_articles = response.context["page_obj"]
         self.assertQuerySetEqual(target_articles, response_articles)
 
+    def test_article_list_comment_counts(self) -> None:
+        """Количество комментариев к статьям выводится в списке статей."""
+        article = Article.objects.get(title="Article 20")
+        CommentFactory.create_batch(3, article=article)
+        response = self.client.get(ARTICLE_LIST_URL)
+        self.assertEqual(response.context["page_obj"][0], article)
+        self.assertEqual(response.context["page_obj"][0].comment_count, 3)
+        self.assertContains(response, "Комментарии: 3")
+
     def test_article_list_title(self) -> None:
         """Проверяет, что в заголовке странице указано, что просматривается блог."""
         response = self.client.get(ARTICLE_LIST_URL)
@@ -237,12 +269,51 @@ class ArticleDetailPageTests(TestCase):
         self.assertQuerySetEqual(target_comments, response_comments)
         self.assertEqual(response_comments[0].content, "test comment 1")
 
+    def test_comments_authors_joined(self) -> None:
+        """Статья запрашивается один раз, а комментарии выбираются вместе с авторами одним запросом."""
+        article = Article.objects.get(title="Test article")
+        CommentFactory.create_batch(10, article=article)
+        url = reverse(ARTICLE_DETAIL_URL_NAME, args=(article.slug,))
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        for comment in Comment.objects.filter(article=article):
+            self.assertContains(response, str(comment.author))
+
+        with self.subTest("При создании комментария статья запрашивается один раз"):
+            self.client.login(username="testuser", password="12345")
+            with CaptureQueriesContext(connection) as context:
+                self.client.post(url, data={"content": "test comment"})
+            article_queries = [query for query in context.captured_queries if 'FROM "blog_article"' in query["sql"]]
+            self.assertEqual(len(article_queries), 1)
+
+    def test_comments_cursor_pagination(self) -> None:
+        """Комментарии разбиваются на страницы по курсору от старых к новым."""
+        article = Article.objects.get(title="Test article")
+        user = User.objects.get(username="testuser")
+        per_page = ArticleDetailView.comments_paginate_by
+        for i in range(per_page + 1):
+            CommentFactory(article=article, author=user, content=f"test comment {i}")
+        url = reverse(ARTICLE_DETAIL_URL_NAME, args=(article.slug,))
+
+        response = self.client.get(url)
+        page = response.context["comments"]
+        self.assertEqual(len(page), per_page)
+        self.assertTrue(page.has_next())
+        self.assertContains(response, "?after=")
+        self.assertNotContains(response, f"test comment {per_page}<")
+
+        response = self.client.get(url, {"after": page.next_cursor})
+        page = response.context["comments"]
+        self.assertEqual([comment.content for comment in page], [f"test comment {per_page}"])
+        self.assertTrue(page.has_previous())
+        self.assertContains(response, "?before=")
+
     def test_article_content_safe(self) -> None:
         """Проверяет, что в HTML-шаблоне статьи содержание статьи показывается."""
         templates_dir = settings.TEMPLATES[0]["DIRS"][0]
         template_location = Path(templates_dir) / ARTICLE_DETAIL_TEMPLATE
         with Path(template_location).open() as f:
-            self.assertIn("article.content|safe", f.read())
+            self.assertIn("article.content_html|safe", f.read())
 
 
 class CategoryPageTests(TestCase):
@@ -256,6 +327,25 @@ class CategoryPageTests(TestCase):
             article = ArticleFactory(title=f"Article {n}", slug=f"article-{n}")
             article.categories.add(cls.test_category)
 
+    def test_category_queries_count(self) -> None:
+        """Количество запросов для страницы статей категории не зависит от количества статей на странице."""
+        series, topic = SeriesFactory(), TopicFactory()
+        for article in self.test_category.article_set.all():
+            article.series.add(series)
+            article.topics.add(topic)
+            CommentFactory(article=article)
+        single_category = CategoryFactory()
+        ArticleFactory().categories.add(single_category)
+
+        with CaptureQueriesContext(connection) as single_page:
+            self.client.get(single_category.get_absolute_url())
+        with CaptureQueriesContext(connection) as full_page:
+            response = self.client.get(self.test_category.get_absolute_url())
+        self.assertEqual(len(response.context["page_obj"]), 5)
+        self.assertEqual(len(full_page), len(single_page))
+        self.assertContains(response, series.name)
+        self.assertContains(response, "Комментарии: 1")
+
     def test_category_url(self) -> None:
         """Тестирование ссылки на категорию."""
         url = CATEGORY_URL + self.test_category.slug + "/"
@@ -336,7 +426,7 @@ class CategoryPageTests(TestCase):
         templates_dir = settings.TEMPLATES[0]["DIRS"][0]
         template_location = Path(templates_dir) / CATEGORY_TEMPLATE
         with Path(template_location).open() as f:
-            self.assertIn("article.content|safe", f.read())
+            self.assertIn("article.content_html|safe", f.read())
 
     def test_category_article_order(self) -> None:
         """Проверяет, что статьи в категории отсортированы в правильном порядке."""
@@ -440,7 +530,7 @@ class TopicPageTests(TestCase):
         templates_dir = settings.TEMPLATES[0]["DIRS"][0]
         template_location = Path(templates_dir) / TOPIC_TEMPLATE
         with Path(template_location).open() as f:
-            self.assertIn("article.content|safe", f.read())
+            self.assertIn("article.content_html|safe", f.read())
 
     def test_topic_article_order(self) -> None:
         """Проверяет, что статьи по теме отсортированы в правильном порядке."""
@@ -542,7 +632,7 @@ class SeriesPageTests(TestCase):
         templates_dir = settings.TEMPLATES[0]["DIRS"][0]
         template_location = Path(templates_dir) / SERIES_TEMPLATE
         with Path(template_location).open() as f:
-            self.assertIn("article.content|safe", f.read())
+            self.assertIn("article.content_html|safe", f.read())
 
     def test_series_article_order(self) -> None:
         """Проверяет, что статьи из серии отсортированы в правильном порядке."""
@@ -551,3 +641,60 @@ class SeriesPageTests(TestCase):
         target_articles = Article.objects.filter(public=True, series=self.test_series).order_by("-published_at")[:5]
         response_articles = response.context["page_obj"]
         self.assertQuerySetEqual(target_articles, response_articles)
+
+
+class SearchPageTests(TestCase):
+    """Тесты страницы поиска по статьям блога."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Создать статьи, в одной из которых встречается искомое слово."""
+        cls.article = ArticleFactory(
+            title="Trekking in Nepal",
+            description="Langtang",
+            content="<p>Day one.</p><p>We walked to <b>Kyanjin</b> Gompa &amp; back.</p>",
+        )
+        ArticleFactory(title="Draft about Kyanjin", content="<p>Kyanjin</p>", public=False)
+        for n in range(7):
+            ArticleFactory(title=f"Kyanjin {n}", content=f"<p>Kyanjin {n}</p>")
+        ArticleFactory(title="Tuscany", content="<p>Autumn in Tuscany.</p>")
+
+    def test_search_url(self) -> None:
+        """Тестирование ссылки на страницу поиска."""
+        resolver = resolve(reverse(SEARCH_URL_NAME))
+        self.assertEqual(resolver.func, search)
+        response = self.client.get(SEARCH_URL, {"q": "Kyanjin"})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTemplateUsed(response, SEARCH_TEMPLATE)
+
+    def test_search_results(self) -> None:
+        """Находятся только публичные статьи со словами запроса в заголовке, описании или тексте."""
+        with self.subTest("Поиск по тексту статьи"):
+            response = self.client.get(SEARCH_URL, {"q": "gompa"})
+            self.assertEqual(list(response.context["page_obj"]), [self.article])
+
+        with self.subTest("Поиск по описанию статьи"):
+            response = self.client.get(SEARCH_URL, {"q": "langtang"})
+            self.assertEqual(list(response.context["page_obj"]), [self.article])
+
+        with self.subTest("Непубличные статьи не находятся"):
+            response = self.client.get(SEARCH_URL, {"q": "Kyanjin"})
+            self.assertEqual(response.context["page_obj"].paginator.count, 8)
+            self.assertNotContains(response, "Draft about Kyanjin")
+
+        with self.subTest("Пустой запрос"):
+            response = self.client.get(SEARCH_URL, {"q": " "})
+            self.assertEqual(len(response.context["page_obj"]), 0)
+
+    def test_search_snippet(self) -> None:
+        """Фрагмент текста найденной статьи экранирован, а слова запроса выделены."""
+        response = self.client.get(SEARCH_URL, {"q": "gompa"})
+        self.assertContains(response, "We walked to Kyanjin <mark>Gompa</mark> &amp; back.")
+        self.assertNotContains(response, "<b>Kyanjin</b>")
+
+    def test_search_pagination(self) -> None:
+        """Ссылки на страницы результатов поиска сохраняют поисковый запрос."""
+        response = self.client.get(SEARCH_URL, {"q": "Kyanjin"})
+        self.assertContains(response, "?page=2&q=Kyanjin")
+        response = self.client.get(SEARCH_URL, {"q": "Kyanjin", "page": "2"})
+        self.assertEqual(len(response.context["page_obj"]), 3)
@@ -2,12 +2,13 @@
 
 from django.urls import path
 
-from blog.views import ArticleDetailView, blog, category, series, topic
+from blog.views import ArticleDetailView, blog, category, search, series, topic
 
 app_name = "blog"
 
 urlpatterns = [
     path("", blog, name="blog"),
+    path("search/", search, name="search"),
     path("article/<slug:slug>/", ArticleDetailView.as_view(), name="article"),
     path("category/<slug:slug>/", category, name="category"),
     path("topic/<slug:slug>/", topic, name="topic"),
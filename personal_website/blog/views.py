@@ -8,29 +8,48 @@ from django.core.paginator import Page, Paginator
 from django.db.models import QuerySet
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
+from django.utils.functional import SimpleLazyObject
 from django.views.generic.detail import DetailView
 
 from blog.forms import NewCommentForm
 from blog.models import Article, Category, Comment, Series, Topic
+from blog.search import add_snippets, search_articles
+from personal_website.cache import cache_public_page, generation_cache_key
+from personal_website.paginators import CursorPage, CursorPaginator
 
 logger = logging.getLogger(settings.PROJECT_NAME)
 
+# Количество статей на странице списка статей и результатов поиска.
+ARTICLES_PER_PAGE = 5
 
+
+@method_decorator(cache_public_page("blog"), "dispatch")
 class ArticleDetailView(DetailView):
     """
     Представление одной статьи, в котором отображается статья,
     детали (дата создания, дата редактирования) и комментарии.
+
+    Статья запрашивается из базы данных один раз за запрос. Комментарии выводятся от старых к новым
+    с разбивкой на страницы по курсору `?after=<posted>,<pk>` и выбираются вместе с авторами одним запросом
+    только при отрисовке, то есть не выполняются, если фрагмент комментариев есть в кэше.
     """
 
     model = Article
+    comments_paginate_by = 50
+
+    def get_comments_page(self) -> CursorPage:
+        """Страница комментариев к статье вместе с их авторами."""
+        comments = Comment.objects.filter(article=self.object).select_related("author")
+        paginator = CursorPaginator(comments, self.comments_paginate_by, ordering_field="posted", descending=False)
+        return paginator.get_page(after=self.request.GET.get("after"), before=self.request.GET.get("before"))
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         """В контекст ответа добавляются комментарии к статье и форма создания комментария."""
         data = super().get_context_data(**kwargs)
 
-        # Добавляются комментарии к статье, отсортированные в порядке от старых к новым.
-        comments_connected = Comment.objects.filter(article=self.get_object())
-        data["comments"] = comments_connected
+        # Страница комментариев запрашивается только при отрисовке фрагмента комментариев без кэша.
+        data["comments"] = SimpleLazyObject(self.get_comments_page)
 
         # Если пользователь авторизован, то появляется форма добавления комментария.
         if self.request.user.is_authenticated:
@@ -38,53 +57,93 @@ class ArticleDetailView(DetailView):
 
         return data
 
-    def post(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+    def post(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:  # noqa: ARG002
         """Функция для добавления комментариев к статьям."""
+        self.object = self.get_object()
         new_comment = Comment(
             content=request.POST.get("content"),
-            author=self.request.user,
-            article=self.get_object(),
+            author=request.user,
+            article=self.object,
         )
         new_comment.save()
-        user = self.request.user
-        article = self.get_object()
-        logger.info(f"Пользователь {user} оставил комментарий к статье {article}")
-        return self.get(request, *args, **kwargs)
+        logger.info(f"Пользователь {request.user} оставил комментарий к статье {self.object}")
+        return self.render_to_response(self.get_context_data(object=self.object))
 
 
 def paginate(request: HttpRequest, objects: QuerySet) -> Page:
-    """Фукнция для разбивки отображения списка объектов по страницам."""
-    paginator = Paginator(object_list=objects, per_page=5)
+    """Фукнция для разбивки отображения списка объектов по номерам страниц.
+
+    Используется для результатов поиска, которые упорядочены по релевантности, а не по полю модели.
+    """
+    paginator = Paginator(object_list=objects, per_page=ARTICLES_PER_PAGE)
     page_number = request.GET.get("page")
     return paginator.get_page(page_number)
 
 
+def paginate_articles(request: HttpRequest, articles: "QuerySet[Article]", count_key: str) -> CursorPage:
+    """Страница статей от новых к старым по курсору `?after=<published_at>,<pk>` или `?before=<published_at>,<pk>`.
+
+    Страница выбирается по индексу `(published_at, id)` без `COUNT(*)` и `OFFSET`. Общее количество статей
+    выводится приблизительно: оно хранится в кэше до следующего изменения объектов блога.
+
+    Args:
+        request (HttpRequest): Запрос с курсором в параметрах.
+        articles (QuerySet[Article]): Статьи списка.
+        count_key (str): Часть ключа кэша количества статей, уникальная для списка.
+    """
+    paginator = CursorPaginator(
+        articles,
+        ARTICLES_PER_PAGE,
+        ordering_field="published_at",
+        count_cache_key=generation_cache_key("blog", f"blog-articles-count:{count_key}"),
+    )
+    return paginator.get_page(after=request.GET.get("after"), before=request.GET.get("before"))
+
+
+@cache_public_page("blog")
 def blog(request: HttpRequest) -> HttpResponse:
     """
     Функция, определяющая порядок отображения статей на главной странице блога.
     Добавлена разбивка по страницам. Здесь указано количество статей на страницу.
     Отображаются только те статьи, для которых не была установлена невидимость (черновики).
     """
-    content = Article.published.all()
-    return render(request, "blog/article_list.html", {"page_obj": paginate(request, content)})
+    content = Article.published.all().for_list().with_relations()
+    page = paginate_articles(request, content, "all")
+    return render(request, "blog/article_list.html", {"page_obj": page})
 
 
+@cache_public_page("blog")
 def category(request: HttpRequest, slug: str) -> HttpResponse:
     """Вывод всех статей, соответствующих определенной категории."""
     category = Category.objects.get(slug=slug)
-    articles = category.article_set.filter(public=True)
-    return render(request, "blog/article_list.html", {"page_obj": paginate(request, articles)})
+    articles = Article.published.filter(categories=category).for_list().with_relations()
+    page = paginate_articles(request, articles, f"category:{category.pk}")
+    return render(request, "blog/article_list.html", {"page_obj": page})
 
 
+@cache_public_page("blog")
 def series(request: HttpRequest, slug: str) -> HttpResponse:
     """Вывод всех статей, соответствующих определенной серии."""
     series = Series.objects.get(slug=slug)
-    articles = series.article_set.filter(public=True)
-    return render(request, "blog/article_list.html", {"page_obj": paginate(request, articles)})
+    articles = Article.published.filter(series=series).for_list().with_relations()
+    page = paginate_articles(request, articles, f"series:{series.pk}")
+    return render(request, "blog/article_list.html", {"page_obj": page})
 
 
+@cache_public_page("blog")
 def topic(request: HttpRequest, slug: str) -> HttpResponse:
     """Вывод всех статей, соответствующих определенной теме."""
     topic = Topic.objects.get(slug=slug)
-    articles = topic.article_set.filter(public=True)
-    return render(request, "blog/article_list.html", {"page_obj": paginate(request, articles)})
+    articles = Article.published.filter(topics=topic).for_list().with_relations()
+    page = paginate_articles(request, articles, f"topic:{topic.pk}")
+    return render(request, "blog/article_list.html", {"page_obj": page})
+
+
+@cache_public_page("blog")
+def search(request: HttpRequest) -> HttpResponse:
+    """Полнотекстовый поиск по публичным статьям. Поисковый запрос передается в параметре `q`."""
+    query = request.GET.get("q", "").strip()
+    articles = search_articles(query) if query else Article.objects.none()
+    page = paginate(request, articles)
+    add_snippets(page, query)
+    return render(request, "blog/search.html", {"page_obj": page, "query": query})
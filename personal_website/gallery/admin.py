@@ -1,17 +1,28 @@
 """Представления объектов галереи в административной панели Django."""
 
 from adminsortable2.admin import SortableAdminMixin  # type: ignore[import-untyped]
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.paginator import Paginator
 from django.db import models
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.template.response import TemplateResponse
+from django.urls import URLPattern, path, reverse
+from django.utils.html import format_html, format_html_join
 from django.utils.safestring import SafeText, mark_safe
 from tinymce.widgets import TinyMCE  # type: ignore[import-untyped]
 
-from gallery.forms import AlbumForm
+from gallery.duplicates import MAX_DUPLICATE_DISTANCE, find_duplicates, get_duplicate_groups, get_max_distance
+from gallery.forms import AlbumForm, PhotoActionForm
 from gallery.models import Album, Photo, Tag
-from personal_website.utils import format_local_datetime
+from gallery.relocation import move_photos
 
 FORMFIELD_OVERRIDES = {models.TextField: {"widget": TinyMCE()}}
 
+# Количество групп дубликатов на странице отчета.
+DUPLICATE_GROUPS_PER_PAGE = 50
+
 
 @admin.register(Photo)
 class PhotoAdmin(admin.ModelAdmin):
@@ -32,6 +43,8 @@ class PhotoAdmin(admin.ModelAdmin):
         "uploaded_at",
         "modified_at",
         "exif_table",
+        "renditions_table",
+        "duplicates_list",
     )
     readonly_fields = (
         "image_preview",
@@ -39,6 +52,8 @@ class PhotoAdmin(admin.ModelAdmin):
         "modified_at",
         "taken_at",
         "exif_table",
+        "renditions_table",
+        "duplicates_list",
     )
     list_display = (
         "name",
@@ -49,6 +64,62 @@ class PhotoAdmin(admin.ModelAdmin):
     )
     list_filter = ("tags", "album")
     ordering = ("-modified_at",)
+    action_form = PhotoActionForm
+    actions = ("move_to_album",)
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Photo]:
+        """Загрузить копии изображений вместе с фотографиями."""
+        return super().get_queryset(request).prefetch_related("renditions")
+
+    def get_urls(self) -> list[URLPattern]:
+        """Добавить страницу отчета о дубликатах фотографий."""
+        urls = [
+            path(
+                "duplicates/",
+                self.admin_site.admin_view(self.duplicates_view),
+                name="gallery_photo_duplicates",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def duplicates_view(self, request: HttpRequest) -> TemplateResponse:
+        """Отчет о группах дубликатов фотографий.
+
+        Группы строятся по хэшам всех фотографий один раз для поколения галереи и затем читаются из кэша,
+        а фотографии загружаются только для групп текущей страницы. Наибольшее расстояние между перцептивными
+        хэшами можно передать в параметре `distance`, оно ограничивается `MAX_DUPLICATE_DISTANCE`.
+        """
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        try:
+            distance = get_max_distance(int(request.GET["distance"]))
+        except (KeyError, ValueError):
+            distance = get_max_distance()
+        page = Paginator(get_duplicate_groups(distance), DUPLICATE_GROUPS_PER_PAGE).get_page(request.GET.get("page"))
+        photos = Photo.objects.prefetch_related("renditions").in_bulk([pk for group in page for pk in group])
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.opts,
+            "title": "Дубликаты фотографий",
+            "distance": distance,
+            "max_distance": MAX_DUPLICATE_DISTANCE,
+            "page_obj": page,
+            "groups": [[photos[pk] for pk in group if pk in photos] for group in page],
+        }
+        return TemplateResponse(request, "admin/gallery/photo/duplicates.html", context)
+
+    @admin.action(description="Переместить в альбом")
+    def move_to_album(self, request: HttpRequest, queryset: QuerySet[Photo]) -> None:
+        """Переместить выбранные фотографии в альбом, выбранный в форме действия."""
+        try:
+            album = PhotoActionForm.base_fields["album"].clean(request.POST.get("album"))
+        except ValidationError:
+            album = None
+        if album is None:
+            self.message_user(request, "Выберите альбом, в который нужно переместить фотографии.", messages.WARNING)
+            return
+        moved = move_photos(queryset.prefetch_related(None), album)
+        self.message_user(request, f'Перемещено фотографий в альбом "{album}": {len(moved)}.', messages.SUCCESS)
 
     @admin.display(description="Миниатюра")
     def image_thumbnail(self, obj: Photo) -> SafeText | str:
@@ -64,11 +135,6 @@ class PhotoAdmin(admin.ModelAdmin):
             return mark_safe(f"<img src='{obj.image_preview.url}'/>")
         return ""
 
-    @admin.display(description="Создана")
-    def taken_at(self, obj: Photo) -> str:
-        """Дата и время съемки."""
-        return format_local_datetime(obj.datetime_taken)
-
     @admin.display(description="EXIF")
     def exif_table(self, obj: Photo) -> SafeText | str:
         """Таблица с данными EXIF."""
@@ -102,6 +168,35 @@ class PhotoAdmin(admin.ModelAdmin):
     """
         return mark_safe(table_html)
 
+    @admin.display(description="Копии изображения")
+    def renditions_table(self, obj: Photo) -> SafeText | str:
+        """Таблица с состоянием построения уменьшенных копий изображения."""
+        if not obj.pk:
+            return ""
+        rows = format_html_join(
+            "",
+            "<tr><td>{}</td><td>{}</td><td>{}×{}</td><td>{}</td></tr>",
+            (
+                (rendition.spec, rendition.get_status_display(), rendition.width, rendition.height, rendition.error)
+                for rendition in obj.renditions.all()
+            ),
+        )
+        return format_html("<table>{}</table>", rows) if rows else ""
+
+    @admin.display(description="Похожие фотографии")
+    def duplicates_list(self, obj: Photo) -> SafeText | str:
+        """Ссылки на дубликаты фотографии с количеством различающихся бит перцептивного хэша."""
+        if not obj.pk:
+            return ""
+        return format_html_join(
+            mark_safe("<br>"),
+            '<a href="{}">{}</a> ({})',
+            (
+                (reverse("admin:gallery_photo_change", args=(duplicate.pk,)), duplicate, distance)
+                for duplicate, distance in find_duplicates([obj])[obj.pk]
+            ),
+        )
+
 
 class PhotoInline(admin.TabularInline):
     """Набор форм фотографий для показа в представлении альбома."""
@@ -117,6 +212,10 @@ class PhotoInline(admin.TabularInline):
     show_change_link = True
     extra = 5
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Photo]:
+        """Загрузить копии изображений вместе с фотографиями."""
+        return super().get_queryset(request).prefetch_related("renditions")
+
     @admin.display(description="Миниатюра")
     def image_thumbnail(self, obj: Photo) -> SafeText | str:
         """Получить миниатюру фотографии для административной панели."""
@@ -165,6 +264,11 @@ class AlbumAdmin(SortableAdminMixin, admin.ModelAdmin):
     )
     list_filter = ("tags",)
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Album]:
+        """Загрузить количество фотографий и обложку с ее копиями вместе с альбомами."""
+        queryset = super().get_queryset(request).with_photo_counts()  # type: ignore[attr-defined]
+        return queryset.select_related("cover").prefetch_related("cover__renditions")
+
     @admin.display(description="Обложка")
     def cover_thumbnail(self, obj: Album) -> SafeText | str:
         """Получить миниатюру обложки альбома для административной панели."""
@@ -7,3 +7,12 @@ class GalleryConfig(AppConfig):  # noqa: D101
     name = "gallery"
     verbose_name = "Галерея"
     default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self) -> None:
+        """При инициации приложения подключить сигналы и ограничить количество пикселов изображений в PIL."""
+        from django.conf import settings
+        from PIL import Image
+
+        from gallery import signals  # noqa: F401
+
+        Image.MAX_IMAGE_PIXELS = settings.GALLERY_MAX_IMAGE_PIXELS
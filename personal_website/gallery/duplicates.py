@@ -0,0 +1,176 @@
+"""
+Поиск дубликатов фотографий.
+
+Для каждой фотографии хранятся хэш SHA-256 файла (точные копии) и перцептивный хэш dHash (копии того же кадра
+другого размера, сжатия или формата). Похожими считаются фотографии, перцептивные хэши которых отличаются
+не больше чем в `GALLERY_DUPLICATE_DISTANCE` битах.
+
+Чтобы не сравнивать хэш с хэшами всех фотографий, используется индекс на основе LSH: 64-битный хэш делится
+на четыре полосы по 16 бит, каждая из которых хранится в отдельном индексированном поле. Если хэши отличаются
+меньше чем в четырех битах, то хотя бы одна полоса у них совпадает, поэтому кандидаты выбираются по индексам
+полос, и расстояние Хэмминга вычисляется только для них. По этой же причине наибольшее расстояние ограничено
+`MAX_DUPLICATE_DISTANCE`: при большем расстоянии похожие фотографии могут не попасть в кандидаты.
+
+Группы дубликатов всей галереи строятся один раз после изменения фотографий (командой `update_photo_hashes`
+или при первом открытии отчета) и хранятся в кэше под ключом с номером поколения галереи.
+"""
+
+import logging
+from collections import defaultdict
+from collections.abc import Sequence
+from functools import partial
+from itertools import combinations
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from PIL import UnidentifiedImageError
+
+from gallery.models import Photo
+from gallery.utils import PERCEPTUAL_HASH_BANDS, content_hash, difference_hash, hamming_distance, hash_bands
+from personal_website.cache import generation_cache_key
+from personal_website.storages import StorageType, select_storage
+
+logger = logging.getLogger(settings.PROJECT_NAME)
+storage: StorageType = select_storage()
+
+HASH_FIELDS = ("content_hash", "perceptual_hash", *(f"hash_band_{band}" for band in range(PERCEPTUAL_HASH_BANDS)))
+
+# Наибольшее расстояние Хэмминга, при котором у похожих хэшей гарантированно совпадает хотя бы одна полоса.
+MAX_DUPLICATE_DISTANCE = PERCEPTUAL_HASH_BANDS - 1
+
+# Время хранения групп дубликатов в кэше, сек. Группы устаревают раньше, если изменились фотографии галереи.
+DUPLICATE_GROUPS_TIMEOUT = 24 * 60 * 60
+
+
+def get_max_distance(max_distance: Optional[int] = None) -> int:
+    """Наибольшее расстояние Хэмминга не больше `MAX_DUPLICATE_DISTANCE`. По умолчанию `GALLERY_DUPLICATE_DISTANCE`."""
+    max_distance = settings.GALLERY_DUPLICATE_DISTANCE if max_distance is None else max_distance
+    return min(max_distance, MAX_DUPLICATE_DISTANCE)
+
+
+def find_duplicates(
+    photos: Sequence[Photo],
+    max_distance: Optional[int] = None,
+) -> dict[int, list[tuple[Photo, int]]]:
+    """Найти дубликаты фотографий одним запросом.
+
+    Args:
+        photos (Sequence[Photo]): Сохраненные фотографии с вычисленными хэшами.
+        max_distance (Optional[int]): Наибольшее расстояние Хэмминга. По умолчанию `GALLERY_DUPLICATE_DISTANCE`.
+
+    Returns:
+        dict[int, list[tuple[Photo, int]]]: Для первичного ключа каждой фотографии - ее дубликаты
+            и расстояние до них в порядке возрастания расстояния. Для точных копий расстояние равно 0.
+    """
+    max_distance = get_max_distance(max_distance)
+    result: dict[int, list[tuple[Photo, int]]] = {photo.pk: [] for photo in photos}
+    query = Q(content_hash__in={photo.content_hash for photo in photos if photo.content_hash})
+    for band in range(PERCEPTUAL_HASH_BANDS):
+        values = {getattr(photo, f"hash_band_{band}") for photo in photos if photo.perceptual_hash is not None}
+        query |= Q(**{f"hash_band_{band}__in": values})
+    candidates = list(Photo.objects.filter(query).only("pk", "name", "slug", "album", *HASH_FIELDS))
+
+    for photo in photos:
+        for candidate in candidates:
+            if candidate.pk == photo.pk:
+                continue
+            if photo.content_hash and candidate.content_hash == photo.content_hash:
+                result[photo.pk].append((candidate, 0))
+            elif photo.perceptual_hash is not None and candidate.perceptual_hash is not None:
+                distance = hamming_distance(photo.perceptual_hash, candidate.perceptual_hash)
+                if distance <= max_distance:
+                    result[photo.pk].append((candidate, distance))
+        result[photo.pk].sort(key=lambda item: (item[1], item[0].pk))
+    return result
+
+
+def find_root(parents: dict[int, int], pk: int) -> int:
+    """Первичный ключ фотографии, представляющей группу, в которую входит фотография."""
+    while parents[pk] != pk:
+        parents[pk] = parents[parents[pk]]
+        pk = parents[pk]
+    return pk
+
+
+def find_duplicate_groups(max_distance: Optional[int] = None) -> list[list[int]]:
+    """Разбить все фотографии галереи на группы дубликатов.
+
+    Хэши всех фотографий читаются одним запросом, после чего фотографии раскладываются по корзинам
+    с одинаковыми хэшем содержимого или полосой перцептивного хэша. Расстояние Хэмминга вычисляется
+    только для пар фотографий из одной корзины, а связанные пары объединяются в группы.
+
+    Args:
+        max_distance (Optional[int]): Наибольшее расстояние Хэмминга. По умолчанию `GALLERY_DUPLICATE_DISTANCE`.
+
+    Returns:
+        list[list[int]]: Первичные ключи фотографий каждой группы. Большие группы идут первыми.
+    """
+    max_distance = get_max_distance(max_distance)
+    parents: dict[int, int] = {}
+    perceptual: dict[int, int] = {}
+    buckets: defaultdict[tuple[object, ...], list[int]] = defaultdict(list)
+    rows = Photo.objects.exclude(content_hash="").values_list("pk", "content_hash", "perceptual_hash")
+    for pk, file_hash, image_hash in rows.iterator(chunk_size=10000):
+        parents[pk] = pk
+        buckets["content", file_hash].append(pk)
+        if image_hash is not None:
+            perceptual[pk] = image_hash
+            for band, value in enumerate(hash_bands(image_hash)):
+                buckets[band, value].append(pk)
+
+    for key, pks in buckets.items():
+        if key[0] == "content":
+            # Точные копии попадают в одну группу без сравнения пар.
+            for pk in pks[1:]:
+                parents[find_root(parents, pk)] = find_root(parents, pks[0])
+            continue
+        for first, second in combinations(pks, 2):
+            first_root, second_root = find_root(parents, first), find_root(parents, second)
+            if first_root == second_root or hamming_distance(perceptual[first], perceptual[second]) > max_distance:
+                continue
+            parents[second_root] = first_root
+
+    groups: defaultdict[int, list[int]] = defaultdict(list)
+    for pk in parents:
+        groups[find_root(parents, pk)].append(pk)
+    return sorted((sorted(pks) for pks in groups.values() if len(pks) > 1), key=lambda pks: (-len(pks), pks[0]))
+
+
+def get_duplicate_groups(max_distance: Optional[int] = None) -> list[list[int]]:
+    """Группы дубликатов всех фотографий галереи из кэша.
+
+    Группы строятся заново, только если их нет в кэше для текущего поколения галереи, которое меняется
+    при изменении фотографий. Аргументы и результат такие же, как у `find_duplicate_groups`.
+    """
+    max_distance = get_max_distance(max_distance)
+    key = generation_cache_key("gallery", f"gallery-duplicate-groups:{max_distance}")
+    groups: list[list[int]] | None = cache.get_or_set(
+        key,
+        partial(find_duplicate_groups, max_distance),
+        DUPLICATE_GROUPS_TIMEOUT,
+    )
+    return groups or []
+
+
+def update_photo_hashes(photo_pk: int) -> bool:
+    """Вычислить хэши изображения фотографии и сохранить их, не вызывая `Photo.save`.
+
+    Функция выполняется в процессах пула команды `update_photo_hashes`.
+
+    Returns:
+        bool: Хэши вычислены.
+    """
+    photo = Photo.objects.filter(pk=photo_pk).only("pk", "image").first()
+    if photo is None or not photo.image:
+        return False
+    try:
+        with storage.open(photo.image.name) as file:
+            photo.set_hashes(content_hash(file), difference_hash(file))
+    except (OSError, UnidentifiedImageError) as error:
+        message = f'Не удалось вычислить хэши фотографии "{photo.image.name}": {error}'
+        logger.exception(message)
+        return False
+    Photo.objects.filter(pk=photo_pk).update(**{field: getattr(photo, field) for field in HASH_FIELDS})
+    return True
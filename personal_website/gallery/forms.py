@@ -3,6 +3,7 @@
 from typing import Any
 
 from django import forms
+from django.contrib.admin.helpers import ActionForm
 
 from gallery.models import Album, Photo
 
@@ -56,3 +57,9 @@ class UploadForm(forms.Form):
 
     album = forms.ModelChoiceField(queryset=Album.objects.all(), label="Альбом")
     photos = MultipleFileField(label="Фотографии")
+
+
+class PhotoActionForm(ActionForm):
+    """Форма действий со списком фотографий в административной панели с выбором альбома для перемещения."""
+
+    album = forms.ModelChoiceField(queryset=Album.objects.all(), required=False, label="Альбом")
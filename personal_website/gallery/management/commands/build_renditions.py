@@ -0,0 +1,70 @@
+"""Команда для построения уменьшенных копий изображений фотографий в несколько процессов."""
+
+import logging
+import os
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+
+from gallery.models import Photo, Rendition
+from gallery.renditions import RENDITION_SPECS, build_renditions
+
+logger = logging.getLogger(settings.PROJECT_NAME)
+
+
+class Command(BaseCommand):
+    """Построить уменьшенные копии изображений фотографий.
+
+    По умолчанию обрабатываются только фотографии, у которых построены не все копии.
+    Фотографии распределяются между процессами, количество которых по умолчанию равно количеству ядер.
+
+    Examples:
+        ```
+        python manage.py build_renditions
+        python manage.py build_renditions --all --workers 4
+        ```
+    """
+
+    help = "Построить уменьшенные копии изображений фотографий в несколько процессов"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:  # noqa: D102
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Перестроить копии всех фотографий, а не только фотографий без готовых копий",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Количество процессов. При значении 0 копии строятся в текущем процессе",
+        )
+
+    def handle(self, *args, **options) -> None:  # noqa: ARG002, D102
+        photos = Photo.objects.all()
+        if not options["all"]:
+            photos = photos.annotate(
+                ready_renditions=Count("renditions", filter=Q(renditions__status=Rendition.Status.READY)),
+            ).filter(ready_renditions__lt=len(RENDITION_SPECS))
+        photo_pks = list(photos.order_by("pk").values_list("pk", flat=True))
+        workers: int = options["workers"]
+
+        if workers:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context("spawn"),
+                initializer=django.setup,
+            ) as executor:
+                results = list(executor.map(build_renditions, photo_pks))
+        else:
+            results = [build_renditions(photo_pk) for photo_pk in photo_pks]
+
+        counter = sum(results)
+        message = f"Построено {counter} копий изображений {len(photo_pks)} фотографий"
+        logger.info(message)
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,79 @@
+"""Команда для вычисления хэшей изображений фотографий в несколько процессов."""
+
+import logging
+import os
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from gallery.duplicates import get_duplicate_groups, update_photo_hashes
+from gallery.models import Photo
+from personal_website.cache import bump_generation
+
+logger = logging.getLogger(settings.PROJECT_NAME)
+
+
+class Command(BaseCommand):
+    """Вычислить хэш содержимого и перцептивный хэш изображений фотографий для поиска дубликатов.
+
+    По умолчанию обрабатываются только фотографии без вычисленных хэшей, например, загруженные
+    до появления поиска дубликатов. Изображения декодируются в пуле процессов, количество
+    которых по умолчанию равно количеству ядер.
+
+    Хэши сохраняются без вызова `Photo.save` и сигналов, поэтому после вычисления хэшей поколение галереи
+    увеличивается вручную, а группы дубликатов для отчета в административной панели строятся заново
+    и сохраняются в кэше.
+
+    Examples:
+        ```
+        python manage.py update_photo_hashes
+        python manage.py update_photo_hashes --all --workers 4
+        ```
+    """
+
+    help = "Вычислить хэши изображений фотографий для поиска дубликатов в несколько процессов"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:  # noqa: D102
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Пересчитать хэши всех фотографий, а не только фотографий без хэшей",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Количество процессов. При значении 0 хэши вычисляются в текущем процессе",
+        )
+
+    def handle(self, *args, **options) -> None:  # noqa: ARG002, D102
+        photos = Photo.objects.all()
+        if not options["all"]:
+            photos = photos.filter(content_hash="")
+        photo_pks = list(photos.order_by("pk").values_list("pk", flat=True))
+        workers: int = options["workers"]
+
+        if workers:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context("spawn"),
+                initializer=django.setup,
+            ) as executor:
+                results = list(executor.map(update_photo_hashes, photo_pks, chunksize=100))
+        else:
+            results = [update_photo_hashes(photo_pk) for photo_pk in photo_pks]
+
+        counter = sum(results)
+        if counter:
+            bump_generation("gallery")
+        groups = get_duplicate_groups()
+        message = (
+            f"Вычислены хэши изображений {counter} из {len(photo_pks)} фотографий, "
+            f"найдено групп дубликатов: {len(groups)}"
+        )
+        logger.info(message)
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,72 @@
+"""Команда для заполнения метаданных EXIF у ранее загруженных фотографий."""
+
+import logging
+from argparse import ArgumentParser
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from gallery.models import Photo
+from gallery.search import update_photo_search_vectors
+
+logger = logging.getLogger(settings.PROJECT_NAME)
+
+METADATA_FIELDS = (
+    "taken_at",
+    "camera",
+    "lens_model",
+    "aperture",
+    "exposure",
+    "iso",
+    "focal_length",
+    "metadata_read_at",
+)
+
+
+class Command(BaseCommand):
+    """Прочитать EXIF изображений и сохранить метаданные в полях фотографий.
+
+    По умолчанию обрабатываются только фотографии, метаданные которых еще не прочитаны из изображения
+    (поле `metadata_read_at` не заполнено).
+
+    Examples:
+        ```
+        python manage.py update_photo_metadata
+        python manage.py update_photo_metadata --all --batch-size 200
+        ```
+    """
+
+    help = "Заполнить поля метаданных фотографий (время съемки, камера, объектив и др.) из EXIF"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:  # noqa: D102
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Перечитать метаданные всех фотографий, а не только незаполненных",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Количество фотографий, сохраняемых в базу данных одним запросом",
+        )
+
+    def handle(self, *args, **options) -> None:  # noqa: ARG002, D102
+        photos = Photo.objects.all() if options["all"] else Photo.objects.filter(metadata_read_at__isnull=True)
+        batch_size: int = options["batch_size"]
+
+        batch: list[Photo] = []
+        counter = 0
+        for photo in photos.only("pk", "image", *METADATA_FIELDS).iterator(chunk_size=batch_size):
+            batch.append(photo.update_metadata())
+            if len(batch) >= batch_size:
+                counter += Photo.objects.bulk_update(batch, METADATA_FIELDS)
+                update_photo_search_vectors(photo.pk for photo in batch)
+                batch.clear()
+        if batch:
+            counter += Photo.objects.bulk_update(batch, METADATA_FIELDS)
+            update_photo_search_vectors(photo.pk for photo in batch)
+
+        message = f"Обновлены метаданные {counter} фотографий"
+        logger.info(message)
+        self.stdout.write(self.style.SUCCESS(message))
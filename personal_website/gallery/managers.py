@@ -1,5 +1,9 @@
 """Менеджеры галереи."""
 
+from typing import Self
+
+from django.db.models import Count, Q, QuerySet
+
 from personal_website.managers import PublicManager
 
 
@@ -7,5 +11,32 @@ class PublicPhotoManager(PublicManager):
     """Менеджер для работы с публичными фотографиями."""
 
 
+class AlbumQuerySet(QuerySet):
+    """Набор альбомов."""
+
+    def with_photo_counts(self) -> Self:
+        """Добавить количество всех и публичных фотографий альбома.
+
+        Оба количества считаются в том же запросе, что и альбомы, по одному соединению с таблицей фотографий.
+        Свойства `Album.photos_count` и `Album.public_photos_count` используют эти значения,
+        если они есть, вместо отдельного запроса для каждого альбома.
+        """
+        queryset = self.annotate(
+            annotated_photos_count=Count("photo"),
+            annotated_public_photos_count=Count("photo", filter=Q(photo__public=True)),
+        )
+        # К запросам с группировкой Django не применяет сортировку из Meta.ordering, поэтому она задается явно.
+        if not queryset.query.order_by:
+            queryset = queryset.order_by(*self.model._meta.ordering)  # noqa: SLF001
+        return queryset
+
+
 class PublicAlbumManager(PublicManager):
-    """Менеджер для работы с публичными альбомами."""
+    """Менеджер для работы с публичными альбомами.
+
+    Альбомы сразу содержат количество фотографий и обложку.
+    """
+
+    def get_queryset(self) -> AlbumQuerySet:  # noqa: D102
+        queryset = AlbumQuerySet(self.model, using=self._db).filter(public=True)
+        return queryset.with_photo_counts().select_related("cover")
@@ -0,0 +1,84 @@
+# Generated by Django 5.1.5 on 2026-10-18 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gallery", "0007_alter_album_options_alter_photo_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="photo",
+            name="aperture",
+            field=models.CharField(
+                blank=True,
+                help_text="Диафрагменное число из EXIF",
+                max_length=16,
+                verbose_name="Диафрагма",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="camera",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="Производитель и модель камеры из EXIF",
+                max_length=255,
+                verbose_name="Камера",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="exposure",
+            field=models.CharField(blank=True, help_text="Выдержка из EXIF", max_length=16, verbose_name="Выдержка"),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="focal_length",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Фокусное расстояние из EXIF",
+                null=True,
+                verbose_name="Фокусное расстояние",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="iso",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Светочувствительность из EXIF",
+                null=True,
+                verbose_name="ISO",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="lens_model",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="Модель объектива из EXIF",
+                max_length=255,
+                verbose_name="Объектив",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="taken_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="Дата и время съемки фотографии из EXIF или время изменения файла",
+                null=True,
+                verbose_name="Снята",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="photo",
+            index=models.Index(fields=["album", "taken_at", "id"], name="gallery_photo_album_taken_idx"),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.5 on 2026-10-18 03:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gallery", "0008_photo_exif_metadata"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="photo",
+            name="taken_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Дата и время съемки фотографии из EXIF или время изменения файла",
+                null=True,
+                verbose_name="Снята",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="photo",
+            index=models.Index(fields=["taken_at", "id"], name="gallery_photo_taken_idx"),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.1.5 on 2026-10-18 03:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import personal_website.storages
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gallery", "0009_photo_taken_at_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Rendition",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "spec",
+                    models.CharField(
+                        help_text="Наименование набора параметров построения копии",
+                        max_length=32,
+                        verbose_name="Параметры",
+                    ),
+                ),
+                (
+                    "image",
+                    models.ImageField(
+                        blank=True,
+                        max_length=255,
+                        storage=personal_website.storages.select_storage,
+                        upload_to="",
+                        verbose_name="Изображение",
+                    ),
+                ),
+                ("width", models.PositiveIntegerField(blank=True, null=True, verbose_name="Ширина")),
+                ("height", models.PositiveIntegerField(blank=True, null=True, verbose_name="Высота")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Ожидает построения"),
+                            ("ready", "Построена"),
+                            ("failed", "Ошибка построения"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=16,
+                        verbose_name="Состояние",
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(blank=True, help_text="Текст ошибки построения копии", verbose_name="Ошибка"),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="Обновлена")),
+                (
+                    "photo",
+                    models.ForeignKey(
+                        help_text="Фотография, копией изображения которой является данная копия",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="renditions",
+                        to="gallery.photo",
+                        verbose_name="Фотография",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Копия изображения",
+                "verbose_name_plural": "Копии изображений",
+                "constraints": [
+                    models.UniqueConstraint(fields=("photo", "spec"), name="gallery_rendition_photo_spec_unique"),
+                ],
+            },
+        ),
+    ]
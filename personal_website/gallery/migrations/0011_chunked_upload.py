@@ -0,0 +1,77 @@
+# Generated by Django 5.1.5 on 2026-10-18 03:26
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gallery", "0010_photo_renditions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChunkedUpload",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                (
+                    "file_name",
+                    models.CharField(help_text="Имя загружаемого файла", max_length=255, verbose_name="Имя файла"),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Путь, по которому файл будет сохранен в хранилище",
+                        max_length=255,
+                        verbose_name="Путь в хранилище",
+                    ),
+                ),
+                ("size", models.PositiveBigIntegerField(help_text="Размер файла в байтах", verbose_name="Размер")),
+                (
+                    "upload_id",
+                    models.CharField(
+                        help_text="Идентификатор загрузки по частям в хранилище",
+                        max_length=1024,
+                        verbose_name="Идентификатор загрузки",
+                    ),
+                ),
+                (
+                    "parts",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="Загруженные части файла: номер, ETag и размер",
+                        verbose_name="Части",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Начата")),
+                (
+                    "album",
+                    models.ForeignKey(
+                        help_text="Альбом, в который загружается фотография",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="gallery.album",
+                        verbose_name="Альбом",
+                    ),
+                ),
+                (
+                    "photo",
+                    models.OneToOneField(
+                        blank=True,
+                        help_text="Фотография, созданная после завершения загрузки",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunked_upload",
+                        to="gallery.photo",
+                        verbose_name="Фотография",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Загрузка по частям",
+                "verbose_name_plural": "Загрузки по частям",
+            },
+        ),
+    ]
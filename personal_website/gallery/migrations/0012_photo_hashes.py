@@ -0,0 +1,79 @@
+# Generated by Django 5.1.5 on 2026-10-18 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gallery", "0011_chunked_upload"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="photo",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Хэш SHA-256 файла изображения",
+                max_length=64,
+                verbose_name="Хэш содержимого",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="hash_band_0",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                null=True,
+                verbose_name="Полоса 0 перцептивного хэша",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="hash_band_1",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                null=True,
+                verbose_name="Полоса 1 перцептивного хэша",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="hash_band_2",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                null=True,
+                verbose_name="Полоса 2 перцептивного хэша",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="hash_band_3",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                null=True,
+                verbose_name="Полоса 3 перцептивного хэша",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="perceptual_hash",
+            field=models.BigIntegerField(
+                blank=True,
+                editable=False,
+                help_text="Перцептивный хэш изображения (dHash) для поиска похожих фотографий",
+                null=True,
+                verbose_name="Перцептивный хэш",
+            ),
+        ),
+    ]
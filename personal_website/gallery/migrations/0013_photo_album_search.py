@@ -0,0 +1,115 @@
+# Generated by Django 5.1.5 on 2026-10-18 04:10
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from personal_website.db import PostgreSQLAddIndex
+
+
+def fill_search_vectors(apps, schema_editor):
+    """Составить поисковые векторы ранее загруженных фотографий и созданных альбомов."""
+    from gallery.search import album_search_vector, photo_search_vector
+
+    if schema_editor.connection.vendor == "postgresql":
+        apps.get_model("gallery", "Photo").objects.update(search_vector=photo_search_vector())
+        apps.get_model("gallery", "Album").objects.update(search_vector=album_search_vector())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gallery", "0012_photo_hashes"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="album",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False,
+                null=True,
+                verbose_name="Поисковый вектор",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False,
+                null=True,
+                verbose_name="Поисковый вектор",
+            ),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+        PostgreSQLAddIndex(
+            model_name="album",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["search_vector"], name="gallery_album_search_idx"),
+        ),
+        PostgreSQLAddIndex(
+            model_name="album",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="gin_trgm_ops",
+                ),
+                name="gallery_album_name_trgm_idx",
+            ),
+        ),
+        PostgreSQLAddIndex(
+            model_name="photo",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["search_vector"], name="gallery_photo_search_idx"),
+        ),
+        PostgreSQLAddIndex(
+            model_name="photo",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="gin_trgm_ops",
+                ),
+                name="gallery_photo_name_trgm_idx",
+            ),
+        ),
+        PostgreSQLAddIndex(
+            model_name="photo",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("description"),
+                    name="gin_trgm_ops",
+                ),
+                name="gallery_photo_desc_trgm_idx",
+            ),
+        ),
+        PostgreSQLAddIndex(
+            model_name="photo",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("camera"),
+                    name="gin_trgm_ops",
+                ),
+                name="gallery_photo_camera_trgm_idx",
+            ),
+        ),
+        PostgreSQLAddIndex(
+            model_name="photo",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("lens_model"),
+                    name="gin_trgm_ops",
+                ),
+                name="gallery_photo_lens_trgm_idx",
+            ),
+        ),
+        PostgreSQLAddIndex(
+            model_name="tag",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="gin_trgm_ops",
+                ),
+                name="gallery_tag_name_trgm_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.5 on 2026-10-18 05:00
+
+from django.db import migrations, models
+from django.db.models import F
+
+from personal_website.db import PostgreSQLAlterField
+
+
+def fill_taken_at(apps, schema_editor):
+    """Указать время загрузки как время съемки фотографий, метаданные которых еще не заполнены."""
+    apps.get_model("gallery", "Photo").objects.filter(taken_at__isnull=True).update(taken_at=F("uploaded_at"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gallery", "0013_photo_album_search"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_taken_at, migrations.RunPython.noop),
+        PostgreSQLAlterField(
+            model_name="photo",
+            name="taken_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Дата и время съемки фотографии из EXIF или время изменения файла",
+                verbose_name="Снята",
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.5 on 2026-10-18 05:12
+
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Now
+
+
+def mark_metadata_read(apps, schema_editor):
+    """Отметить фотографии, метаданные которых уже прочитаны из изображения.
+
+    До появления отметки незаполненное время съемки заменялось временем загрузки, поэтому фотографии,
+    у которых эти значения совпадают, остаются неотмеченными и будут прочитаны командой `update_photo_metadata`.
+    """
+    apps.get_model("gallery", "Photo").objects.exclude(taken_at=F("uploaded_at")).update(metadata_read_at=Now())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gallery", "0014_photo_taken_at_not_null"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="photo",
+            name="metadata_read_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Дата и время чтения метаданных фотографии из EXIF изображения",
+                null=True,
+                verbose_name="Метаданные прочитаны",
+            ),
+        ),
+        migrations.RunPython(mark_metadata_read, migrations.RunPython.noop),
+    ]
@@ -1,32 +1,72 @@
 """Модели галереи."""
 
+import uuid
+from collections.abc import Collection
 from datetime import datetime
+from functools import partial
+from io import BytesIO
 from pathlib import Path
 from typing import Self
 
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+from django.db.models.fields.files import FieldFile
+from django.db.models.functions import Upper
 from django.urls import reverse
 from django.utils.functional import cached_property
-from django.utils.timezone import get_current_timezone, now
-from imagekit.models import ImageSpecField  # type: ignore[import-untyped]
-from imagekit.processors import ResizeToFit  # type: ignore[import-untyped]
+from django.utils.timezone import get_current_timezone, is_naive, make_aware, now
 from PIL import Image as pImage
+from PIL import UnidentifiedImageError
 from PIL.ExifTags import TAGS
 from PIL.TiffImagePlugin import IFDRational
 
-from gallery.managers import PublicAlbumManager, PublicPhotoManager
-from gallery.utils import move_photo_image, photo_image_upload_path
+from gallery.managers import AlbumQuerySet, PublicAlbumManager, PublicPhotoManager
+from gallery.schemas import RenditionSpec
+from gallery.utils import (
+    PERCEPTUAL_HASH_BANDS,
+    PERCEPTUAL_HASH_BITS,
+    content_hash,
+    difference_hash,
+    hash_bands,
+    move_photo_image,
+    photo_image_upload_path,
+    read_image_header,
+    supported_save_formats,
+)
 from personal_website.storages import StorageType, select_storage
 from personal_website.utils import get_unique_slug
 
-thumbnail_size: int = settings.GALLERY_THUMBNAIL_SIZE
-preview_size: int = settings.GALLERY_PREVIEW_SIZE
-resize_quality: int = settings.GALLERY_RESIZE_QUALITY
-
 current_timezone = get_current_timezone()
 storage: StorageType = select_storage()
 
+# Форматы адаптивных копий в порядке предпочтения, последний - запасной формат для тэга img.
+responsive_formats: tuple[str, ...] = supported_save_formats(settings.GALLERY_RESPONSIVE_FORMATS)
+
+# Параметры всех уменьшенных копий, которые строятся для каждой фотографии:
+# миниатюра, превью и адаптивные копии каждой ширины в каждом формате.
+RENDITION_SPECS: tuple[RenditionSpec, ...] = (
+    RenditionSpec(name="thumbnail", size=settings.GALLERY_THUMBNAIL_SIZE, quality=settings.GALLERY_RESIZE_QUALITY),
+    RenditionSpec(name="preview", size=settings.GALLERY_PREVIEW_SIZE, quality=settings.GALLERY_RESIZE_QUALITY),
+    *(
+        RenditionSpec(
+            name=f"{width}w-{image_format.lower()}",
+            size=width,
+            format=image_format,
+            quality=settings.GALLERY_RESPONSIVE_QUALITY,
+            by_width=True,
+        )
+        for width in settings.GALLERY_RESPONSIVE_WIDTHS
+        for image_format in responsive_formats
+    ),
+)
+
+
+def trigram_index(field: str, name: str) -> GinIndex:
+    """Триграммный индекс PostgreSQL по выражению `UPPER(поле)` для условий `icontains` (`pg_trgm`)."""
+    return GinIndex(OpClass(Upper(field), name="gin_trgm_ops"), name=name)
+
 
 class Tag(models.Model):
     """Тэг для фотографий и альбомов."""
@@ -39,6 +79,7 @@ class Tag(models.Model):
         verbose_name = "Тэг"
         verbose_name_plural = "Тэги"
         ordering = ("slug",)
+        indexes = (trigram_index("name", "gallery_tag_name_trgm_idx"),)
 
     def __str__(self) -> str:
         """Строковое представление тэга представляет собой имя тэга."""
@@ -94,24 +135,35 @@ class Album(models.Model):
         blank=False,
         null=False,
     )
+    search_vector = SearchVectorField(verbose_name="Поисковый вектор", null=True, editable=False)
 
-    objects = models.Manager()
+    objects = AlbumQuerySet.as_manager()
     published = PublicAlbumManager()
 
     class Meta:  # noqa: D106
         verbose_name = "Альбом"
         verbose_name_plural = "Альбомы"
         ordering = ("-order",)
+        indexes = (
+            GinIndex(fields=("search_vector",), name="gallery_album_search_idx"),
+            trigram_index("name", "gallery_album_name_trgm_idx"),
+        )
 
     def __str__(self) -> str:
         """Строкое представление альбома является названием альбома."""
         return self.name
 
     def save(self, *args, **kwargs) -> None:
-        """Если слаг альбома не указан, то слаг определяется автоматически по имени альбома."""
+        """Если слаг альбома не указан, то слаг определяется автоматически по имени альбома.
+
+        После сохранения пересчитывается поисковый вектор альбома.
+        """
         if not self.slug:
             self.slug = get_unique_slug(self, self.name)
         super().save(*args, **kwargs)
+        from gallery.search import update_album_search_vectors
+
+        update_album_search_vectors([self.pk])
 
     def get_absolute_url(self) -> str:
         """Абсолютная ссылка на альбом определяется слагом альбома."""
@@ -119,13 +171,19 @@ class Album(models.Model):
 
     @property
     def photos_count(self) -> int:
-        """Количество фотографий в альбоме."""
+        """Количество фотографий в альбоме. Значение аннотации `with_photo_counts`, если она есть."""
+        annotated: int | None = getattr(self, "annotated_photos_count", None)
+        if annotated is not None:
+            return annotated
         photos = Photo.objects.filter(album=self)
         return photos.count()
 
     @property
     def public_photos_count(self) -> int:
-        """Количество публичных фотографий в альбоме."""
+        """Количество публичных фотографий в альбоме. Значение аннотации `with_photo_counts`, если она есть."""
+        annotated: int | None = getattr(self, "annotated_public_photos_count", None)
+        if annotated is not None:
+            return annotated
         photos = Photo.published.filter(album=self)
         return photos.count()
 
@@ -171,18 +229,100 @@ class Photo(models.Model):
         related_name="tag_photos",
         help_text="Тэги фотографии",
     )
-    image_thumbnail = ImageSpecField(
-        source="image",
-        processors=[ResizeToFit(height=thumbnail_size, width=thumbnail_size)],
-        format="JPEG",
-        options={"quality": resize_quality},
+    taken_at = models.DateTimeField(
+        verbose_name="Снята",
+        blank=True,
+        help_text="Дата и время съемки фотографии из EXIF или время изменения файла",
+    )
+    camera = models.CharField(
+        verbose_name="Камера",
+        max_length=255,
+        blank=True,
+        db_index=True,
+        help_text="Производитель и модель камеры из EXIF",
     )
-    image_preview = ImageSpecField(
-        source="image",
-        processors=[ResizeToFit(width=preview_size, height=preview_size)],
-        format="JPEG",
-        options={"quality": resize_quality},
+    lens_model = models.CharField(
+        verbose_name="Объектив",
+        max_length=255,
+        blank=True,
+        db_index=True,
+        help_text="Модель объектива из EXIF",
+    )
+    aperture = models.CharField(
+        verbose_name="Диафрагма",
+        max_length=16,
+        blank=True,
+        help_text="Диафрагменное число из EXIF",
+    )
+    exposure = models.CharField(
+        verbose_name="Выдержка",
+        max_length=16,
+        blank=True,
+        help_text="Выдержка из EXIF",
+    )
+    iso = models.PositiveIntegerField(
+        verbose_name="ISO",
+        null=True,
+        blank=True,
+        help_text="Светочувствительность из EXIF",
     )
+    focal_length = models.PositiveIntegerField(
+        verbose_name="Фокусное расстояние",
+        null=True,
+        blank=True,
+        help_text="Фокусное расстояние из EXIF",
+    )
+    metadata_read_at = models.DateTimeField(
+        verbose_name="Метаданные прочитаны",
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Дата и время чтения метаданных фотографии из EXIF изображения",
+    )
+    content_hash = models.CharField(
+        verbose_name="Хэш содержимого",
+        max_length=64,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="Хэш SHA-256 файла изображения",
+    )
+    perceptual_hash = models.BigIntegerField(
+        verbose_name="Перцептивный хэш",
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Перцептивный хэш изображения (dHash) для поиска похожих фотографий",
+    )
+    hash_band_0 = models.PositiveIntegerField(
+        verbose_name="Полоса 0 перцептивного хэша",
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
+    hash_band_1 = models.PositiveIntegerField(
+        verbose_name="Полоса 1 перцептивного хэша",
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
+    hash_band_2 = models.PositiveIntegerField(
+        verbose_name="Полоса 2 перцептивного хэша",
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
+    hash_band_3 = models.PositiveIntegerField(
+        verbose_name="Полоса 3 перцептивного хэша",
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
+    search_vector = SearchVectorField(verbose_name="Поисковый вектор", null=True, editable=False)
 
     objects = models.Manager()
     published = PublicPhotoManager()
@@ -191,6 +331,15 @@ class Photo(models.Model):
         ordering = ("pk",)
         verbose_name = "Фотография"
         verbose_name_plural = "Фотографии"
+        indexes = (
+            models.Index(fields=("taken_at", "id"), name="gallery_photo_taken_idx"),
+            models.Index(fields=("album", "taken_at", "id"), name="gallery_photo_album_taken_idx"),
+            GinIndex(fields=("search_vector",), name="gallery_photo_search_idx"),
+            trigram_index("name", "gallery_photo_name_trgm_idx"),
+            trigram_index("description", "gallery_photo_desc_trgm_idx"),
+            trigram_index("camera", "gallery_photo_camera_trgm_idx"),
+            trigram_index("lens_model", "gallery_photo_lens_trgm_idx"),
+        )
 
     def __str__(self) -> str:
         """Строковое представление фотографии является наименованием фотографии."""
@@ -199,38 +348,192 @@ class Photo(models.Model):
     def save(self, *args, **kwargs) -> None:
         """Операции, выполняемые при каждом сохранении модели.
 
-        - Если был изменен альбом фотографии, то изменяется адрес хранения фотографии.
+        - Если был изменен альбом фотографии, а изображение не заменено,
+          то изменяется адрес хранения фотографии.
+        - Если фотография новая или заменено изображение, то заполнить поля EXIF и время съемки
+          и вычислить хэши изображения.
         - Если у фотографии не указано название, то получить его из имени файла.
         - Если у фотографии не указан слаг, то определить его из названия.
+        - Если фотография новая или изменены название, описание, камера или объектив,
+          то пересчитать поисковый вектор.
+        - Если фотография новая, заменено изображение или изменен альбом,
+          то после фиксации транзакции поставить в очередь построение уменьшенных копий.
+
+        Изменения определяются по значениям полей, загруженным из базы данных, без повторного
+        запроса фотографии. Если список обновляемых полей не передан, то обновляются только
+        измененные поля и время изменения.
         """
-        if self.pk:
-            previous = Photo.objects.get(pk=self.pk)
-            if previous.album != self.album:
-                self.change_album_photo_image_path(previous)
+        if self.pk and not self.is_tracked:
+            self.load_previous_values()
+        tracked = self.is_tracked
+        changed = self.get_changed_fields()
+        image_changed = not tracked or "image" in changed
+        album_changed = tracked and "album_id" in changed
+        if album_changed and not image_changed:
+            self.change_album_photo_image_path(self.image.name)
+        if image_changed:
+            self.update_metadata()
+            self.update_fingerprint()
         if not self.name:
             self.name = storage.stem(self.image.name)
         if not self.slug:
             self.slug = get_unique_slug(self, self.name)
+        if tracked and not kwargs.get("force_insert") and kwargs.get("update_fields") is None and not args:
+            update_fields = {self._meta.get_field(attname).name for attname in self.get_changed_fields()}
+            kwargs["update_fields"] = update_fields | {"modified_at"}
         super().save(*args, **kwargs)
+        self.snapshot_loaded_values()
+        from gallery.search import PHOTO_VECTOR_FIELDS, update_photo_search_vectors
+
+        if not tracked or any(field in changed for field in PHOTO_VECTOR_FIELDS):
+            update_photo_search_vectors([self.pk])
+        if image_changed or album_changed:
+            from gallery.renditions import schedule_renditions
+
+            transaction.on_commit(partial(schedule_renditions, [self.pk]))
 
     def get_absolute_url(self) -> str:
         """Абсолютная ссылка на фотографию определяется слагом фотографии."""
         return reverse("gallery:photo-detail", kwargs={"slug": self.slug})
 
+    @classmethod
+    def from_db(cls, db: str | None, field_names: Collection[str], values: Collection) -> Self:
+        """Запомнить значения полей, загруженные из базы данных, для отслеживания изменений."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values, strict=False))  # noqa: SLF001
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        """После перезагрузки полей из базы данных запомнить их значения заново."""
+        super().refresh_from_db(*args, **kwargs)
+        self.snapshot_loaded_values()
+
+    def snapshot_loaded_values(self) -> None:
+        """Считать текущие значения загруженных полей совпадающими со значениями в базе данных."""
+        self._loaded_values = {
+            field.attname: field.value_from_object(self)
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+    @property
+    def is_tracked(self) -> bool:
+        """Значения полей фотографии загружены из базы данных, и их изменения отслеживаются."""
+        return hasattr(self, "_loaded_values")
+
+    def get_changed_fields(self) -> dict[str, object]:
+        """Измененные поля фотографии и их значения в базе данных.
+
+        Ключами являются имена атрибутов полей (например, `album_id`). Для файлов сравниваются
+        имена файлов. Отложенные поля, к которым не было обращений, не считаются измененными.
+        Если изменения не отслеживаются (фотография новая), то измененными считаются все поля.
+        """
+        loaded: dict[str, object] = getattr(self, "_loaded_values", {})
+        changed = {}
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+            if not self.is_tracked or field.attname not in loaded:
+                changed[field.attname] = None
+            elif field.value_from_object(self) != loaded[field.attname]:
+                changed[field.attname] = loaded[field.attname]
+        return changed
+
+    def load_previous_values(self) -> None:
+        """Запомнить значения полей сохраненной фотографии, созданной не из результата запроса.
+
+        Например, если экземпляр создан с указанием первичного ключа. Если фотографии с таким
+        первичным ключом нет в базе данных, то изменения не отслеживаются.
+        """
+        values = Photo.objects.filter(pk=self.pk).values(*(f.attname for f in self._meta.concrete_fields)).first()
+        if values is not None:
+            self._loaded_values = values
+
+    def get_rendition(self, spec: str) -> FieldFile:
+        """Уменьшенная копия изображения с заданным наименованием набора параметров.
+
+        Пока копия не построена, возвращается исходное изображение. Для списков фотографий
+        копии следует загружать заранее при помощи `prefetch_related("renditions")`.
+        """
+        for rendition in self.renditions.all():
+            if rendition.spec == spec and rendition.status == Rendition.Status.READY:
+                return rendition.image
+        return self.image
+
+    @property
+    def image_thumbnail(self) -> FieldFile:
+        """Миниатюра фотографии."""
+        return self.get_rendition("thumbnail")
+
+    @property
+    def image_preview(self) -> FieldFile:
+        """Изображение фотографии для предварительного просмотра."""
+        return self.get_rendition("preview")
+
+    @cached_property
+    def srcsets(self) -> dict[str, str]:
+        """Значения атрибута srcset адаптивных копий по MIME-типу в порядке предпочтения форматов.
+
+        Например: `{"image/webp": "/media/.../320w.webp 320w, /media/.../640w.webp 640w"}`.
+        Учитываются только построенные копии. Если у копий разных размеров одинаковая ширина
+        (исходное изображение меньше заданной ширины), то остается одна из них.
+        """
+        specs = {spec.name: spec for spec in RENDITION_SPECS if spec.by_width}
+        candidates: dict[str, dict[int, str]] = {
+            f"image/{image_format.lower()}": {} for image_format in responsive_formats
+        }
+        for rendition in self.renditions.all():
+            spec = specs.get(rendition.spec)
+            if spec and rendition.status == Rendition.Status.READY and rendition.width:
+                candidates[spec.mime_type].setdefault(rendition.width, rendition.image.url)
+        return {
+            mime_type: ", ".join(f"{url} {width}w" for width, url in sorted(urls.items()))
+            for mime_type, urls in candidates.items()
+            if urls
+        }
+
+    @property
+    def image_sources(self) -> list[dict[str, str]]:
+        """Источники тэга `<picture>` в современных форматах: MIME-тип и srcset."""
+        fallback = f"image/{responsive_formats[-1].lower()}" if responsive_formats else None
+        return [
+            {"type": mime_type, "srcset": srcset} for mime_type, srcset in self.srcsets.items() if mime_type != fallback
+        ]
+
+    @property
+    def image_srcset(self) -> str:
+        """Атрибут srcset тэга `<img>` из копий в запасном формате (JPEG)."""
+        if not responsive_formats:
+            return ""
+        return self.srcsets.get(f"image/{responsive_formats[-1].lower()}", "")
+
+    @property
+    def image_committed(self) -> bool:
+        """Файл изображения уже сохранен в хранилище (а не только загружен пользователем)."""
+        return bool(self.image) and self.image._committed  # noqa: SLF001
+
     @cached_property
     def exif(self) -> dict:
-        """Получить данные EXIF при помощи библиотеки PIL."""
-        exif_data = {}
-        if storage.exists(self.image.name):
-            with pImage.open(self.image) as img:
-                if hasattr(img, "_getexif"):
-                    info = img._getexif()  # noqa: SLF001
-                    if not info:
-                        return {}
-                    for tag, value in info.items():
-                        decoded = TAGS.get(tag, tag)
-                        exif_data[decoded] = value
-                img.close()
+        """Получить данные EXIF при помощи библиотеки PIL.
+
+        Из хранилища читаются только заголовки изображения. Для еще не сохраненного в хранилище файла
+        данные читаются из загруженного файла, после чего указатель файла возвращается в начало.
+        """
+        exif_data: dict = {}
+        if not self.image:
+            return exif_data
+        try:
+            source = BytesIO(read_image_header(self.image.name)) if self.image_committed else self.image
+            with pImage.open(source) as img:
+                info = img._getexif() if hasattr(img, "_getexif") else None  # noqa: SLF001
+                for tag, value in (info or {}).items():
+                    decoded = TAGS.get(tag, tag)
+                    exif_data[decoded] = value
+        except (OSError, UnidentifiedImageError):
+            return {}
+        finally:
+            if not self.image_committed:
+                self.image.seek(0)
         return exif_data
 
     @cached_property
@@ -248,29 +551,25 @@ class Photo(models.Model):
             return model.strip()
         return ""
 
-    @cached_property
-    def camera(self) -> str:
+    def read_camera(self) -> str:
         """Название камеры = производитель + модель."""
         if self.camera_model:
             return f"{self.camera_manufacturer} {self.camera_model}"
         return self.camera_manufacturer
 
-    @cached_property
-    def lens_model(self) -> str:
+    def read_lens_model(self) -> str:
         """Модель объектива."""
         return self.exif.get("LensModel", "")
 
-    @cached_property
-    def aperture(self) -> str | None:
+    def read_aperture(self) -> str:
         """Диафрагменное число."""
         if f_number := self.exif.get("FNumber", None):
             aperture = float(f_number)
             formatted_aperture = int(aperture) if aperture.is_integer() else round(aperture, 2)
             return f"F/{formatted_aperture}"
-        return None
+        return ""
 
-    @cached_property
-    def exposure(self) -> str:
+    def read_exposure(self) -> str:
         """Возвращает значение выдержки из метаданных EXIF.
 
         Если в EXIF присутствует ключ "ExposureTime", метод интерпретирует его значение:
@@ -293,30 +592,33 @@ class Photo(models.Model):
             return f"{numenator}/{denominator}"
         return ""
 
-    @cached_property
-    def iso(self) -> int | None:
+    def read_iso(self) -> int | None:
         """Светочувствительность."""
         if iso := self.exif.get("ISOSpeedRatings", None):
             return int(iso)
         return None
 
-    @cached_property
-    def focal_length(self) -> int | None:
+    def read_focal_length(self) -> int | None:
         """Фокусное расстояние."""
         if focal_length := self.exif.get("FocalLength", None):
             return int(focal_length)
         return None
 
-    @cached_property
-    def datetime_taken(self) -> datetime:
+    def read_taken_at(self) -> datetime:
         """Получить время съемки фотографии из EXIF или использовать время создания файла."""
         # Проверить наличие файла изображения.
-        if not self.image.name or not storage.exists(self.image.name):
+        if not self.image.name:
             return now()
 
-        # Получить дату и время последнего изменения файла.
-        modified_time = storage.get_modified_time(self.image.name)
-        date_time = modified_time.astimezone(current_timezone)
+        # Если файл еще не сохранен в хранилище, то временем изменения файла считается текущее время.
+        # Иначе получить дату и время последнего изменения файла.
+        if not self.image_committed:
+            date_time = now()
+        elif storage.exists(self.image.name):
+            modified_time = storage.get_modified_time(self.image.name)
+            date_time = modified_time.astimezone(current_timezone)
+        else:
+            return now()
 
         # Если в EXIF отсутствует дата и время съемки,
         # то вернуть дату и время последнего изменения.
@@ -327,15 +629,185 @@ class Photo(models.Model):
         # Получить дату и время съемки из EXIF, если не перехвачено исключение.
         # Если перехвачено исключение, то вернуть дату и время изменения файла.
         try:
-            return datetime.strptime(original_exif, "%Y:%m:%d %H:%M:%S")  # noqa: DTZ007
-        except ValueError:
+            taken_at = datetime.strptime(original_exif, "%Y:%m:%d %H:%M:%S")  # noqa: DTZ007
+        except (TypeError, ValueError):
             return date_time
+        return make_aware(taken_at, current_timezone) if is_naive(taken_at) else taken_at
+
+    def update_metadata(self) -> Self:
+        """Заполнить поля метаданных фотографии из EXIF изображения.
+
+        Изображение читается один раз, после чего данные хранятся в базе данных,
+        что позволяет сортировать и фильтровать фотографии средствами SQL.
+        """
+        for attribute in ("exif", "camera_manufacturer", "camera_model"):
+            self.__dict__.pop(attribute, None)
+        self.camera = self.read_camera()
+        self.lens_model = self.read_lens_model()
+        self.aperture = self.read_aperture()
+        self.exposure = self.read_exposure()
+        self.iso = self.read_iso()
+        self.focal_length = self.read_focal_length()
+        self.taken_at = self.read_taken_at()
+        self.metadata_read_at = now()
+        return self
+
+    def update_fingerprint(self) -> Self:
+        """Вычислить хэш содержимого и перцептивный хэш изображения для поиска дубликатов.
+
+        Еще не сохраненный в хранилище файл читается из загруженного файла, после чего указатель файла
+        возвращается в начало. Если изображение не удалось прочитать, то хэши сбрасываются.
+        """
+        try:
+            if not self.image:
+                self.set_hashes("", None)
+            elif self.image_committed:
+                with self.image.storage.open(self.image.name) as file:
+                    self.set_hashes(content_hash(file), difference_hash(file))
+            else:
+                self.set_hashes(content_hash(self.image), difference_hash(self.image))
+        except (OSError, UnidentifiedImageError):
+            self.set_hashes("", None)
+        return self
+
+    def set_hashes(self, file_hash: str, image_hash: int | None) -> None:
+        """Записать хэш содержимого, перцептивный хэш и полосы перцептивного хэша.
 
-    def change_album_photo_image_path(self, previous: Self) -> Self:
-        """Изменить местоположение изображения фотографии относительно альбома."""
-        old_path = previous.image.path
+        Перцептивный хэш хранится в поле BigIntegerField, поэтому 64-битное число без знака
+        записывается как число со знаком с тем же набором бит.
+        """
+        self.content_hash = file_hash
+        if image_hash is None:
+            self.perceptual_hash = None
+            bands: tuple[int | None, ...] = (None,) * PERCEPTUAL_HASH_BANDS
+        else:
+            signed = image_hash >> (PERCEPTUAL_HASH_BITS - 1)
+            self.perceptual_hash = image_hash - (1 << PERCEPTUAL_HASH_BITS) if signed else image_hash
+            bands = hash_bands(image_hash)
+        for band, value in enumerate(bands):
+            setattr(self, f"hash_band_{band}", value)
+
+    @property
+    def datetime_taken(self) -> datetime:
+        """Время съемки фотографии."""
+        return self.taken_at
+
+    def change_album_photo_image_path(self, previous_name: str) -> Self:
+        """Изменить местоположение изображения фотографии относительно альбома.
+
+        Изображение перемещается из прежнего местоположения `previous_name` (относительно хранилища).
+        """
+        old_path = self.image.storage.path(previous_name)
         new_path = move_photo_image(self, old_path)
         file_name = Path(new_path).name
         new_relative_path = photo_image_upload_path(self, file_name)
         self.image = new_relative_path
         return self
+
+
+class Rendition(models.Model):
+    """Уменьшенная копия изображения фотографии, построенная заранее."""
+
+    class Status(models.TextChoices):
+        """Состояние построения копии."""
+
+        PENDING = "pending", "Ожидает построения"
+        READY = "ready", "Построена"
+        FAILED = "failed", "Ошибка построения"
+
+    photo = models.ForeignKey(
+        Photo,
+        verbose_name="Фотография",
+        on_delete=models.CASCADE,
+        related_name="renditions",
+        help_text="Фотография, копией изображения которой является данная копия",
+    )
+    spec = models.CharField(
+        verbose_name="Параметры",
+        max_length=32,
+        help_text="Наименование набора параметров построения копии",
+    )
+    image = models.ImageField(
+        verbose_name="Изображение",
+        storage=select_storage,
+        max_length=255,
+        blank=True,
+    )
+    width = models.PositiveIntegerField(verbose_name="Ширина", null=True, blank=True)
+    height = models.PositiveIntegerField(verbose_name="Высота", null=True, blank=True)
+    status = models.CharField(
+        verbose_name="Состояние",
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        db_index=True,
+    )
+    error = models.TextField(verbose_name="Ошибка", blank=True, help_text="Текст ошибки построения копии")
+    updated_at = models.DateTimeField(verbose_name="Обновлена", auto_now=True)
+
+    class Meta:  # noqa: D106
+        verbose_name = "Копия изображения"
+        verbose_name_plural = "Копии изображений"
+        constraints = (models.UniqueConstraint(fields=("photo", "spec"), name="gallery_rendition_photo_spec_unique"),)
+
+    def __str__(self) -> str:
+        """Строковое представление копии состоит из наименования фотографии и параметров копии."""
+        return f"{self.photo_id}: {self.spec}"
+
+
+class ChunkedUpload(models.Model):
+    """Загрузка файла фотографии по частям, которую можно возобновить после обрыва соединения."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    album = models.ForeignKey(
+        Album,
+        verbose_name="Альбом",
+        on_delete=models.CASCADE,
+        help_text="Альбом, в который загружается фотография",
+    )
+    file_name = models.CharField(verbose_name="Имя файла", max_length=255, help_text="Имя загружаемого файла")
+    name = models.CharField(
+        verbose_name="Путь в хранилище",
+        max_length=255,
+        help_text="Путь, по которому файл будет сохранен в хранилище",
+    )
+    size = models.PositiveBigIntegerField(verbose_name="Размер", help_text="Размер файла в байтах")
+    upload_id = models.CharField(
+        verbose_name="Идентификатор загрузки",
+        max_length=1024,
+        help_text="Идентификатор загрузки по частям в хранилище",
+    )
+    parts = models.JSONField(
+        verbose_name="Части",
+        default=list,
+        blank=True,
+        help_text="Загруженные части файла: номер, ETag и размер",
+    )
+    photo = models.OneToOneField(
+        Photo,
+        verbose_name="Фотография",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="chunked_upload",
+        help_text="Фотография, созданная после завершения загрузки",
+    )
+    created_at = models.DateTimeField(verbose_name="Начата", auto_now_add=True)
+
+    class Meta:  # noqa: D106
+        verbose_name = "Загрузка по частям"
+        verbose_name_plural = "Загрузки по частям"
+
+    def __str__(self) -> str:
+        """Строковое представление загрузки является именем загружаемого файла."""
+        return self.file_name
+
+    @property
+    def received(self) -> int:
+        """Количество загруженных байт."""
+        return sum(part["Size"] for part in self.parts)
+
+    @property
+    def completed(self) -> bool:
+        """Загрузка завершена и фотография создана."""
+        return self.photo_id is not None
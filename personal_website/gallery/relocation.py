@@ -0,0 +1,107 @@
+"""
+Перемещение фотографий в другой альбом.
+
+Файл фотографии хранится в каталоге своего альбома, поэтому при перемещении фотографий файлы копируются
+в каталог нового альбома. Копирование выполняется на стороне хранилища (для S3 - запросом CopyObject)
+одновременно для нескольких файлов в пуле потоков, строки фотографий обновляются одним запросом `bulk_update`,
+а исходные файлы удаляются пачками только после фиксации транзакции: если обновить базу данных не удалось,
+то фотографии продолжают ссылаться на исходные файлы, а копии удаляются.
+
+Копирование перезаписывает файл с тем же именем, поэтому, если имя в каталоге нового альбома уже занято
+(или совпадает у нескольких перемещаемых фотографий), копия получает имя со случайным суффиксом
+(`free_photo_names`).
+"""
+
+import logging
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.timezone import now
+
+from gallery.models import Album, Photo
+from gallery.renditions import schedule_renditions
+from gallery.uploads import free_photo_names
+from personal_website.cache import bump_generation
+from personal_website.storages import StorageType, select_storage
+
+logger = logging.getLogger(settings.PROJECT_NAME)
+storage: StorageType = select_storage()
+
+
+def copy_files(names: list[tuple[str, str]]) -> None:
+    """Скопировать файлы внутри хранилища в пуле потоков.
+
+    Args:
+        names (list[tuple[str, str]]): Пары из исходного имени файла и имени копии. Один файл может
+            копироваться под несколькими именами, если на него ссылаются несколько фотографий.
+
+    Raises:
+        Exception: Первая ошибка копирования. Уже созданные копии при этом удаляются.
+    """
+    copied: list[str] = []
+    errors: list[BaseException] = []
+    with ThreadPoolExecutor(max_workers=settings.GALLERY_MOVE_WORKERS) as executor:
+        futures = {executor.submit(storage.copy_object, src, dst): dst for src, dst in names}
+        for future in as_completed(futures):
+            if (error := future.exception()) is not None:
+                errors.append(error)
+            else:
+                copied.append(futures[future])
+    if errors:
+        storage.delete_many(copied)
+        raise errors[0]
+
+
+def move_photos(photos: Iterable[Photo], album: Album) -> list[Photo]:
+    """Переместить фотографии в альбом.
+
+    Фотографии, которые уже находятся в альбоме, пропускаются. `Photo.save` не вызывается,
+    поэтому построение уменьшенных копий и сброс кэша галереи выполняются после фиксации транзакции здесь же.
+
+    Args:
+        photos (Iterable[Photo]): Перемещаемые фотографии.
+        album (Album): Альбом, в который перемещаются фотографии.
+
+    Returns:
+        list[Photo]: Перемещенные фотографии.
+    """
+    moved = [photo for photo in photos if photo.album_id != album.pk and photo.image]
+    if not moved:
+        return []
+
+    previous = {photo.pk: (photo.album_id, photo.image.name) for photo in moved}
+    names: list[tuple[str, str]] = []
+    modified_at = now()
+    for photo in moved:
+        photo.album = album
+        photo.modified_at = modified_at
+    new_names = free_photo_names(album, [storage.name(photo.image.name) for photo in moved])
+    for photo, new_name in zip(moved, new_names, strict=True):
+        names.append((photo.image.name, new_name))
+        photo.image.name = new_name
+
+    try:
+        copy_files(names)
+        try:
+            with transaction.atomic():
+                Photo.objects.bulk_update(moved, ["album", "image", "modified_at"])
+                transaction.on_commit(partial(storage.delete_many, list({src for src, _ in names})))
+                transaction.on_commit(partial(schedule_renditions, [photo.pk for photo in moved]))
+                transaction.on_commit(partial(bump_generation, "gallery"))
+        except Exception:
+            storage.delete_many([dst for _, dst in names])
+            raise
+    except Exception:
+        logger.exception(f'Ошибка перемещения фотографий в альбом "{album}"')
+        for photo in moved:
+            photo.album_id, photo.image.name = previous[photo.pk]
+            Photo.album.field.delete_cached_value(photo)
+        raise
+
+    for photo in moved:
+        photo.snapshot_loaded_values()
+    logger.info(f'Перемещено фотографий в альбом "{album}": {len(moved)}')
+    return moved
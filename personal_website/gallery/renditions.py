@@ -0,0 +1,165 @@
+"""
+Построение уменьшенных копий (renditions) изображений фотографий.
+
+Копии всех размеров строятся заранее, сразу после загрузки фотографии или изменения ее альбома,
+а не при первом обращении к ним из шаблона. Изменение размера выполняется в пуле процессов,
+поэтому не занимает процесс веб-сервера, обрабатывающий запрос. Состояние построения каждой копии
+хранится в модели `Rendition`.
+
+Если в настройке `GALLERY_RENDITION_WORKERS` указан 0, то копии строятся синхронно в текущем процессе.
+"""
+
+import logging
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+from multiprocessing import get_context
+
+import django
+from django.conf import settings
+from django.utils.timezone import now
+from PIL import Image, UnidentifiedImageError
+
+from gallery.models import RENDITION_SPECS, Photo, Rendition
+from gallery.schemas import RenditionSpec
+from personal_website.cache import bump_generation
+from personal_website.storages import StorageType, select_storage
+
+logger = logging.getLogger(settings.PROJECT_NAME)
+storage: StorageType = select_storage()
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def render_renditions(content: bytes, specs: Sequence[RenditionSpec]) -> list[tuple[bytes, int, int]]:
+    """Построить уменьшенные копии изображения.
+
+    Изображение декодируется один раз, после чего из него строятся копии всех размеров.
+
+    Args:
+        content (bytes): Содержимое файла исходного изображения.
+        specs (Sequence[RenditionSpec]): Параметры копий.
+
+    Returns:
+        list[tuple[bytes, int, int]]: Содержимое файла, ширина и высота каждой копии в порядке `specs`.
+    """
+    largest = max(spec.size for spec in specs)
+    with Image.open(BytesIO(content)) as img:
+        # Для JPEG декодирование сразу с уменьшением в 2, 4 или 8 раз значительно быстрее полного.
+        img.draft("RGB", (largest, largest))
+        source = img.convert("RGB")
+
+    results = []
+    for spec in specs:
+        image = source.copy()
+        # Адаптивные копии ограничиваются только по ширине, остальные - по наибольшей стороне.
+        height = source.height if spec.by_width else spec.size
+        image.thumbnail((spec.size, height), Image.Resampling.LANCZOS)
+        with BytesIO() as output:
+            image.save(output, format=spec.format, quality=spec.quality)
+            results.append((output.getvalue(), image.width, image.height))
+    return results
+
+
+def rendition_upload_path(photo: Photo, spec: RenditionSpec) -> str:
+    """Путь хранения копии. Копии хранятся в папке альбома фотографии рядом с исходными изображениями.
+
+    Расширение копии задается ее параметрами, поэтому в имя копии добавляется первичный ключ фотографии:
+    иначе копии изображений `IMG.jpg` и `IMG.png` одного альбома записывались бы в один файл.
+    """
+    stem = storage.stem(photo.image.name)
+    return f"{storage.parent(photo.image.name)}/renditions/{spec.name}/{stem}-{photo.pk}.{spec.extension}"
+
+
+def build_renditions(photo_pk: int, specs: Sequence[RenditionSpec] = RENDITION_SPECS) -> int:
+    """Построить и сохранить в хранилище все копии фотографии.
+
+    Args:
+        photo_pk (int): Первичный ключ фотографии.
+        specs (Sequence[RenditionSpec]): Параметры копий.
+
+    Returns:
+        int: Количество построенных копий.
+    """
+    photo = Photo.objects.filter(pk=photo_pk).only("pk", "image").first()
+    if photo is None:
+        return 0
+    mark_pending(photo_pk, specs)
+    renditions = {
+        rendition.spec: rendition
+        for rendition in Rendition.objects.filter(photo_id=photo_pk, spec__in=[spec.name for spec in specs])
+    }
+
+    try:
+        results = render_renditions(storage.read_bytes(photo.image.name), specs)
+    except (OSError, UnidentifiedImageError) as error:
+        message = f'Не удалось построить копии фотографии "{photo.image.name}": {error}'
+        logger.exception(message)
+        Rendition.objects.filter(photo_id=photo_pk, spec__in=renditions).update(
+            status=Rendition.Status.FAILED,
+            error=str(error),
+        )
+        return 0
+
+    for spec, (content, width, height) in zip(specs, results, strict=True):
+        rendition = renditions[spec.name]
+        previous_name = rendition.image.name
+        rendition.image.name = storage.save(rendition_upload_path(photo, spec), content)
+        if previous_name and previous_name != rendition.image.name:
+            storage.delete(previous_name)
+        rendition.width = width
+        rendition.height = height
+        rendition.status = Rendition.Status.READY
+        rendition.error = ""
+        rendition.updated_at = now()
+    Rendition.objects.bulk_update(renditions.values(), ("image", "width", "height", "status", "error", "updated_at"))
+    # Массовое обновление не отправляет сигналы, поэтому кэш страниц с новыми копиями сбрасывается явно.
+    bump_generation("gallery")
+    return len(renditions)
+
+
+def mark_pending(photo_pk: int, specs: Sequence[RenditionSpec] = RENDITION_SPECS) -> None:
+    """Создать записи копий фотографии или перевести существующие записи в состояние ожидания построения."""
+    Rendition.objects.bulk_create(
+        [Rendition(photo_id=photo_pk, spec=spec.name, status=Rendition.Status.PENDING) for spec in specs],
+        update_conflicts=True,
+        unique_fields=("photo", "spec"),
+        update_fields=("status",),
+    )
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Пул процессов для построения копий. Создается при первом обращении.
+
+    Процессы запускаются методом spawn, чтобы не наследовать открытые соединения с базой данных,
+    и перед выполнением задач инициализируют Django.
+    """
+    global _executor  # noqa: PLW0603
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.GALLERY_RENDITION_WORKERS,
+            mp_context=get_context("spawn"),
+            initializer=django.setup,
+        )
+    return _executor
+
+
+def _log_failure(future: Future) -> None:
+    """Записать в журнал исключение, возникшее при построении копий в пуле процессов."""
+    if error := future.exception():
+        message = f"Ошибка построения копий фотографии: {error}"
+        logger.error(message)
+
+
+def schedule_renditions(photo_pks: Iterable[int]) -> None:
+    """Поставить построение копий фотографий в очередь пула процессов.
+
+    Записи копий сразу переводятся в состояние ожидания, пока копии не построены,
+    вместо них используется исходное изображение.
+    """
+    for photo_pk in photo_pks:
+        if not settings.GALLERY_RENDITION_WORKERS:
+            build_renditions(photo_pk)
+            continue
+        mark_pending(photo_pk)
+        get_executor().submit(build_renditions, photo_pk).add_done_callback(_log_failure)
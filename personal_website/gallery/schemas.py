@@ -23,3 +23,73 @@ class ExifData(BaseModel):
         alias="DateTimeOriginal",
         description="Дата и время съемки",
     )
+
+
+class ImageInfo(BaseModel):
+    """Сведения об изображении, полученные при его проверке по заголовкам файла."""
+
+    model_config = ConfigDict(frozen=True)
+
+    format: str = Field(description="Формат файла в терминах PIL")
+    width: int = Field(gt=0, description="Ширина в пикселах")
+    height: int = Field(gt=0, description="Высота в пикселах")
+
+    @property
+    def pixels(self) -> int:
+        """Количество пикселов изображения."""
+        return self.width * self.height
+
+
+class RenditionSpec(BaseModel):
+    """Параметры построения уменьшенной копии изображения фотографии."""
+
+    model_config = ConfigDict(frozen=True)
+
+    name: str = Field(description="Наименование копии")
+    size: int = Field(gt=0, description="Размер в пикселах по наибольшей стороне")
+    format: str = Field(default="JPEG", description="Формат файла, поддерживаемый PIL")
+    quality: int = Field(default=90, ge=1, le=100, description="Качество сжатия")
+    by_width: bool = Field(
+        default=False,
+        description="Ограничивать размером только ширину (для адаптивных копий в srcset), а не наибольшую сторону",
+    )
+
+    @property
+    def extension(self) -> str:
+        """Расширение файла копии."""
+        return {"JPEG": "jpg"}.get(self.format, self.format.lower())
+
+    @property
+    def mime_type(self) -> str:
+        """MIME-тип файла копии."""
+        return f"image/{self.format.lower()}"
+
+
+class UploadResult(BaseModel):
+    """Результат загрузки одного файла при пакетной загрузке фотографий."""
+
+    file_name: str = Field(description="Имя загруженного файла")
+    uploaded: bool = Field(description="Фотография создана")
+    message: str = Field(description="Сообщение о результате загрузки")
+    url: str = Field(default="", description="Ссылка на созданную фотографию")
+    duplicates: list[str] = Field(default_factory=list, description="Ссылки на похожие фотографии в галерее")
+
+
+class ChunkedUploadStart(BaseModel):
+    """Параметры начала загрузки файла фотографии по частям."""
+
+    album: int = Field(description="Идентификатор альбома")
+    file_name: str = Field(min_length=1, max_length=255, description="Имя загружаемого файла")
+    size: int = Field(gt=0, description="Размер файла в байтах")
+
+
+class ChunkedUploadState(BaseModel):
+    """Состояние загрузки файла фотографии по частям, по которому клиент возобновляет загрузку."""
+
+    id: str = Field(description="Идентификатор загрузки")
+    file_name: str = Field(description="Имя загружаемого файла")
+    size: int = Field(description="Размер файла в байтах")
+    received: int = Field(description="Количество загруженных байт")
+    chunk_size: int = Field(description="Размер части файла в байтах")
+    parts: list[int] = Field(description="Номера загруженных частей")
+    completed: bool = Field(description="Загрузка завершена и фотография создана")
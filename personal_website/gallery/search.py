@@ -0,0 +1,154 @@
+"""
+Поиск по фотографиям, альбомам и тэгам галереи.
+
+В PostgreSQL у фотографий и альбомов хранятся поисковые векторы (`search_vector`) с GIN-индексами:
+у фотографии - из названия, описания, камеры и объектива, у альбома - из названия и описания. Векторы
+обновляются при сохранении объектов, поэтому при поиске тексты заново не разбираются. Для поиска
+по части слова (например, модели камеры `X-T3`) по названиям, описанию и колонкам EXIF построены
+триграммные индексы (`pg_trgm`) по выражению `UPPER(поле)`, которые используются условием `icontains`.
+
+Каждый тип результатов выбирается одним запросом: фотографии - страницей по курсору `(taken_at, pk)`,
+альбомы и тэги - первыми найденными объектами.
+
+В SQLite (SourceCraft CI/CD) поиск выполняется по вхождению каждого слова запроса в одно из полей.
+"""
+
+import operator
+import re
+from collections.abc import Iterable
+from functools import reduce
+
+from django.contrib.postgres.search import CombinedSearchVector, SearchQuery, SearchVector
+from django.db.models import Q, QuerySet
+
+from gallery.models import Album, Photo, Tag
+from personal_website.db import is_postgresql
+
+# Конфигурации полнотекстового поиска PostgreSQL для названий и описаний.
+SEARCH_CONFIGS = ("russian", "english")
+
+# Конфигурация для колонок EXIF: модели камер и объективов не являются словами языка.
+EXIF_SEARCH_CONFIG = "simple"
+
+# Текстовые поля и их веса в поисковых векторах фотографий и альбомов.
+PHOTO_SEARCH_FIELDS = (("name", "A"), ("description", "B"))
+PHOTO_EXIF_SEARCH_FIELDS = (("camera", "C"), ("lens_model", "C"))
+ALBUM_SEARCH_FIELDS = (("name", "A"), ("description", "B"))
+
+# Поля, по которым выполняется поиск по части слова.
+PHOTO_TRIGRAM_FIELDS = ("name", "description", "camera", "lens_model")
+ALBUM_TRIGRAM_FIELDS = ("name",)
+TAG_TRIGRAM_FIELDS = ("name",)
+
+# Поля, при изменении которых пересчитывается поисковый вектор фотографии.
+PHOTO_VECTOR_FIELDS = tuple(field for field, _ in PHOTO_SEARCH_FIELDS + PHOTO_EXIF_SEARCH_FIELDS)
+
+# Триграммный индекс не ускоряет поиск строк короче одной триграммы, поэтому более короткие запросы
+# в PostgreSQL ищутся только по поисковому вектору.
+TRIGRAM_MIN_LENGTH = 3
+
+# Количество найденных альбомов и тэгов, которые выводятся над фотографиями.
+SEARCH_ALBUMS_LIMIT = 12
+SEARCH_TAGS_LIMIT = 30
+
+
+def search_vectors(fields: Iterable[tuple[str, str]], configs: Iterable[str]) -> list[SearchVector]:
+    """Векторы полей с весами во всех конфигурациях."""
+    return [SearchVector(field, config=config, weight=weight) for field, weight in fields for config in configs]
+
+
+def photo_search_vector() -> SearchVector | CombinedSearchVector:
+    """Выражение поискового вектора фотографии."""
+    vectors = search_vectors(PHOTO_SEARCH_FIELDS, SEARCH_CONFIGS)
+    vectors += search_vectors(PHOTO_EXIF_SEARCH_FIELDS, (EXIF_SEARCH_CONFIG,))
+    return reduce(operator.add, vectors)
+
+
+def album_search_vector() -> SearchVector | CombinedSearchVector:
+    """Выражение поискового вектора альбома."""
+    return reduce(operator.add, search_vectors(ALBUM_SEARCH_FIELDS, SEARCH_CONFIGS))
+
+
+def update_photo_search_vectors(photo_pks: Iterable[int]) -> None:
+    """Пересчитать поисковые векторы фотографий одним запросом. В SQLite векторы не используются."""
+    if is_postgresql():
+        Photo.objects.filter(pk__in=list(photo_pks)).update(search_vector=photo_search_vector())
+
+
+def update_album_search_vectors(album_pks: Iterable[int]) -> None:
+    """Пересчитать поисковые векторы альбомов одним запросом. В SQLite векторы не используются."""
+    if is_postgresql():
+        Album.objects.filter(pk__in=list(album_pks)).update(search_vector=album_search_vector())
+
+
+def gallery_search_query(text: str) -> SearchQuery:
+    """Поисковый запрос в синтаксисе поисковых систем во всех конфигурациях, включая конфигурацию EXIF."""
+    configs = (*SEARCH_CONFIGS, EXIF_SEARCH_CONFIG)
+    queries = [SearchQuery(text, config=config, search_type="websearch") for config in configs]
+    return reduce(operator.or_, queries)
+
+
+def search_condition(text: str, trigram_fields: Iterable[str], vector_fields: Iterable[str] = ()) -> Q | None:
+    """Условие поиска объектов по запросу.
+
+    Args:
+        text (str): Поисковый запрос.
+        trigram_fields (Iterable[str]): Поля с триграммными индексами, по которым ищется вхождение запроса.
+        vector_fields (Iterable[str]): Поля поискового вектора модели. Если не указаны, то вектора у модели нет.
+
+    Returns:
+        Q | None: Условие поиска или None, если в запросе нет слов.
+    """
+    text = text.strip()
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return None
+    vector_fields = tuple(vector_fields)
+    if is_postgresql():
+        conditions = [Q(search_vector=gallery_search_query(text))] if vector_fields else []
+        if len(text) >= TRIGRAM_MIN_LENGTH or not conditions:
+            conditions.extend(Q(**{f"{field}__icontains": text}) for field in trigram_fields)
+        return reduce(operator.or_, conditions)
+    fields = tuple(dict.fromkeys((*vector_fields, *trigram_fields)))
+    return reduce(
+        operator.and_,
+        (reduce(operator.or_, (Q(**{f"{field}__icontains": term}) for field in fields)) for term in terms),
+    )
+
+
+def search_photos(text: str, photos: QuerySet[Photo] | None = None) -> QuerySet[Photo]:
+    """Найти фотографии по названию, описанию, камере и объективу.
+
+    Args:
+        text (str): Поисковый запрос.
+        photos (QuerySet[Photo] | None): Фотографии, среди которых выполняется поиск. По умолчанию - публичные.
+
+    Returns:
+        QuerySet[Photo]: Найденные фотографии без сортировки: страница выбирается по курсору.
+    """
+    photos = Photo.published.all() if photos is None else photos
+    condition = search_condition(text, PHOTO_TRIGRAM_FIELDS, PHOTO_VECTOR_FIELDS)
+    if condition is None:
+        return photos.none()
+    return photos.defer("search_vector").filter(condition)
+
+
+def search_albums(text: str, albums: QuerySet[Album] | None = None) -> QuerySet[Album]:
+    """Найти альбомы по названию и описанию. По умолчанию поиск выполняется среди публичных альбомов.
+
+    Набор альбомов должен содержать обложку (`select_related("cover")`), как у `Album.published`.
+    """
+    albums = Album.published.all() if albums is None else albums
+    condition = search_condition(text, ALBUM_TRIGRAM_FIELDS, (field for field, _ in ALBUM_SEARCH_FIELDS))
+    if condition is None:
+        return albums.none()
+    return albums.defer("search_vector", "cover__search_vector").filter(condition)[:SEARCH_ALBUMS_LIMIT]
+
+
+def search_tags(text: str, tags: QuerySet[Tag] | None = None) -> QuerySet[Tag]:
+    """Найти тэги по наименованию."""
+    tags = Tag.objects.all() if tags is None else tags
+    condition = search_condition(text, TAG_TRIGRAM_FIELDS)
+    if condition is None:
+        return tags.none()
+    return tags.filter(condition)[:SEARCH_TAGS_LIMIT]
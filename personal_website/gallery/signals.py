@@ -0,0 +1,27 @@
+"""Сброс кэша страниц галереи через сигналы при изменении фотографий, альбомов и тэгов."""
+
+from typing import Any
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from gallery.models import Album, Photo, Tag
+from personal_website.cache import bump_generation
+
+
+@receiver(post_save, sender=Photo)
+@receiver(post_delete, sender=Photo)
+@receiver(post_save, sender=Album)
+@receiver(post_delete, sender=Album)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_gallery_cache(sender: Any, **kwargs) -> None:
+    """После изменения или удаления объекта галереи."""
+    bump_generation("gallery")
+
+
+@receiver(m2m_changed, sender=Photo.tags.through)
+def invalidate_gallery_cache_on_tags_change(sender: Any, action: str, **kwargs) -> None:
+    """После изменения тэгов фотографии."""
+    if action.startswith("post_"):
+        bump_generation("gallery")
@@ -5,9 +5,12 @@ from pathlib import Path
 
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from gallery.apps import GalleryConfig
+from gallery.duplicates import MAX_DUPLICATE_DISTANCE
 from gallery.factories import AlbumFactory, PhotoFactory
 from gallery.models import Album, Photo, Tag
 from personal_website.storages import StorageType, select_storage
@@ -94,6 +97,18 @@ class GalleryAdminTests(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, HTTPStatus.OK)
 
+    def test_album_admin_list_queries(self) -> None:
+        """Количество запросов при отображении списка альбомов не зависит от количества альбомов."""
+        url = ADMIN_URL + "gallery/album/"
+        AlbumFactory()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        for _ in range(3):
+            PhotoFactory(album=AlbumFactory(), image=None)
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
     def test_tag_admin_list_page_displayed(self) -> None:
         """Проверяет, что в административной панели отображается модель тэга."""
         tags_verbose_name = Tag._meta.verbose_name_plural  # noqa: SLF001
@@ -194,3 +209,79 @@ class GalleryAdminTests(TestCase):
             album.refresh_from_db()
             self.assertEqual(response.status_code, HTTPStatus.FOUND)
             self.assertEqual(album.slug, new_slug)
+
+    def test_photo_move_to_album_action(self) -> None:
+        """Проверка действия перемещения выбранных фотографий в другой альбом."""
+        source, target = AlbumFactory(name="Source album"), AlbumFactory(name="Target album")
+        photos = PhotoFactory.create_batch(3, album=source)
+        old_names = [photo.image.name for photo in photos]
+        url = ADMIN_URL + "gallery/photo/"
+        data = {"action": "move_to_album", "_selected_action": [photo.pk for photo in photos]}
+
+        with self.subTest("Альбом не выбран"):
+            response = self.client.post(url, data, follow=True)
+            self.assertContains(response, "Выберите альбом")
+            self.assertEqual(Photo.objects.filter(album=source).count(), len(photos))
+
+        with self.subTest("Фотографии перемещены одним запросом обновления"):
+            with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(url, {**data, "album": target.pk}, follow=True)
+            self.assertContains(response, f"Перемещено фотографий в альбом &quot;{target}&quot;: {len(photos)}")
+            updates = [query for query in queries if query["sql"].startswith('UPDATE "gallery_photo"')]
+            self.assertEqual(len(updates), 1)
+            for photo, old_name in zip(photos, old_names, strict=True):
+                photo.refresh_from_db()
+                self.assertEqual(photo.album, target)
+                self.assertIn(f"albums/{target.pk}/", photo.image.name)
+                self.assertTrue(storage.exists(photo.image.name))
+                self.assertFalse(storage.exists(old_name))
+
+    def test_photo_move_keeps_existing_files(self) -> None:
+        """При перемещении копии не перезаписывают файлы с теми же именами в каталоге нового альбома."""
+        target = AlbumFactory(name="Target album")
+        existing = PhotoFactory(album=target)
+        file_name = storage.name(existing.image.name)
+        content = storage.read_bytes(existing.image.name)
+        photos = [
+            PhotoFactory(album=AlbumFactory(), image=SimpleUploadedFile(file_name, content + bytes([number])))
+            for number in range(2)
+        ]
+        data = {"action": "move_to_album", "_selected_action": [photo.pk for photo in photos], "album": target.pk}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(ADMIN_URL + "gallery/photo/", data, follow=True)
+        for photo in photos:
+            photo.refresh_from_db()
+        names = [existing.image.name, *(photo.image.name for photo in photos)]
+        self.assertEqual(len(set(names)), len(names))
+        self.assertEqual(storage.read_bytes(existing.image.name), content)
+        for number, photo in enumerate(photos):
+            self.assertEqual(photo.album, target)
+            self.assertIn(f"albums/{target.pk}/", photo.image.name)
+            self.assertEqual(storage.read_bytes(photo.image.name), content + bytes([number]))
+
+    def test_photo_duplicates_report(self) -> None:
+        """Отчет о дубликатах показывает группы похожих фотографий, а страница фотографии - ее дубликаты."""
+        album = AlbumFactory()
+        content = storage.read_bytes(self.image_path)
+        photos = [PhotoFactory(album=album, image=SimpleUploadedFile(f"{i}.jpg", content)) for i in range(2)]
+        change_url = ADMIN_URL + f"gallery/photo/{photos[1].pk}/change/"
+
+        with self.subTest("Ссылка на отчет в списке фотографий"):
+            response = self.client.get(ADMIN_URL + "gallery/photo/")
+            self.assertContains(response, ADMIN_URL + "gallery/photo/duplicates/")
+
+        with self.subTest("Группа дубликатов в отчете"):
+            response = self.client.get(ADMIN_URL + "gallery/photo/duplicates/", {"distance": 0})
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            groups = [[photo.pk for photo in group] for group in response.context["groups"]]
+            self.assertEqual(groups, [[photos[0].pk, photos[1].pk]])
+            self.assertContains(response, change_url)
+
+        with self.subTest("Расстояние ограничено количеством полос хэша"):
+            response = self.client.get(ADMIN_URL + "gallery/photo/duplicates/", {"distance": 64})
+            self.assertEqual(response.context["distance"], MAX_DUPLICATE_DISTANCE)
+
+        with self.subTest("Дубликаты на странице фотографии"):
+            response = self.client.get(ADMIN_URL + f"gallery/photo/{photos[0].pk}/change/")
+            self.assertContains(response, f'<a href="{change_url}">{photos[1]}</a> (0)', html=True)
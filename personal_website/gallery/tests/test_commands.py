@@ -0,0 +1,110 @@
+"""Тесты административных команд галереи."""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase
+
+from gallery.factories import AlbumFactory, PhotoFactory
+from gallery.models import Photo, Rendition
+from gallery.renditions import RENDITION_SPECS
+from personal_website.utils import list_file_paths
+
+
+class UpdatePhotoMetadataCommandTests(TestCase):
+    """Тесты команды заполнения метаданных фотографий."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Создать фотографии из тестовых изображений и сбросить их метаданные."""
+        album = AlbumFactory()
+        for image in list_file_paths("gallery/photos"):
+            PhotoFactory(image=image, name=None, album=album)
+        Photo.objects.update(taken_at=F("uploaded_at"), camera="", lens_model="", metadata_read_at=None)
+        return super().setUpTestData()
+
+    def test_metadata_filled(self) -> None:
+        """Команда заполняет метаданные всех фотографий, метаданные которых не прочитаны из изображения."""
+        out = StringIO()
+        call_command("update_photo_metadata", batch_size=2, stdout=out)
+        self.assertFalse(Photo.objects.filter(metadata_read_at__isnull=True).exists())
+        self.assertFalse(Photo.objects.filter(taken_at=F("uploaded_at")).exists())
+        self.assertFalse(Photo.objects.filter(camera="").exists())
+        self.assertIn(str(Photo.objects.count()), out.getvalue())
+
+    def test_only_empty_metadata_updated(self) -> None:
+        """Без флага --all команда не перечитывает уже заполненные метаданные."""
+        call_command("update_photo_metadata", stdout=StringIO())
+        photo = Photo.objects.first()
+        self.assertIsNotNone(photo)
+        if photo:
+            # Время съемки совпадает со временем загрузки, но метаданные уже прочитаны.
+            Photo.objects.filter(pk=photo.pk).update(camera="Test camera", taken_at=F("uploaded_at"))
+            call_command("update_photo_metadata", stdout=StringIO())
+            photo.refresh_from_db()
+            self.assertEqual(photo.camera, "Test camera")
+
+            call_command("update_photo_metadata", "--all", stdout=StringIO())
+            photo.refresh_from_db()
+            self.assertNotEqual(photo.camera, "Test camera")
+
+
+class BuildRenditionsCommandTests(TestCase):
+    """Тесты команды построения копий изображений фотографий."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Создать фотографии из тестовых изображений без построенных копий."""
+        album = AlbumFactory()
+        for image in list_file_paths("gallery/photos")[:2]:
+            PhotoFactory(image=image, name=None, album=album)
+        return super().setUpTestData()
+
+    def test_renditions_built(self) -> None:
+        """Команда строит копии всех фотографий, у которых они отсутствуют."""
+        out = StringIO()
+        call_command("build_renditions", workers=0, stdout=out)
+        expected = Photo.objects.count() * len(RENDITION_SPECS)
+        self.assertEqual(Rendition.objects.filter(status=Rendition.Status.READY).count(), expected)
+        self.assertIn(str(expected), out.getvalue())
+
+    def test_only_missing_renditions_built(self) -> None:
+        """Без флага --all команда не перестраивает уже готовые копии."""
+        call_command("build_renditions", workers=0, stdout=StringIO())
+        out = StringIO()
+        call_command("build_renditions", workers=0, stdout=out)
+        self.assertIn("Построено 0 копий", out.getvalue())
+
+        out = StringIO()
+        call_command("build_renditions", "--all", workers=0, stdout=out)
+        self.assertNotIn("Построено 0 копий", out.getvalue())
+
+
+class UpdatePhotoHashesCommandTests(TestCase):
+    """Тесты команды вычисления хэшей изображений фотографий."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Создать фотографии из тестовых изображений и сбросить их хэши."""
+        album = AlbumFactory()
+        for image in list_file_paths("gallery/photos")[:2]:
+            PhotoFactory(image=image, name=None, album=album)
+        Photo.objects.update(content_hash="", perceptual_hash=None)
+        return super().setUpTestData()
+
+    def test_hashes_updated(self) -> None:
+        """Команда вычисляет хэши фотографий без хэшей, а с флагом --all - всех фотографий."""
+        out = StringIO()
+        call_command("update_photo_hashes", workers=0, stdout=out)
+        self.assertFalse(Photo.objects.filter(content_hash="").exists())
+        self.assertFalse(Photo.objects.filter(perceptual_hash__isnull=True).exists())
+        self.assertIn(f"Вычислены хэши изображений {Photo.objects.count()}", out.getvalue())
+
+        out = StringIO()
+        call_command("update_photo_hashes", workers=0, stdout=out)
+        self.assertIn("Вычислены хэши изображений 0 из 0 фотографий, найдено групп дубликатов", out.getvalue())
+
+        out = StringIO()
+        call_command("update_photo_hashes", "--all", workers=0, stdout=out)
+        self.assertIn(f"из {Photo.objects.count()} фотографий", out.getvalue())
@@ -0,0 +1,103 @@
+"""Тесты поиска дубликатов фотографий."""
+
+import hashlib
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image, ImageDraw
+
+from gallery.duplicates import (
+    MAX_DUPLICATE_DISTANCE,
+    find_duplicate_groups,
+    find_duplicates,
+    get_duplicate_groups,
+    update_photo_hashes,
+)
+from gallery.factories import AlbumFactory, PhotoFactory
+from gallery.models import Photo
+from gallery.utils import hash_bands
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "test"}}
+
+
+def make_image(size: tuple[int, int] = (320, 240), image_format: str = "JPEG", *, mirrored: bool = False) -> bytes:
+    """Создать изображение с градиентом и фигурами. Отраженное изображение не похоже на исходное."""
+    image = Image.radial_gradient("L").resize((320, 240)).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((20, 30, 140, 200), fill=(200, 30, 30))
+    draw.ellipse((180, 40, 300, 160), fill=(20, 20, 220))
+    if mirrored:
+        image = image.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+    with BytesIO() as output:
+        image.resize(size).save(output, format=image_format)
+        return output.getvalue()
+
+
+class DuplicatesTests(TestCase):
+    """Тесты поиска дубликатов фотографий по хэшам изображений."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Создать фотографию, ее точную копию, уменьшенную копию в другом формате и непохожую фотографию."""
+        album = AlbumFactory()
+        cls.content = make_image()
+        cls.original = PhotoFactory(album=album, image=SimpleUploadedFile("original.jpg", cls.content))
+        cls.copy = PhotoFactory(album=album, image=SimpleUploadedFile("copy.jpg", cls.content))
+        cls.resized = PhotoFactory(album=album, image=SimpleUploadedFile("resized.png", make_image((160, 120), "PNG")))
+        cls.other = PhotoFactory(album=album, image=SimpleUploadedFile("other.jpg", make_image(mirrored=True)))
+        return super().setUpTestData()
+
+    def test_photo_hashes(self) -> None:
+        """Хэши изображения вычисляются при сохранении фотографии."""
+        photo = Photo.objects.get(pk=self.original.pk)
+        self.assertEqual(photo.content_hash, hashlib.sha256(self.content).hexdigest())
+        self.assertIsNotNone(photo.perceptual_hash)
+        if photo.perceptual_hash is not None:
+            bands = (photo.hash_band_0, photo.hash_band_1, photo.hash_band_2, photo.hash_band_3)
+            self.assertEqual(bands, hash_bands(photo.perceptual_hash))
+
+    def test_find_duplicates(self) -> None:
+        """Находятся точные и уменьшенные копии фотографии, но не другие фотографии."""
+        with self.assertNumQueries(1):
+            duplicates = find_duplicates([self.original, self.other])
+        found = {photo.pk: distance for photo, distance in duplicates[self.original.pk]}
+        self.assertEqual(set(found), {self.copy.pk, self.resized.pk})
+        self.assertEqual(found[self.copy.pk], 0)
+        self.assertEqual(duplicates[self.other.pk], [])
+
+        with self.subTest("Похожими считаются фотографии в пределах расстояния"):
+            duplicates = find_duplicates([self.original], max_distance=-1)
+            self.assertEqual([photo.pk for photo, _ in duplicates[self.original.pk]], [self.copy.pk])
+
+    def test_find_duplicate_groups(self) -> None:
+        """Все фотографии галереи разбиваются на группы дубликатов."""
+        groups = find_duplicate_groups()
+        self.assertEqual(groups, [sorted((self.original.pk, self.copy.pk, self.resized.pk))])
+
+        with self.subTest("Расстояние ограничено количеством полос хэша"):
+            self.assertEqual(find_duplicate_groups(64), find_duplicate_groups(MAX_DUPLICATE_DISTANCE))
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_duplicate_groups_cached(self) -> None:
+        """Группы дубликатов строятся один раз для поколения галереи и заново после изменения фотографий."""
+        cache.clear()
+        groups = get_duplicate_groups()
+        self.assertEqual(groups, [sorted((self.original.pk, self.copy.pk, self.resized.pk))])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_duplicate_groups(), groups)
+
+        Photo.objects.get(pk=self.resized.pk).delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_duplicate_groups(), [sorted((self.original.pk, self.copy.pk))])
+
+    def test_update_photo_hashes(self) -> None:
+        """Хэши ранее загруженной фотографии вычисляются без вызова `Photo.save`."""
+        Photo.objects.filter(pk=self.resized.pk).update(content_hash="", perceptual_hash=None, hash_band_0=None)
+        self.assertTrue(update_photo_hashes(self.resized.pk))
+        photo = Photo.objects.get(pk=self.resized.pk)
+        self.assertEqual(photo.content_hash, self.resized.content_hash)
+        self.assertEqual(photo.perceptual_hash, self.resized.perceptual_hash)
+        self.assertEqual(photo.hash_band_0, self.resized.hash_band_0)
+        self.assertFalse(update_photo_hashes(0))
@@ -4,11 +4,15 @@ import datetime
 from http import HTTPStatus
 from typing import TYPE_CHECKING
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from faker import Faker
 
 from gallery.models import Album, Photo, Tag, photo_image_upload_path
+from gallery.utils import read_exif
 from personal_website.storages import FakerFileStorageAdapter, StorageType, select_storage
+from personal_website.utils import list_file_paths
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -141,6 +145,19 @@ class GalleryModelsTests(TestCase):
         tuscany_photos.all()
         self.assertFalse(tuscany_photos.exists())
 
+    def test_album_annotated_photo_counts(self) -> None:
+        """Количество фотографий альбома, полученного с аннотацией, берется из нее без дополнительных запросов."""
+        photo = self.tuscany_album.photo_set.first()
+        self.assertIsNotNone(photo)
+        if photo:
+            photo.public = False
+            photo.save()
+        album = Album.published.get(pk=self.tuscany_album.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(album.photos_count, 3)
+            self.assertEqual(album.public_photos_count, 2)
+            self.assertEqual(album.cover, self.tuscany_album.cover)
+
     def test_tags_relations(self) -> None:
         """Проверить отношения модели тэга с моделями фотографии и альбома."""
         # Отобрать объекты из тестовой базы данных для модуля.
@@ -310,3 +327,67 @@ class GalleryModelsTests(TestCase):
             self.assertNotEqual(old_relative_path, photo.image.name)
             self.assertEqual(photo.image.name, upload_path)
             self.assertTrue(new_path_exists)
+
+    def test_photo_changes_tracked(self) -> None:
+        """Изменения фотографии определяются без повторного запроса, обновляются только измененные поля."""
+        from gallery.factories import PhotoFactory
+
+        photo = Photo.objects.filter(pk=PhotoFactory.create(album=self.tuscany_album).pk).first()
+        self.assertIsInstance(photo, Photo)
+        if photo:
+            with self.subTest("Загруженная фотография не содержит изменений"):
+                self.assertEqual(photo.get_changed_fields(), {})
+
+            with self.subTest("Измененное поле и его прежнее значение"):
+                description = photo.description
+                photo.description = "Новое описание"
+                self.assertEqual(photo.get_changed_fields(), {"description": description})
+
+            with self.subTest("Сохранение выполняет один запрос, обновляющий измененные поля"):
+                with CaptureQueriesContext(connection) as queries:
+                    photo.save()
+                self.assertEqual(len(queries), 1)
+                sql = queries[0]["sql"]
+                self.assertTrue(sql.startswith("UPDATE"))
+                self.assertIn('"description"', sql)
+                self.assertIn('"modified_at"', sql)
+                self.assertNotIn('"camera"', sql)
+                self.assertEqual(photo.get_changed_fields(), {})
+
+            with self.subTest("Перемещение в другой альбом определяется без запроса фотографии"):
+                photo.album = self.langtang_album
+                with CaptureQueriesContext(connection) as queries:
+                    photo.save()
+                self.assertFalse(any('FROM "gallery_photo"' in query["sql"] for query in queries))
+                self.assertTrue(storage.exists(photo.image.path))
+                self.assertIn(f"albums/{self.langtang_album.pk}/", photo.image.name)
+
+            with self.subTest("Изменения фотографии, созданной с первичным ключом, определяются по базе данных"):
+                copy = Photo(pk=photo.pk, album=photo.album, image=photo.image.name, name=photo.name, slug=photo.slug)
+                self.assertIn("taken_at", copy.get_changed_fields())
+                copy.load_previous_values()
+                self.assertNotIn("image", copy.get_changed_fields())
+
+    def test_photo_metadata_saved(self) -> None:
+        """Метаданные EXIF сохраняются в полях фотографии при сохранении."""
+        image = list_file_paths("gallery/photos")[0]
+        photo = Photo.objects.create(image=image, album=self.tuscany_album)
+        photo.refresh_from_db()
+        exif = read_exif(image)
+
+        with self.subTest("Время съемки заполнено"):
+            self.assertIsInstance(photo.taken_at, datetime.datetime)
+            self.assertEqual(photo.datetime_taken, photo.taken_at)
+            self.assertIsNotNone(photo.metadata_read_at)
+
+        with self.subTest("Камера и объектив заполнены из EXIF"):
+            self.assertIn(str(exif.make), photo.camera)
+            self.assertEqual(photo.lens_model, exif.lens_model)
+            self.assertEqual(photo.iso, exif.iso_speed)
+            self.assertEqual(photo.focal_length, exif.focal_length)
+
+        with self.subTest("Метаданные не перечитываются, если изображение не изменилось"):
+            photo.camera = "Test camera"
+            photo.save()
+            photo.refresh_from_db()
+            self.assertEqual(photo.camera, "Test camera")
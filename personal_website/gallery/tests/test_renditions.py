@@ -0,0 +1,123 @@
+"""Тесты построения уменьшенных копий изображений фотографий."""
+
+from django.template.loader import render_to_string
+from django.test import TestCase
+
+from gallery.factories import AlbumFactory
+from gallery.models import Photo, Rendition, responsive_formats
+from gallery.renditions import RENDITION_SPECS, build_renditions, render_renditions
+from personal_website.storages import StorageType, select_storage
+from personal_website.utils import list_file_paths
+
+storage: StorageType = select_storage()
+
+
+class RenditionsTests(TestCase):
+    """Тесты конвейера построения копий изображений."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Создать альбомы и выбрать тестовое изображение."""
+        super().setUpTestData()
+        cls.album = AlbumFactory()
+        cls.other_album = AlbumFactory()
+        cls.image = list_file_paths("gallery/photos")[0]
+
+    def create_photo(self, image: str | None = None) -> Photo:
+        """Создать фотографию и выполнить построение копий после фиксации транзакции."""
+        with self.captureOnCommitCallbacks(execute=True):
+            photo = Photo.objects.create(image=image or self.image, album=self.album)
+        return Photo.objects.prefetch_related("renditions").get(pk=photo.pk)
+
+    def test_render_renditions(self) -> None:
+        """Копии уменьшаются до заданного размера по наибольшей стороне."""
+        results = render_renditions(storage.read_bytes(self.image), RENDITION_SPECS)
+        self.assertEqual(len(results), len(RENDITION_SPECS))
+        for spec, (content, width, height) in zip(RENDITION_SPECS, results, strict=True):
+            with self.subTest(spec=spec.name):
+                self.assertTrue(content)
+                self.assertLessEqual(max(width, height), spec.size)
+
+    def test_renditions_built_on_upload(self) -> None:
+        """После загрузки фотографии построены все копии, и они используются вместо исходного изображения."""
+        photo = self.create_photo()
+        renditions = photo.renditions.all()
+
+        with self.subTest("Копии всех размеров построены"):
+            self.assertEqual(len(renditions), len(RENDITION_SPECS))
+            for rendition in renditions:
+                self.assertEqual(rendition.status, Rendition.Status.READY)
+                self.assertTrue(storage.exists(rendition.image.name))
+
+        with self.subTest("Свойства фотографии возвращают копии"):
+            self.assertNotEqual(photo.image_preview.name, photo.image.name)
+            self.assertNotEqual(photo.image_thumbnail.name, photo.image.name)
+            self.assertIn("/renditions/preview/", str(photo.image_preview.name))
+
+    def test_original_used_until_built(self) -> None:
+        """Пока копии не построены, используется исходное изображение."""
+        photo = Photo.objects.create(image=self.image, album=self.album)
+        self.assertFalse(photo.renditions.exists())
+        self.assertEqual(photo.image_preview.name, photo.image.name)
+
+    def test_renditions_rebuilt_on_album_change(self) -> None:
+        """После изменения альбома копии перестраиваются в папке нового альбома, старые файлы удаляются."""
+        # Изображение перемещается в папку нового альбома, поэтому используется копия тестового изображения.
+        image = f"gallery/test_renditions/{storage.name(self.image)}"
+        storage.copy_file(self.image, image)
+        photo = self.create_photo(image)
+        old_name = str(photo.image_preview.name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            photo.album = self.other_album
+            photo.save()
+        photo = Photo.objects.prefetch_related("renditions").get(pk=photo.pk)
+
+        self.assertNotEqual(photo.image_preview.name, old_name)
+        self.assertTrue(str(photo.image_preview.name).startswith(storage.parent(photo.image.name)))
+        self.assertFalse(storage.exists(old_name))
+
+    def test_same_stem_renditions(self) -> None:
+        """Копии изображений с одинаковыми именами и разными расширениями хранятся в разных файлах."""
+        images = [f"gallery/test_renditions/same{extension}" for extension in (".jpg", ".png")]
+        for image in images:
+            storage.copy_file(self.image, image)
+        photos = [self.create_photo(image) for image in images]
+
+        names = [{rendition.image.name for rendition in photo.renditions.all()} for photo in photos]
+        self.assertFalse(names[0] & names[1])
+        for name in names[0] | names[1]:
+            self.assertTrue(storage.exists(name))
+
+    def test_failed_status(self) -> None:
+        """Если изображение не удалось прочитать, то копии получают состояние ошибки."""
+        photo = self.create_photo()
+        Photo.objects.filter(pk=photo.pk).update(image="gallery/missing.jpg")
+
+        self.assertEqual(build_renditions(photo.pk), 0)
+        statuses = set(photo.renditions.values_list("status", flat=True))
+        self.assertEqual(statuses, {Rendition.Status.FAILED})
+
+    def test_responsive_renditions(self) -> None:
+        """Адаптивные копии ограничены по ширине и собираются в атрибуты srcset по форматам."""
+        photo = self.create_photo()
+        responsive_specs = [spec for spec in RENDITION_SPECS if spec.by_width]
+        widths = {rendition.spec: rendition.width for rendition in photo.renditions.all()}
+
+        with self.subTest("Ширина копий не превышает заданную"):
+            for spec in responsive_specs:
+                self.assertLessEqual(widths[spec.name], spec.size)
+
+        with self.subTest("Атрибуты srcset собраны для каждого формата"):
+            self.assertEqual(
+                list(photo.srcsets),
+                [f"image/{image_format.lower()}" for image_format in responsive_formats],
+            )
+            self.assertIn("w,", photo.image_srcset + ",")
+            self.assertNotIn("image/jpeg", [source["type"] for source in photo.image_sources])
+
+        with self.subTest("Шаблон выводит тэг picture с источниками современных форматов"):
+            html = render_to_string("gallery/picture.html", {"photo": photo, "src": photo.image_preview.url})
+            self.assertIn("<picture>", html)
+            self.assertIn('type="image/webp"', html)
+            self.assertIn(f'srcset="{photo.image_srcset}"', html)
@@ -1,22 +1,32 @@
 """Тесты вспомогательных утилит галереи."""
 
+from io import BytesIO
 from pathlib import Path
+from unittest.mock import patch
 
 from django.test import SimpleTestCase, TestCase
 from faker import Faker
 from faker_file.providers.jpeg_file import JpegFileProvider  # type:ignore[import-untyped]
 from faker_file.providers.txt_file import TxtFileProvider  # type:ignore[import-untyped]
+from PIL import Image
+from PIL.ExifTags import Base
 
 from gallery.apps import GalleryConfig
 from gallery.factories import AlbumFactory, ExifDataFactory, PhotoFactory
 from gallery.models import Photo
 from gallery.schemas import ExifData
 from gallery.utils import (
+    JPEG_APP0,
+    JPEG_APP1,
     is_image,
+    iter_jpeg_segments,
+    jpeg_header_length,
     move_photo_image,
     photo_image_upload_full_path,
     photo_image_upload_path,
     read_exif,
+    read_image_header,
+    supported_save_formats,
     write_exif,
 )
 from personal_website.storages import FakerFileStorageAdapter, StorageType, select_storage
@@ -109,6 +119,15 @@ class TestIsImage(SimpleTestCase):
         self.assertFalse(result)
 
 
+class TestSupportedSaveFormats(SimpleTestCase):
+    """Тесты отбора форматов изображений, поддерживаемых Pillow."""
+
+    def test_supported_save_formats(self) -> None:
+        """Неизвестные форматы пропускаются, порядок остальных сохраняется."""
+        result = supported_save_formats(("WEBP", "UNKNOWN", "JPEG"))
+        self.assertEqual(result, ("WEBP", "JPEG"))
+
+
 class TestExifUtils(SimpleTestCase):
     """Тесты утилит для работы с EXIF."""
 
@@ -141,3 +160,53 @@ class TestExifUtils(SimpleTestCase):
         self.assertIsInstance(exif, ExifData)
         self.assertIsNotNone(exif.model)
         self.assertEqual(exif.model, exif_data.model)
+
+    def test_write_exif_lossless(self) -> None:
+        """EXIF записывается в JPEG без повторного сжатия: сжатые данные изображения не изменяются."""
+        with BytesIO() as output:
+            Image.effect_noise((128, 128), 64).convert("RGB").save(output, format="JPEG", quality=80)
+            name = storage.save(f"gallery/photos/{FAKER.file_name(extension='jpg')}", output.getvalue())
+        content = storage.read_bytes(name)
+        _, length = jpeg_header_length(content)
+
+        exif_data = ExifDataFactory()
+        with patch.object(Image.Image, "save") as save:
+            write_exif(name, exif_data)
+        save.assert_not_called()
+
+        new_content = storage.read_bytes(name)
+        _, new_length = jpeg_header_length(new_content)
+        self.assertEqual(new_content[new_length:], content[length:])
+        self.assertEqual(read_exif(name).model, exif_data.model)
+        with Image.open(BytesIO(new_content)) as img:
+            self.assertIn("jfif", img.info)
+            markers = [marker for marker, *_ in iter_jpeg_segments(new_content)]
+            self.assertEqual(markers[:2], [JPEG_APP0, JPEG_APP1])
+        storage.delete(name)
+
+    def test_read_image_header(self) -> None:
+        """Из хранилища читаются только заголовки JPEG, начальный фрагмент дочитывается до начала сжатых данных."""
+        exif = Image.Exif()
+        exif[Base.Model] = "Test camera"
+        exif[Base.ImageDescription] = "x" * 1024
+        with BytesIO() as output:
+            Image.effect_noise((256, 256), 64).convert("RGB").save(output, format="JPEG", exif=exif.tobytes())
+            name = storage.save(f"gallery/photos/{FAKER.file_name(extension='jpg')}", output.getvalue())
+        content = storage.read_bytes(name)
+
+        with patch.object(storage, "read_range", wraps=storage.read_range) as read_range:
+            header = read_image_header(name, size=16)
+        self.assertGreater(read_range.call_count, 1)
+        self.assertLess(len(header), len(content))
+        self.assertEqual(header, content[: len(header)])
+        with Image.open(BytesIO(header)) as img:
+            self.assertEqual(img.size, (256, 256))
+        self.assertEqual(read_exif(name).model, "Test camera")
+
+        with self.subTest("Файлы других форматов читаются целиком"):
+            with BytesIO() as output:
+                Image.new("RGB", (64, 64)).save(output, format="PNG")
+                png_name = storage.save(f"gallery/photos/{FAKER.file_name(extension='png')}", output.getvalue())
+            self.assertEqual(read_image_header(png_name, size=16), storage.read_bytes(png_name))
+
+        storage.delete_many([name, png_name])
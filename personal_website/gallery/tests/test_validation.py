@@ -0,0 +1,91 @@
+"""Тесты проверки изображений по заголовкам файла."""
+
+from io import BytesIO
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from PIL import Image
+
+from gallery.schemas import ImageInfo
+from gallery.validation import BoundedReader, ImageValidationError, detect_format, open_stored_image, validate_image
+from personal_website.storages import StorageType, select_storage
+
+storage: StorageType = select_storage()
+
+
+def make_image(image_format: str, size: tuple[int, int] = (40, 30)) -> BytesIO:
+    """Создать изображение в памяти."""
+    file = BytesIO()
+    Image.new("RGB", size, color="red").save(file, format=image_format)
+    file.seek(0)
+    return file
+
+
+class TestValidateImage(SimpleTestCase):
+    """Тесты проверки изображений."""
+
+    def test_detect_format(self) -> None:
+        """Формат изображения определяется по сигнатуре в начале файла."""
+        for image_format in ("JPEG", "PNG", "GIF", "TIFF", "BMP", "WEBP"):
+            with self.subTest(image_format=image_format):
+                self.assertEqual(detect_format(make_image(image_format).read(12)), image_format)
+        self.assertIsNone(detect_format(b"%PDF-1.7\n"))
+        self.assertIsNone(detect_format(b"RIFF\x00\x00\x00\x00WAVE"))
+
+    def test_validate_image(self) -> None:
+        """Проверка возвращает формат и размеры изображения и возвращает указатель файла в исходную позицию."""
+        for image_format in ("JPEG", "PNG", "WEBP"):
+            with self.subTest(image_format=image_format):
+                file = make_image(image_format)
+                info = validate_image(file)
+                self.assertEqual(info, ImageInfo(format=image_format, width=40, height=30))
+                self.assertEqual(file.tell(), 0)
+
+    def test_not_image_rejected(self) -> None:
+        """Файл без сигнатуры изображения отклоняется без разбора заголовков."""
+        file = BytesIO(b"%PDF-1.7\n" + bytes(1024))
+        with patch("gallery.validation.Image.open") as image_open, self.assertRaises(ImageValidationError):
+            validate_image(file)
+        image_open.assert_not_called()
+        self.assertEqual(file.tell(), 0)
+
+    def test_corrupted_header_rejected(self) -> None:
+        """Файл с сигнатурой изображения, но поврежденными заголовками отклоняется."""
+        file = BytesIO(b"\x89PNG\r\n\x1a\n" + bytes(64))
+        with self.assertRaises(ImageValidationError):
+            validate_image(file)
+
+    def test_max_pixels(self) -> None:
+        """Изображение, количество пикселов которого превышает ограничение, отклоняется."""
+        file = make_image("PNG", (200, 100))
+        with override_settings(GALLERY_MAX_IMAGE_PIXELS=200 * 100):
+            self.assertEqual(validate_image(file).pixels, 200 * 100)
+        with override_settings(GALLERY_MAX_IMAGE_PIXELS=200 * 100 - 1), self.assertRaises(ImageValidationError):
+            validate_image(file)
+        self.assertEqual(file.tell(), 0)
+
+    def test_read_budget(self) -> None:
+        """Файл, заголовки которого не умещаются в бюджет чтения, отклоняется, не будучи прочитанным целиком."""
+        file = make_image("JPEG")
+        with self.assertRaises(ImageValidationError):
+            validate_image(file, read_budget=64)
+
+        reader = BoundedReader(BytesIO(bytes(1000)), budget=100)
+        self.assertEqual(len(reader.read(100)), 100)
+        with self.assertRaises(ImageValidationError):
+            reader.read()
+        self.assertEqual(reader.consumed, 101)
+
+    def test_open_stored_image(self) -> None:
+        """Изображение из хранилища проверяется чтением фрагментов, а не всего файла."""
+        name = storage.save("gallery/tests/validation.png", make_image("PNG"))
+        self.addCleanup(storage.delete, name)
+        with (
+            patch.object(storage, "read_range", wraps=storage.read_range) as read_range,
+            patch.object(storage, "open") as storage_open,
+            open_stored_image(name) as file,
+        ):
+            info = validate_image(file)
+        self.assertEqual(info.format, "PNG")
+        read_range.assert_called()
+        storage_open.assert_not_called()
@@ -8,18 +8,21 @@ from typing import TYPE_CHECKING
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import resolve, reverse
 from django.utils.crypto import get_random_string
 
 from gallery.apps import GalleryConfig
 from gallery.factories import AlbumFactory, PhotoFactory, TagFactory
-from gallery.models import Album, Photo, Tag
+from gallery.models import Album, ChunkedUpload, Photo, Tag
+from gallery.schemas import UploadResult
+from gallery.search import search_albums, search_photos, search_tags
 from gallery.utils import is_image
 from gallery.views import (
     AlbumDetailView,
     AlbumListView,
     GalleryHomeView,
+    GallerySearchView,
     PhotoDetailView,
     PhotoListView,
     TagDetailView,
@@ -45,6 +48,8 @@ ALBUM_LIST_URL = f"/{APP_NAME}/albums/"
 ALBUM_LIST_URL_NAME = f"{APP_NAME}:album-list"
 TAG_DETAIL_URL = f"/{APP_NAME}/tags"
 TAG_DETAIL_URL_NAME = f"{APP_NAME}:tag-detail"
+SEARCH_URL = f"/{APP_NAME}/search/"
+SEARCH_URL_NAME = f"{APP_NAME}:search"
 UPLOAD_URL = f"/{APP_NAME}/upload/"
 UPLOAD_URL_NAME = f"{APP_NAME}:upload"
 
@@ -57,6 +62,8 @@ ALBUM_LIST_TEMPLATE_NAME = f"{APP_NAME}/album_list.html"
 TAG_DETAIL_TEMPLATE_NAME = f"{APP_NAME}/tag_detail.html"
 TAG_LIST_TEMPLATE_NAME = f"{APP_NAME}/tag_list.html"
 UPLOAD_TEMPLATE_NAME = f"{APP_NAME}/upload.html"
+SEARCH_TEMPLATE_NAME = f"{APP_NAME}/search.html"
+CHUNKED_UPLOAD_URL = f"/{APP_NAME}/upload/chunked/"
 
 storage: StorageType = select_storage()
 
@@ -154,6 +161,27 @@ class GalleryViewsTest(TestCase):
             self.assertContains(response, str(tag))
         self.assertEqual(tags.count(), len(context["tags"]))
 
+    def test_photo_list_cursor_pagination(self) -> None:
+        """Список фотографий разбивается на страницы по курсору от новых фотографий к старым."""
+        album = AlbumFactory()
+        for _ in range(PhotoListView.paginate_by + 1):
+            PhotoFactory(album=album)
+        photos = list(Photo.published.order_by("-taken_at", "-pk"))
+
+        response = self.client.get(PHOTO_LIST_URL)
+        page = response.context["page_obj"]
+        self.assertEqual(list(response.context["object_list"]), photos[: PhotoListView.paginate_by])
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+        self.assertContains(response, "?after=")
+
+        response = self.client.get(PHOTO_LIST_URL, {"after": page.next_cursor})
+        page = response.context["page_obj"]
+        self.assertEqual(list(response.context["object_list"]), photos[PhotoListView.paginate_by :])
+        self.assertFalse(page.has_next())
+        self.assertTrue(page.has_previous())
+        self.assertContains(response, "?before=")
+
     def test_photo_detail_url(self) -> None:
         """Проверить работоспособность ссылки на детальный просмотр фотографии."""
         first_photo = Photo.objects.first()
@@ -231,6 +259,14 @@ class GalleryViewsTest(TestCase):
         self.assertIsNotNone(context["previous_photo"])
         self.assertContains(response, previous_photo_link_id)
 
+        # Соседние фотографии определяются фиксированным числом запросов независимо от размера альбома.
+        url = f"{PHOTO_DETAIL_URL}/{middle_photo.slug}/"
+        with self.assertNumQueries(5):
+            self.client.get(url)
+        PhotoFactory.create_batch(10, album=self.album)
+        with self.assertNumQueries(5):
+            self.client.get(url)
+
         # Представление содержит список тэгов данной фотографии.
         url = f"{PHOTO_DETAIL_URL}/{first_photo.slug}/"
         response = self.client.get(url)
@@ -403,6 +439,75 @@ class GalleryViewsTest(TestCase):
             self.assertEqual(tags.count(), len(context["tags"]))
 
 
+class GallerySearchViewTests(TestCase):
+    """Тестирование поиска по галерее."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Создать альбом, тэг и фотографии, в названиях, описаниях и EXIF которых встречаются искомые слова."""
+        cls.album = AlbumFactory(name="Kyanjin Gompa", description="Langtang")
+        cls.tag = TagFactory(name="Kyanjin Ri")
+        cls.by_name = PhotoFactory(name="Sunrise over Kyanjin", description="Mountains", album=cls.album)
+        cls.by_description = PhotoFactory(name="Yak", description="Yak near Kyanjin", album=cls.album)
+        cls.by_camera = PhotoFactory(name="Prayer flags", description="Flags", album=cls.album)
+        Photo.objects.filter(pk=cls.by_camera.pk).update(camera="FUJIFILM X-T3", lens_model="XF16-55mmF2.8")
+        cls.private = PhotoFactory(name="Private Kyanjin", album=cls.album, public=False)
+        cls.other = PhotoFactory(name="Tuscany", description="Autumn", album=AlbumFactory(name="Italy"))
+        return super().setUpTestData()
+
+    def test_search_url(self) -> None:
+        """Проверить работоспособность ссылки на поиск по галерее."""
+        self.assertEqual(resolve(reverse(SEARCH_URL_NAME)).func.view_class, GallerySearchView)
+        response = self.client.get(SEARCH_URL, {"q": "Kyanjin"})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTemplateUsed(response, SEARCH_TEMPLATE_NAME)
+        self.assertTemplateUsed(response, BASE_TEMPLATE_NAME)
+
+    def test_search_results(self) -> None:
+        """Находятся публичные фотографии, альбомы и тэги, в полях которых встречаются слова запроса."""
+        with self.subTest("Поиск по названию и описанию фотографии, альбома и тэга"):
+            response = self.client.get(SEARCH_URL, {"q": "kyanjin"})
+            self.assertEqual(set(response.context["object_list"]), {self.by_name, self.by_description})
+            self.assertEqual(list(response.context["albums"]), [self.album])
+            self.assertEqual(list(response.context["found_tags"]), [self.tag])
+            self.assertNotContains(response, self.private.get_absolute_url())
+
+        with self.subTest("Поиск по камере и объективу"):
+            for query in ("x-t3", "XF16-55mm"):
+                response = self.client.get(SEARCH_URL, {"q": query})
+                self.assertEqual(list(response.context["object_list"]), [self.by_camera])
+
+        with self.subTest("Каждый тип результатов выбирается одним запросом"), self.assertNumQueries(3):
+            list(search_photos("kyanjin"))
+            list(search_albums("kyanjin"))
+            list(search_tags("kyanjin"))
+
+        with self.subTest("Поиск по описанию альбома"):
+            response = self.client.get(SEARCH_URL, {"q": "langtang"})
+            self.assertEqual(list(response.context["albums"]), [self.album])
+
+        with self.subTest("Пустой запрос"):
+            response = self.client.get(SEARCH_URL, {"q": " "})
+            self.assertEqual(len(response.context["object_list"]), 0)
+            self.assertEqual(len(response.context["albums"]), 0)
+            self.assertEqual(len(response.context["found_tags"]), 0)
+
+    def test_search_pagination(self) -> None:
+        """Найденные фотографии разбиваются на страницы по курсору, ссылки сохраняют поисковый запрос."""
+        for _ in range(GallerySearchView.paginate_by):
+            PhotoFactory(name=f"Kyanjin {get_random_string(8)}", album=self.album)
+
+        response = self.client.get(SEARCH_URL, {"q": "Kyanjin"})
+        page = response.context["page_obj"]
+        self.assertEqual(len(page), GallerySearchView.paginate_by)
+        self.assertTrue(page.has_next())
+        self.assertContains(response, "&q=Kyanjin")
+
+        response = self.client.get(SEARCH_URL, {"q": "Kyanjin", "after": page.next_cursor})
+        self.assertEqual(len(response.context["page_obj"]), 2)
+        self.assertContains(response, "?q=Kyanjin")
+
+
 class UploadFormViewTests(TestCase):
     """Тесты формы для пакетной загрузки фотографий в альбом."""
 
@@ -532,6 +637,59 @@ class UploadFormViewTests(TestCase):
         photos = Photo.objects.filter(album=self.album)
         self.assertFalse(photos.exists())
 
+    @override_settings(GALLERY_UPLOAD_BATCH_SIZE=2)
+    def test_upload_progress_stream(self) -> None:
+        """Если клиент принимает NDJSON, то результат загрузки каждого файла возвращается отдельной строкой."""
+        image_path = self.test_image_paths[0]
+        file_content = storage.read_bytes(image_path)
+        # Файлы с одинаковыми именами должны получить разные слаги в пределах одной пачки.
+        photos = [SimpleUploadedFile(name=Path(image_path).name, content=file_content) for _ in range(3)]
+        photos.append(SimpleUploadedFile(name="test.pdf", content=b"not an image"))
+
+        data = {"photos": photos, "album": self.album.pk}
+        response = self.client.post(UPLOAD_URL, data, headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        results = [UploadResult.model_validate_json(line) for line in lines]
+
+        with self.subTest("Результат возвращен для каждого файла"):
+            self.assertEqual(len(results), len(photos))
+            self.assertEqual(sum(result.uploaded for result in results), 3)
+
+        with self.subTest("Фотографии созданы со ссылками из результатов"):
+            created = Photo.objects.filter(album=self.album)
+            urls = {result.url for result in results if result.uploaded}
+            self.assertEqual(urls, {photo.get_absolute_url() for photo in created})
+            self.assertEqual(len(urls), 3)
+
+        with self.subTest("Файлы с одинаковыми именами сохранены под разными именами"):
+            names = {photo.image.name for photo in created}
+            self.assertEqual(len(names), 3)
+            for name in names:
+                self.assertEqual(storage.read_bytes(name), file_content)
+
+        with self.subTest("Для копий одного файла указаны похожие фотографии"):
+            for result in results:
+                if result.uploaded:
+                    self.assertTrue(result.duplicates)
+                    self.assertTrue(set(result.duplicates) <= urls - {result.url})
+
+    def test_upload_keeps_existing_files(self) -> None:
+        """Загрузка файла с именем, занятым в альбоме, не перезаписывает файл существующей фотографии."""
+        image_path = self.test_image_paths[0]
+        file_name = Path(image_path).name
+        file_content = storage.read_bytes(image_path)
+        existing_content = file_content + b"\x00"
+        existing = PhotoFactory(album=self.album, image=SimpleUploadedFile(file_name, existing_content))
+
+        data = {"photos": [SimpleUploadedFile(name=file_name, content=file_content)], "album": self.album.pk}
+        self.client.post(UPLOAD_URL, data)
+
+        photo = Photo.objects.filter(album=self.album).exclude(pk=existing.pk).get()
+        self.assertNotEqual(photo.image.name, existing.image.name)
+        self.assertEqual(storage.read_bytes(photo.image.name), file_content)
+        self.assertEqual(storage.read_bytes(existing.image.name), existing_content)
+
     def test_upload_view_context(self) -> None:
         """Представление содержит полный набор тэгов галереи."""
         response = self.client.get(UPLOAD_URL)
@@ -540,3 +698,99 @@ class UploadFormViewTests(TestCase):
         for tag in tags:
             self.assertContains(response, str(tag))
         self.assertEqual(tags.count(), len(context["tags"]))
+
+
+class ChunkedUploadViewTests(TestCase):
+    """Тесты загрузки фотографии по частям."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Создать пользователя с правами персонала, альбом и прочитать тестовое изображение."""
+        super().setUpTestData()
+        cls.staff_user = User.objects.create_superuser(username="staff_username", password="staff_password")
+        cls.album = AlbumFactory()
+        image_path = list_file_paths("gallery/photos")[0]
+        cls.file_name = Path(image_path).name
+        cls.content = storage.read_bytes(image_path)
+
+    def setUp(self) -> None:
+        """Авторизоваться под пользователем с правами персонала."""
+        self.client.force_login(self.staff_user)
+        return super().setUp()
+
+    def start_upload(self) -> dict:
+        """Начать загрузку тестового изображения."""
+        data = {"album": self.album.pk, "file_name": self.file_name, "size": len(self.content)}
+        response = self.client.post(CHUNKED_UPLOAD_URL, data, content_type="application/json")
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        return response.json()
+
+    def put_part(self, upload_id: str, part_number: int, content: bytes) -> dict:
+        """Загрузить часть файла."""
+        url = f"{CHUNKED_UPLOAD_URL}{upload_id}/parts/{part_number}/"
+        response = self.client.put(url, content, content_type="application/octet-stream")
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return response.json()
+
+    def test_resumable_upload(self) -> None:
+        """Файл загружается частями в произвольном порядке, после чего создается фотография."""
+        chunk_size = len(self.content) // 3 + 1
+        chunks = [self.content[i : i + chunk_size] for i in range(0, len(self.content), chunk_size)]
+
+        with self.settings(GALLERY_UPLOAD_CHUNK_SIZE=chunk_size):
+            upload = self.start_upload()
+            self.put_part(upload["id"], 3, chunks[2])
+            self.put_part(upload["id"], 1, chunks[0])
+
+            with self.subTest("Незавершенную загрузку нельзя завершить"):
+                response = self.client.post(f"{CHUNKED_UPLOAD_URL}{upload['id']}/complete/")
+                self.assertEqual(response.status_code, HTTPStatus.CONFLICT)
+
+            with self.subTest("Состояние загрузки содержит номера загруженных частей"):
+                state = self.client.get(f"{CHUNKED_UPLOAD_URL}{upload['id']}/").json()
+                self.assertEqual(state["parts"], [1, 3])
+                self.assertEqual(state["received"], len(chunks[0]) + len(chunks[2]))
+
+            self.put_part(upload["id"], 2, chunks[1])
+            response = self.client.post(f"{CHUNKED_UPLOAD_URL}{upload['id']}/complete/")
+
+        with self.subTest("Фотография создана из собранного файла"):
+            self.assertEqual(response.status_code, HTTPStatus.CREATED)
+            photo = ChunkedUpload.objects.get(pk=upload["id"]).photo
+            self.assertIsNotNone(photo)
+            self.assertEqual(response.json()["url"], photo.get_absolute_url())
+            self.assertEqual(storage.read_bytes(photo.image.name), self.content)
+
+    def test_upload_keeps_existing_files(self) -> None:
+        """Загрузка файла с именем, занятым в альбоме, не перезаписывает файл существующей фотографии."""
+        existing_content = self.content + b"\x00"
+        existing = PhotoFactory(album=self.album, image=SimpleUploadedFile(self.file_name, existing_content))
+        upload = self.start_upload()
+        pending = self.start_upload()
+
+        with self.subTest("Загрузки получают свободные имена"):
+            names = {existing.image.name, *ChunkedUpload.objects.values_list("name", flat=True)}
+            self.assertEqual(len(names), 3)
+
+        self.put_part(upload["id"], 1, self.content)
+        response = self.client.post(f"{CHUNKED_UPLOAD_URL}{upload['id']}/complete/")
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        photo = ChunkedUpload.objects.get(pk=upload["id"]).photo
+        self.assertEqual(storage.read_bytes(photo.image.name), self.content)
+        self.assertEqual(storage.read_bytes(existing.image.name), existing_content)
+        self.client.delete(f"{CHUNKED_UPLOAD_URL}{pending['id']}/")
+
+    def test_part_size_limit(self) -> None:
+        """Часть больше допустимого размера отклоняется."""
+        upload = self.start_upload()
+        with self.settings(GALLERY_UPLOAD_CHUNK_SIZE=1):
+            url = f"{CHUNKED_UPLOAD_URL}{upload['id']}/parts/1/"
+            response = self.client.put(url, b"too large", content_type="application/octet-stream")
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_abort_upload(self) -> None:
+        """Отмененная загрузка удаляется."""
+        upload = self.start_upload()
+        response = self.client.delete(f"{CHUNKED_UPLOAD_URL}{upload['id']}/")
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+        self.assertFalse(ChunkedUpload.objects.filter(pk=upload["id"]).exists())
@@ -0,0 +1,278 @@
+"""
+Пакетная загрузка фотографий в альбом.
+
+Проверка изображения, чтение EXIF и запись файла в хранилище выполняются для нескольких файлов
+одновременно в пуле потоков: эти операции ограничены вводом-выводом или выполняются Pillow без GIL.
+Готовые фотографии сохраняются в базу данных пачками через `bulk_create`, а результат загрузки
+каждого файла возвращается вызывающему коду по мере готовности, что позволяет показывать прогресс загрузки.
+
+Большие файлы можно загружать по частям (`ChunkedUpload`): части передаются потоком во временную
+директорию или в S3 multipart upload, поэтому расход памяти не зависит от размера файла,
+а после обрыва соединения загрузка продолжается с недостающих частей.
+"""
+
+import logging
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import IO
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from PIL import UnidentifiedImageError
+
+from gallery.duplicates import find_duplicates
+from gallery.models import Album, ChunkedUpload, Photo
+from gallery.renditions import schedule_renditions
+from gallery.schemas import UploadResult
+from gallery.search import update_photo_search_vectors
+from gallery.utils import free_file_names
+from gallery.validation import open_stored_image, validate_image
+from personal_website.storages import StorageType, select_storage
+from personal_website.utils import assign_unique_slugs
+
+logger = logging.getLogger(settings.PROJECT_NAME)
+storage: StorageType = select_storage()
+
+# Наибольшее количество частей одного файла, как в S3 multipart upload.
+MAX_UPLOAD_PARTS = 10000
+
+
+def prepare_photo(file: UploadedFile, album: Album) -> Photo:
+    """Проверить изображение, заполнить метаданные из EXIF и записать файл в хранилище.
+
+    Функция не обращается к базе данных, поэтому может выполняться в потоке пула. Изображение проверяется
+    по заголовкам того же загруженного файла, который затем записывается в хранилище.
+
+    Raises:
+        UnidentifiedImageError: Загруженный файл не является изображением.
+    """
+    validate_image(file)
+
+    photo = Photo(album=album, image=file)
+    photo.update_metadata()
+    photo.update_fingerprint()
+    photo.image.save(file.name, file, save=False)
+    photo.name = storage.stem(photo.image.name)
+    return photo
+
+
+def save_photos(photos: list[Photo]) -> list[Photo]:
+    """Сохранить подготовленные фотографии в базу данных одним запросом.
+
+    Поскольку `bulk_create` не вызывает `Photo.save`, слаги всех фотографий определяются здесь же одним запросом,
+    поисковые векторы пересчитываются одним запросом после вставки, а построение уменьшенных копий
+    ставится в очередь после фиксации транзакции.
+    """
+    assign_unique_slugs(photos, "name")
+
+    with transaction.atomic():
+        created = Photo.objects.bulk_create(photos)
+        update_photo_search_vectors(photo.pk for photo in created)
+        transaction.on_commit(partial(schedule_renditions, [photo.pk for photo in created]))
+    return created
+
+
+def flush_photos(photos: list[Photo], album: Album) -> Iterator[UploadResult]:
+    """Сохранить накопленные фотографии и вернуть результаты их загрузки.
+
+    Если сохранить фотографии в базу данных не удалось, то их файлы удаляются из хранилища.
+    """
+    try:
+        created = save_photos(photos)
+    except Exception as error:
+        message = f'Ошибка загрузки фотографий в альбом "{album}": "{error}"'
+        logger.exception(message)
+        for photo in photos:
+            storage.delete(photo.image.name)
+            yield UploadResult(file_name=storage.name(photo.image.name), uploaded=False, message=message)
+        return
+    duplicates = find_duplicates(created)
+    for photo in created:
+        message = f"Загружена фотография {photo.image.name} в альбом {album}"
+        logger.debug(message)
+        yield uploaded_result(photo, storage.name(photo.image.name), message, duplicates[photo.pk])
+
+
+def uploaded_result(photo: Photo, file_name: str, message: str, duplicates: list[tuple[Photo, int]]) -> UploadResult:
+    """Результат успешной загрузки фотографии с предупреждением о похожих фотографиях в галерее."""
+    if duplicates:
+        message = f"{message}. Похожих фотографий в галерее: {len(duplicates)}"
+        logger.warning(message)
+    return UploadResult(
+        file_name=file_name,
+        uploaded=True,
+        message=message,
+        url=photo.get_absolute_url(),
+        duplicates=[duplicate.get_absolute_url() for duplicate, _ in duplicates],
+    )
+
+
+def rename_uploaded_files(files: Iterable[UploadedFile], album: Album) -> list[UploadedFile]:
+    """Дать загруженным файлам свободные в каталоге альбома имена.
+
+    Хранилища проекта перезаписывают файл с тем же именем. Без переименования новая фотография заменила бы файл
+    фотографии альбома с тем же именем, а фотографии с одинаковыми именами файлов в одной загрузке ссылались бы
+    на один файл, и одновременная запись этих файлов в пуле потоков мешала бы друг другу.
+    """
+    files = list(files)
+    names = free_photo_names(album, [str(file.name) for file in files])
+    for file, name in zip(files, names, strict=True):
+        file.name = storage.name(name)
+    return files
+
+
+def upload_photos(files: Iterable[UploadedFile], album: Album) -> Iterator[UploadResult]:
+    """Загрузить фотографии в альбом, возвращая результат загрузки каждого файла по мере готовности.
+
+    Args:
+        files (Iterable[UploadedFile]): Загруженные файлы.
+        album (Album): Альбом, в который загружаются фотографии.
+
+    Yields:
+        UploadResult: Результат загрузки файла.
+    """
+    batch_size: int = settings.GALLERY_UPLOAD_BATCH_SIZE
+    batch: list[Photo] = []
+
+    with ThreadPoolExecutor(max_workers=settings.GALLERY_UPLOAD_WORKERS) as executor:
+        futures = {executor.submit(prepare_photo, file, album): file for file in rename_uploaded_files(files, album)}
+        for future in as_completed(futures):
+            file = futures[future]
+            try:
+                batch.append(future.result())
+            except UnidentifiedImageError as error:
+                message = f'Загруженный файл "{file}" не является изображением: {error}'
+                logger.exception(message)
+                yield UploadResult(file_name=str(file), uploaded=False, message=message)
+            except Exception as error:
+                message = f'Ошибка загрузки фотографии в альбом "{album}": "{error}"'
+                logger.exception(message)
+                yield UploadResult(file_name=str(file), uploaded=False, message=message)
+            if len(batch) >= batch_size:
+                yield from flush_photos(batch, album)
+                batch.clear()
+    if batch:
+        yield from flush_photos(batch, album)
+
+
+def free_photo_names(album: Album, file_names: list[str]) -> list[str]:
+    """Свободные пути файлов фотографий в каталоге альбома.
+
+    Хранилища проекта перезаписывают файл с тем же именем, поэтому имена, занятые файлами в хранилище
+    или незавершенными загрузками по частям, а также повторяющиеся имена получают случайный суффикс.
+
+    Args:
+        album (Album): Альбом, в каталог которого сохраняются файлы.
+        file_names (list[str]): Имена файлов без каталога.
+
+    Returns:
+        list[str]: Пути файлов в хранилище в порядке `file_names`.
+    """
+    photo = Photo(album=album)
+    names = [photo.image.field.generate_filename(photo, file_name) for file_name in file_names]
+    reserved = ChunkedUpload.objects.filter(album=album, photo__isnull=True).values_list("name", flat=True)
+    return free_file_names(names, reserved)
+
+
+def register_stored_photo(name: str, album: Album) -> Photo:
+    """Проверить изображение, уже сохраненное в хранилище, и создать для него фотографию.
+
+    Для проверки из хранилища читаются только заголовки изображения.
+
+    Raises:
+        UnidentifiedImageError: Файл не является изображением.
+    """
+    with open_stored_image(name) as file:
+        validate_image(file)
+    photo = Photo(album=album, image=name)
+    photo.update_metadata()
+    photo.update_fingerprint()
+    photo.name = storage.stem(name)
+    return save_photos([photo])[0]
+
+
+def start_chunked_upload(album: Album, file_name: str, size: int) -> ChunkedUpload:
+    """Начать загрузку файла фотографии по частям.
+
+    Свободное имя файла выбирается один раз при начале загрузки и хранится в загрузке: S3 заменяет объект
+    с тем же ключом при завершении загрузки, поэтому занятое имя перезаписало бы файл другой фотографии.
+    """
+    [name] = free_photo_names(album, [file_name])
+    upload_id = storage.create_multipart_upload(name)
+    return ChunkedUpload.objects.create(
+        album=album,
+        file_name=file_name,
+        name=name,
+        size=size,
+        upload_id=upload_id,
+    )
+
+
+def upload_chunk(upload: ChunkedUpload, part_number: int, content: IO[bytes], size: int) -> ChunkedUpload:
+    """Сохранить часть файла и отметить ее в загрузке.
+
+    Повторная передача части с тем же номером заменяет ранее загруженную часть.
+
+    Raises:
+        ValidationError: Загрузка уже завершена, номер или размер части недопустимы.
+    """
+    if upload.completed:
+        message = "Загрузка уже завершена"
+        raise ValidationError(message)
+    if not 1 <= part_number <= MAX_UPLOAD_PARTS:
+        message = f"Номер части должен быть от 1 до {MAX_UPLOAD_PARTS}"
+        raise ValidationError(message)
+    if not 0 < size <= settings.GALLERY_UPLOAD_CHUNK_SIZE:
+        message = f"Размер части должен быть от 1 до {settings.GALLERY_UPLOAD_CHUNK_SIZE} байт"
+        raise ValidationError(message)
+
+    etag = storage.upload_part(upload.name, upload.upload_id, part_number, content)
+    # Части одного файла могут загружаться параллельно, поэтому список частей обновляется под блокировкой.
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+        parts = {part["PartNumber"]: part for part in upload.parts}
+        parts[part_number] = {"PartNumber": part_number, "ETag": etag, "Size": size}
+        upload.parts = [parts[number] for number in sorted(parts)]
+        upload.save(update_fields=["parts"])
+    return upload
+
+
+def complete_chunked_upload(upload: ChunkedUpload) -> UploadResult:
+    """Завершить загрузку по частям: собрать файл в хранилище и создать фотографию.
+
+    Raises:
+        ValidationError: Загружены не все части файла.
+    """
+    if upload.completed:
+        photo = upload.photo
+    else:
+        numbers = [part["PartNumber"] for part in upload.parts]
+        if upload.received != upload.size or numbers != list(range(1, len(numbers) + 1)):
+            message = f"Загружено {upload.received} из {upload.size} байт файла {upload.file_name}"
+            raise ValidationError(message)
+
+        name = storage.complete_multipart_upload(upload.name, upload.upload_id, upload.parts)
+        try:
+            photo = register_stored_photo(name, upload.album)
+        except UnidentifiedImageError as error:
+            storage.delete(name)
+            upload.delete()
+            message = f'Загруженный файл "{upload.file_name}" не является изображением: {error}'
+            logger.exception(message)
+            return UploadResult(file_name=upload.file_name, uploaded=False, message=message)
+        upload.photo = photo
+        upload.save(update_fields=["photo"])
+
+    message = f"Загружена фотография {upload.file_name} в альбом {upload.album}"
+    logger.debug(message)
+    return uploaded_result(photo, upload.file_name, message, find_duplicates([photo])[photo.pk])
+
+
+def abort_chunked_upload(upload: ChunkedUpload) -> None:
+    """Отменить незавершенную загрузку по частям и удалить загруженные части."""
+    if not upload.completed:
+        storage.abort_multipart_upload(upload.name, upload.upload_id)
+    upload.delete()
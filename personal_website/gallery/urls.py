@@ -5,7 +5,12 @@ from django.urls import path
 from gallery.views import (
     AlbumDetailView,
     AlbumListView,
+    ChunkedUploadCompleteView,
+    ChunkedUploadDetailView,
+    ChunkedUploadPartView,
+    ChunkedUploadView,
     GalleryHomeView,
+    GallerySearchView,
     PhotoDetailView,
     PhotoListView,
     TagDetailView,
@@ -16,10 +21,23 @@ app_name = "gallery"
 
 urlpatterns = [
     path("", GalleryHomeView.as_view(), name="gallery"),
+    path("search/", GallerySearchView.as_view(), name="search"),
     path("albums/", AlbumListView.as_view(), name="album-list"),
     path("photos/", PhotoListView.as_view(), name="photo-list"),
     path("photos/<slug:slug>/", PhotoDetailView.as_view(), name="photo-detail"),
     path("albums/<slug:slug>/", AlbumDetailView.as_view(), name="album-detail"),
     path("tags/<slug:slug>/", TagDetailView.as_view(), name="tag-detail"),
     path("upload/", UploadFormView.as_view(), name="upload"),
+    path("upload/chunked/", ChunkedUploadView.as_view(), name="chunked-upload"),
+    path("upload/chunked/<uuid:pk>/", ChunkedUploadDetailView.as_view(), name="chunked-upload-detail"),
+    path(
+        "upload/chunked/<uuid:pk>/parts/<int:part_number>/",
+        ChunkedUploadPartView.as_view(),
+        name="chunked-upload-part",
+    ),
+    path(
+        "upload/chunked/<uuid:pk>/complete/",
+        ChunkedUploadCompleteView.as_view(),
+        name="chunked-upload-complete",
+    ),
 ]
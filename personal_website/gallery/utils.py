@@ -1,19 +1,57 @@
 """Вспомогательные функции галереи."""
 
-from io import BytesIO
+import hashlib
+from collections.abc import Iterable, Iterator
+from io import BufferedReader, BytesIO, RawIOBase
+from itertools import chain
+from typing import IO, Any
+from uuid import uuid4
 
+from django.core.files import File
 from django.db.models import Model
 from faker import Faker
-from PIL import Image, UnidentifiedImageError
+from PIL import Image, ImageOps, UnidentifiedImageError
 from PIL.ExifTags import TAGS, Base
 
 from gallery.apps import GalleryConfig
 from gallery.schemas import ExifData
+from gallery.validation import open_stored_image, validate_image
 from personal_website.storages import StorageType, select_storage
 
 fake = Faker(locale="ru_RU")
 storage: StorageType = select_storage()
 
+# Размер начального фрагмента файла, в котором ищутся заголовки изображения с EXIF.
+IMAGE_HEADER_SIZE = 64 * 1024
+
+# Маркеры JPEG: префикс маркера, начало изображения, начало сжатых данных, конец изображения
+# и маркеры без длины сегмента (TEM и RST0-RST7).
+JPEG_MARKER_PREFIX = 0xFF
+JPEG_SOI = b"\xff\xd8"
+JPEG_SOS = 0xDA
+JPEG_EOI = 0xD9
+JPEG_STANDALONE_MARKERS = frozenset((0x01, *range(0xD0, 0xD8)))
+JPEG_APP0 = 0xE0
+JPEG_APP1 = 0xE1
+JPEG_MAX_SEGMENT_LENGTH = 0xFFFF
+
+# Идентификатор, с которого начинается сегмент APP1 с данными EXIF.
+EXIF_IDENTIFIER = b"Exif\x00\x00"
+
+# Размер фрагмента, которыми файл копируется из хранилища при записи EXIF.
+FILE_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Перцептивный хэш (dHash): изображение уменьшается до (PERCEPTUAL_HASH_SIZE + 1) x PERCEPTUAL_HASH_SIZE пикселов,
+# и каждый бит хэша - результат сравнения яркости соседних пикселов строки.
+PERCEPTUAL_HASH_SIZE = 8
+PERCEPTUAL_HASH_BITS = PERCEPTUAL_HASH_SIZE * PERCEPTUAL_HASH_SIZE
+PERCEPTUAL_HASH_MASK = (1 << PERCEPTUAL_HASH_BITS) - 1
+
+# Для поиска похожих изображений по индексу хэш делится на полосы (LSH): если хэши отличаются
+# меньше чем в PERCEPTUAL_HASH_BANDS битах, то хотя бы одна полоса у них совпадает.
+PERCEPTUAL_HASH_BANDS = 4
+PERCEPTUAL_HASH_BAND_BITS = PERCEPTUAL_HASH_BITS // PERCEPTUAL_HASH_BANDS
+
 
 def photo_image_upload_path(instance: Model, filename: str) -> str:
     """Определение пути загрузки фотографий. Фотографии загружаются в папку своего альбома."""
@@ -26,6 +64,35 @@ def photo_image_upload_full_path(photo: Model, filename: str) -> str:
     return storage.path(relative_path)
 
 
+def free_file_names(names: list[str], reserved: Iterable[str] = ()) -> list[str]:
+    """Подобрать свободные имена файлов в хранилище.
+
+    Занятые имена проверяются одним вызовом `existing_files`. Для занятого имени подбирается имя
+    со случайным суффиксом так же, как в `Storage.get_available_name`. Сам `get_available_name` хранилищ
+    проекта не подходит: он освобождает имя, удаляя существующий файл, чтобы перезаписать его.
+
+    Args:
+        names (list[str]): Желаемые имена файлов.
+        reserved (Iterable[str]): Имена, которые еще не заняты в хранилище, но уже зарезервированы,
+            например, незавершенными загрузками по частям.
+
+    Returns:
+        list[str]: Имена, которые не заняты в хранилище и не совпадают друг с другом, в порядке `names`.
+    """
+    taken = storage.existing_files(names) | set(reserved)
+    result = []
+    for name in names:
+        directory = name.removesuffix(storage.name(name))
+        candidate = name
+        while candidate in taken:
+            candidate = directory + storage.get_alternative_name(storage.stem(name), storage.suffix(name))
+            if storage.exists(candidate):
+                taken.add(candidate)
+        taken.add(candidate)
+        result.append(candidate)
+    return result
+
+
 def move_photo_image(photo: Model, source_path: str) -> str:
     """
     Переместить изображение фотографии с адреса источника по адресу,
@@ -43,7 +110,7 @@ def move_photo_image(photo: Model, source_path: str) -> str:
 
 
 def is_image(file: str) -> bool:
-    """Проверяет, является ли файл изображением.
+    """Проверяет, является ли файл изображением, читая из хранилища только заголовки изображения.
 
     Returns:
         bool:
@@ -51,21 +118,142 @@ def is_image(file: str) -> bool:
             - Если файл не является изображением, то False.
     """
     try:
-        file_content = storage.read_bytes(str(file))
-        file_bytes = BytesIO(file_content)
-        image = Image.open(file_bytes)
-        image.verify()
+        with open_stored_image(str(file)) as file_bytes:
+            validate_image(file_bytes)
     except UnidentifiedImageError:
         return False
     else:
         return True
 
 
+def supported_save_formats(formats: Iterable[str]) -> tuple[str, ...]:
+    """Отобрать форматы изображений, в которых установленная версия Pillow умеет сохранять файлы.
+
+    Args:
+        formats (Iterable[str]): Наименования форматов в терминах Pillow, например, "WEBP".
+
+    Returns:
+        tuple[str, ...]: Поддерживаемые форматы в исходном порядке.
+    """
+    Image.init()
+    return tuple(image_format for image_format in formats if image_format.upper() in Image.SAVE)
+
+
+def iter_jpeg_segments(data: bytes) -> Iterator[tuple[int, int, int]]:
+    """Перебрать сегменты заголовков JPEG: маркер, смещения начала и конца сегмента.
+
+    Перебор заканчивается на сегменте начала сжатых данных (SOS) или конца изображения (EOI), а также
+    на сегменте, который не помещается во фрагмент `data`, и на поврежденном сегменте. Байты заполнения
+    между сегментами возвращаются как сегменты длиной в один байт с маркером 0xFF.
+
+    Args:
+        data (bytes): Начальный фрагмент файла JPEG.
+    """
+    position = len(JPEG_SOI)
+    while position + 4 <= len(data) and data[position] == JPEG_MARKER_PREFIX:
+        marker = data[position + 1]
+        if marker == JPEG_MARKER_PREFIX:
+            end = position + 1
+        elif marker in JPEG_STANDALONE_MARKERS or marker == JPEG_EOI:
+            end = position + 2
+        else:
+            end = position + 2 + int.from_bytes(data[position + 2 : position + 4], "big")
+        yield marker, position, end
+        if marker in (JPEG_SOS, JPEG_EOI):
+            return
+        position = end
+
+
+def jpeg_header_length(data: bytes) -> tuple[bool, int]:
+    """Определить длину заголовков JPEG: сегментов от начала файла до начала сжатых данных включительно.
+
+    В заголовках находятся размеры изображения и сегмент APP1 с EXIF, поэтому для чтения метаданных
+    сжатые данные изображения не нужны.
+
+    Args:
+        data (bytes): Начальный фрагмент файла JPEG.
+
+    Returns:
+        tuple[bool, int]: Признак того, что заголовки целиком помещаются во фрагмент, и длина заголовков.
+            Если заголовки не помещаются во фрагмент, то вместо длины возвращается наименьшая длина фрагмента,
+            необходимая для продолжения разбора.
+    """
+    end = len(JPEG_SOI)
+    for marker, _, end in iter_jpeg_segments(data):
+        if marker in (JPEG_SOS, JPEG_EOI):
+            return end <= len(data), end
+    if end + 4 <= len(data):
+        # Поврежденный файл: дальнейший разбор выполнит Pillow.
+        return True, end
+    return False, end + 4
+
+
+def replace_jpeg_exif(header: bytes, exif: bytes) -> bytes:
+    """Заменить сегмент APP1 с EXIF в заголовках JPEG без декодирования изображения.
+
+    Прежние сегменты EXIF удаляются, новый сегмент размещается сразу после сегмента APP0 (JFIF),
+    если он есть, иначе после маркера начала изображения. Остальные сегменты не изменяются.
+
+    Args:
+        header (bytes): Заголовки JPEG, например, полученные функцией `read_image_header`.
+        exif (bytes): Данные EXIF с идентификатором `EXIF_IDENTIFIER`, например, результат `Image.Exif.tobytes()`.
+
+    Returns:
+        bytes: Заголовки JPEG с новым сегментом EXIF.
+
+    Raises:
+        ValueError: Данные EXIF не помещаются в один сегмент.
+    """
+    length = len(exif) + 2
+    if length > JPEG_MAX_SEGMENT_LENGTH:
+        error_message = f"Размер данных EXIF ({len(exif)} байт) превышает размер сегмента JPEG"
+        raise ValueError(error_message)
+    exif_segment = bytes((JPEG_MARKER_PREFIX, JPEG_APP1)) + length.to_bytes(2, "big") + exif
+
+    parts, inserted, end = [JPEG_SOI], False, len(JPEG_SOI)
+    for marker, start, end in iter_jpeg_segments(header):
+        if not inserted and marker != JPEG_APP0:
+            parts.append(exif_segment)
+            inserted = True
+        if not (marker == JPEG_APP1 and header[start + 4 : start + 4 + len(EXIF_IDENTIFIER)] == EXIF_IDENTIFIER):
+            parts.append(header[start:end])
+    if not inserted:
+        parts.append(exif_segment)
+    parts.append(header[end:])
+    return b"".join(parts)
+
+
+def read_image_header(name: str, size: int = IMAGE_HEADER_SIZE) -> bytes:
+    """Прочитать начало файла изображения, достаточное для определения формата, размеров и EXIF.
+
+    Для JPEG читается начальный фрагмент файла размером `size`, который дочитывается, только если
+    заголовки (например, сегмент APP1 с EXIF) продолжаются за его пределами. В S3 фрагменты читаются
+    запросами GET с заголовком Range. Файлы других форматов читаются целиком, так как EXIF в них
+    может находиться в любом месте файла.
+
+    Args:
+        name (str): Имя файла в хранилище.
+        size (int): Размер начального фрагмента в байтах.
+
+    Returns:
+        bytes: Начало файла с заголовками изображения или весь файл.
+    """
+    data = storage.read_range(name, 0, size)
+    if not data.startswith(JPEG_SOI):
+        return data if len(data) < size else storage.read_bytes(name)
+    while True:
+        complete, length = jpeg_header_length(data)
+        if complete:
+            return data
+        chunk = storage.read_range(name, len(data), max(size, length - len(data)))
+        if not chunk:
+            return data
+        data += chunk
+
+
 def _open_image_for_exif(image: str) -> Image.Image:
-    """Открывает изображение для работы с EXIF данными, используя storage при необходимости."""
-    file_content = storage.read_bytes(image)
-    image_bytes = BytesIO(file_content)
-    return Image.open(image_bytes)
+    """Открывает изображение для работы с EXIF данными, читая из хранилища только заголовки изображения."""
+    return Image.open(BytesIO(read_image_header(image)))
 
 
 def read_exif(image: str) -> ExifData:
@@ -86,16 +274,53 @@ def read_exif(image: str) -> ExifData:
     return ExifData.model_validate(exif_data)
 
 
+def iter_file_chunks(name: str, start: int = 0, chunk_size: int = FILE_CHUNK_SIZE) -> Iterator[bytes]:
+    """Читать файл из хранилища фрагментами, начиная со смещения `start`."""
+    while chunk := storage.read_range(name, start, chunk_size):
+        yield chunk
+        start += len(chunk)
+
+
+class ChunksReader(RawIOBase):
+    """Файловый объект только для чтения, содержимое которого составляется из фрагментов итератора."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        """Запомнить итератор фрагментов содержимого."""
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        """Объект доступен для чтения."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:  # noqa: ANN401
+        """Заполнить буфер очередными байтами содержимого. Возвращает количество записанных байт."""
+        while not self._buffer:
+            self._buffer = next(self._chunks, b"")
+            if not self._buffer:
+                return 0
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
 def write_exif(image: str, exif_data: ExifData) -> None:
     """Записать данные EXIF в изображение.
 
+    Для JPEG изображение не декодируется и не сжимается повторно: из хранилища читаются только заголовки,
+    в которых заменяется сегмент APP1 с EXIF, а сжатые данные копируются в новый файл потоком.
+    Новый файл записывается рядом с исходным и затем заменяет его. Изображения других форматов
+    пересохраняются при помощи Pillow.
+
     Args:
         image (str): Путь к изображению, EXIF данные которого необходимо записать.
         exif_data (ExifData): объект модели Pydantic, содержащий все данные EXIF.
     """
-    file_content = storage.read_bytes(image)
-    image_bytes = BytesIO(file_content)
-    with Image.open(image_bytes) as img:
+    header = read_image_header(image)
+    complete, length = jpeg_header_length(header) if header.startswith(JPEG_SOI) else (False, 0)
+    with Image.open(BytesIO(header)) as img:
         exif = img.getexif()
 
         # Обновляем EXIF данные
@@ -103,7 +328,68 @@ def write_exif(image: str, exif_data: ExifData) -> None:
             exif_tag = Base[key]
             exif.__setitem__(exif_tag, value)
 
-        # Сохраняем изображение обратно в байты с новыми EXIF данными
-        with BytesIO() as output:
-            img.save(output, format=img.format, exif=exif.tobytes())
-            storage.save(image, output.getvalue())
+        if not complete:
+            # Сохраняем изображение обратно в байты с новыми EXIF данными
+            with BytesIO() as output:
+                img.save(output, format=img.format, exif=exif.tobytes())
+                storage.save(image, output.getvalue())
+            return
+
+    new_header = replace_jpeg_exif(header[:length], exif.tobytes())
+    content = BufferedReader(ChunksReader(chain((new_header,), iter_file_chunks(image, length))))
+    temporary_name = storage.joinpath(storage.parent(image), f"exif-{uuid4().hex}{storage.suffix(image)}")
+    saved_name = storage.save(temporary_name, File(content, name=storage.name(image)))
+    storage.replace(saved_name, image)
+
+
+def content_hash(file: IO[bytes]) -> str:
+    """Хэш SHA-256 содержимого файла.
+
+    Файл читается фрагментами, после чего указатель файла возвращается в исходную позицию.
+    """
+    start = file.tell()
+    digest = hashlib.sha256()
+    while chunk := file.read(FILE_CHUNK_SIZE):
+        digest.update(chunk)
+    file.seek(start)
+    return digest.hexdigest()
+
+
+def difference_hash(file: IO[bytes]) -> int:
+    """Перцептивный хэш изображения (dHash).
+
+    Хэш устойчив к изменению размера, сжатия и формата файла, поэтому у копий одного кадра хэши
+    совпадают или отличаются в нескольких битах. Для JPEG изображение декодируется сразу с уменьшением.
+    После чтения указатель файла возвращается в исходную позицию.
+
+    Returns:
+        int: Хэш как целое число без знака из `PERCEPTUAL_HASH_BITS` бит.
+    """
+    width, height = PERCEPTUAL_HASH_SIZE + 1, PERCEPTUAL_HASH_SIZE
+    start = file.tell()
+    try:
+        with Image.open(file) as img:
+            img.draft("L", (width, height))
+            ImageOps.exif_transpose(img, in_place=True)
+            image = img.convert("L")
+    finally:
+        file.seek(start)
+    pixels = image.resize((width, height), Image.Resampling.LANCZOS).tobytes()
+    value = 0
+    for row in range(height):
+        for column in range(PERCEPTUAL_HASH_SIZE):
+            offset = row * width + column
+            value = value << 1 | (pixels[offset] > pixels[offset + 1])
+    return value
+
+
+def hash_bands(value: int) -> tuple[int, ...]:
+    """Разделить перцептивный хэш на полосы по `PERCEPTUAL_HASH_BAND_BITS` бит."""
+    value &= PERCEPTUAL_HASH_MASK
+    band_mask = (1 << PERCEPTUAL_HASH_BAND_BITS) - 1
+    return tuple(value >> (band * PERCEPTUAL_HASH_BAND_BITS) & band_mask for band in range(PERCEPTUAL_HASH_BANDS))
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Количество различающихся бит двух перцептивных хэшей."""
+    return ((first ^ second) & PERCEPTUAL_HASH_MASK).bit_count()
@@ -0,0 +1,210 @@
+"""
+Проверка изображений по заголовкам файла.
+
+Изображение проверяется без декодирования и без копирования файла в память: формат определяется
+по сигнатуре в начале файла, а размеры - по заголовкам, которые PIL читает из того же файлового объекта.
+Количество прочитанных при проверке байт ограничено, поэтому файл с поддельными или чрезмерно большими
+заголовками отклоняется, не будучи прочитанным целиком. Изображение, количество пикселов которого
+превышает `GALLERY_MAX_IMAGE_PIXELS`, отклоняется до распаковки, что защищает от "бомб декомпрессии".
+
+Файлы из хранилища читаются фрагментами (для S3 - запросами GET с заголовком Range), поэтому
+для проверки изображения, загруженного в S3, не нужно скачивать объект целиком.
+"""
+
+from io import SEEK_CUR, SEEK_END, SEEK_SET, BufferedReader, RawIOBase
+from typing import IO, Any, Optional
+
+from django.conf import settings
+from PIL import Image, UnidentifiedImageError
+
+from gallery.schemas import ImageInfo
+from personal_website.storages import StorageType, select_storage
+
+storage: StorageType = select_storage()
+
+# Сигнатуры ("магические числа") поддерживаемых форматов изображений в терминах PIL.
+# Сигнатура WEBP проверяется отдельно, так как идентификатор формата следует за размером контейнера RIFF.
+IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": "JPEG",
+    b"\x89PNG\r\n\x1a\n": "PNG",
+    b"GIF87a": "GIF",
+    b"GIF89a": "GIF",
+    b"II*\x00": "TIFF",
+    b"MM\x00*": "TIFF",
+    b"BM": "BMP",
+}
+RIFF_SIGNATURE = b"RIFF"
+WEBP_SIGNATURE = b"WEBP"
+SIGNATURE_SIZE = 12
+
+# Размер фрагментов, которыми файл читается из хранилища при проверке изображения.
+STORAGE_READ_CHUNK_SIZE = 64 * 1024
+
+
+class ImageValidationError(UnidentifiedImageError):
+    """Файл не прошел проверку изображения."""
+
+
+class StorageRangeReader(RawIOBase):
+    """Файловый объект только для чтения, который читает файл из хранилища фрагментами по смещению."""
+
+    def __init__(self, name: str) -> None:
+        """Запомнить имя файла в хранилище."""
+        super().__init__()
+        self._name = name
+        self._position = 0
+        self._size: Optional[int] = None
+
+    def readable(self) -> bool:
+        """Объект доступен для чтения."""
+        return True
+
+    def seekable(self) -> bool:
+        """Объект поддерживает перемещение указателя."""
+        return True
+
+    def tell(self) -> int:
+        """Текущая позиция указателя."""
+        return self._position
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        """Переместить указатель. Размер файла запрашивается у хранилища, только если смещение задано от конца."""
+        if whence == SEEK_CUR:
+            offset += self._position
+        elif whence == SEEK_END:
+            if self._size is None:
+                self._size = storage.size(self._name)
+            offset += self._size
+        if offset < 0:
+            message = f"Отрицательная позиция в файле {self._name}: {offset}"
+            raise ValueError(message)
+        self._position = offset
+        return self._position
+
+    def readinto(self, buffer: Any) -> int:  # noqa: ANN401
+        """Заполнить буфер байтами файла с текущей позиции. Возвращает количество записанных байт."""
+        data = storage.read_range(self._name, self._position, len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        self._position += size
+        return size
+
+
+class BoundedReader:
+    """Обертка файлового объекта, которая ограничивает количество прочитанных из него байт."""
+
+    def __init__(self, file: IO[bytes], budget: int) -> None:
+        """Запомнить файловый объект и допустимое количество байт для чтения."""
+        self._file = file
+        self.budget = budget
+        self.consumed = 0
+
+    def _limit(self, size: Optional[int]) -> int:
+        """Размер очередного чтения: не больше остатка бюджета и еще одного байта, по которому виден перерасход."""
+        remaining = self.budget - self.consumed + 1
+        return remaining if size is None or size < 0 else min(size, remaining)
+
+    def _consume(self, data: bytes) -> bytes:
+        """Учесть прочитанные байты."""
+        self.consumed += len(data)
+        if self.consumed > self.budget:
+            message = f"Заголовки изображения не умещаются в {self.budget} байт"
+            raise ImageValidationError(message)
+        return data
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        """Прочитать байты из файла в пределах бюджета."""
+        return self._consume(self._file.read(self._limit(size)))
+
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        """Прочитать строку из файла в пределах бюджета."""
+        return self._consume(self._file.readline(self._limit(size)))
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        """Переместить указатель файла. Перемещение не расходует бюджет."""
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        """Текущая позиция указателя файла."""
+        return self._file.tell()
+
+
+def detect_format(signature: bytes) -> Optional[str]:
+    """Определить формат изображения по сигнатуре в начале файла.
+
+    Args:
+        signature (bytes): Первые `SIGNATURE_SIZE` байт файла.
+
+    Returns:
+        Optional[str]: Формат изображения в терминах PIL или None, если формат не поддерживается.
+    """
+    if signature.startswith(RIFF_SIGNATURE) and signature[8:SIGNATURE_SIZE] == WEBP_SIGNATURE:
+        return "WEBP"
+    for magic, image_format in IMAGE_SIGNATURES.items():
+        if signature.startswith(magic):
+            return image_format
+    return None
+
+
+def open_stored_image(name: str) -> BufferedReader:
+    """Открыть файл из хранилища для проверки изображения, не скачивая его целиком.
+
+    Args:
+        name (str): Имя файла в хранилище.
+
+    Returns:
+        BufferedReader: Файловый объект, который читает файл из хранилища фрагментами.
+    """
+    return BufferedReader(StorageRangeReader(name), buffer_size=STORAGE_READ_CHUNK_SIZE)
+
+
+def validate_image(
+    file: IO[bytes],
+    max_pixels: Optional[int] = None,
+    read_budget: Optional[int] = None,
+) -> ImageInfo:
+    """Проверить изображение по сигнатуре и заголовкам файла, не декодируя его.
+
+    После проверки указатель файла возвращается в исходную позицию, поэтому тот же файловый объект
+    можно сразу передать дальше, например, для записи в хранилище.
+
+    Args:
+        file (IO[bytes]): Файловый объект, поддерживающий перемещение указателя.
+        max_pixels (Optional[int]): Наибольшее количество пикселов. По умолчанию `GALLERY_MAX_IMAGE_PIXELS`.
+        read_budget (Optional[int]): Наибольшее количество байт, которое можно прочитать из файла при проверке.
+            По умолчанию `GALLERY_VALIDATION_READ_BUDGET`.
+
+    Returns:
+        ImageInfo: Формат и размеры изображения.
+
+    Raises:
+        ImageValidationError: Файл не является изображением поддерживаемого формата, его заголовки
+            не умещаются в бюджет чтения или изображение содержит слишком много пикселов.
+    """
+    max_pixels = settings.GALLERY_MAX_IMAGE_PIXELS if max_pixels is None else max_pixels
+    read_budget = settings.GALLERY_VALIDATION_READ_BUDGET if read_budget is None else read_budget
+    start = file.tell()
+    try:
+        image_format = detect_format(file.read(SIGNATURE_SIZE))
+        if image_format is None:
+            message = "Файл не является изображением поддерживаемого формата"
+            raise ImageValidationError(message)
+        file.seek(start)
+        try:
+            with Image.open(BoundedReader(file, read_budget), formats=(image_format,)) as image:  # type: ignore[arg-type]
+                width, height = image.size
+        except Image.DecompressionBombError as error:
+            message = f"Изображение содержит слишком много пикселов: {error}"
+            raise ImageValidationError(message) from error
+        except ImageValidationError:
+            raise
+        except UnidentifiedImageError as error:
+            message = f"Заголовки изображения {image_format} повреждены"
+            raise ImageValidationError(message) from error
+    finally:
+        file.seek(start)
+
+    if width * height > max_pixels:
+        message = f"Изображение {width}x{height} содержит больше {max_pixels} пикселов"
+        raise ImageValidationError(message)
+    return ImageInfo(format=image_format, width=width, height=height)
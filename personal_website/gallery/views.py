@@ -1,28 +1,47 @@
 """Представления раздела галереи."""
 
 import logging
+from http import HTTPStatus
 from typing import TYPE_CHECKING, Any
 
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
-from django.http import HttpRequest, HttpResponse
+from django.core.exceptions import ValidationError
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
 from django.utils.safestring import mark_safe
+from django.views import View
 from django.views.generic import DetailView, ListView, TemplateView
 from django.views.generic.edit import FormView
-from PIL import Image, UnidentifiedImageError
+from pydantic import ValidationError as SchemaValidationError
 
 from gallery.forms import UploadForm
-from gallery.models import Album, Photo, Tag
+from gallery.models import Album, ChunkedUpload, Photo, Tag
+from gallery.schemas import ChunkedUploadStart, ChunkedUploadState
+from gallery.search import search_albums, search_photos, search_tags
+from gallery.uploads import (
+    abort_chunked_upload,
+    complete_chunked_upload,
+    start_chunked_upload,
+    upload_chunk,
+    upload_photos,
+)
+from personal_website.cache import cache_public_page
+from personal_website.paginators import CursorPaginator
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
 
 logger = logging.getLogger(settings.PROJECT_NAME)
 
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
 
+
+@method_decorator(cache_public_page("gallery"), "dispatch")
 class GalleryHomeView(TemplateView):
     """Предствление главной страницы галереи."""
 
@@ -31,52 +50,62 @@ class GalleryHomeView(TemplateView):
     def get_context_data(self, **kwargs) -> dict:
         """Добавить альбомы и тэги в контекст."""
         context = super().get_context_data(**kwargs)
-        context["albums"] = Album.published.all()
+        context["albums"] = Album.published.prefetch_related("cover__renditions")
         context["tags"] = Tag.objects.all()
         return context
 
 
+@method_decorator(cache_public_page("gallery"), "dispatch")
 class PhotoDetailView(DetailView):
     """Представление для показа единственной фотографии."""
 
     model = Photo
+    queryset = Photo.objects.select_related("album").prefetch_related("renditions")
     template_name = "gallery/photo_detail.html"
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
-        """Добавить в контекст следующую и предыдущую фотографии из альбома, а также все тэги фотографии."""
+        """Добавить в контекст следующую и предыдущую фотографии из альбома, а также все тэги фотографии.
+
+        Соседние фотографии определяются по времени съемки двумя запросами по индексу `(album, taken_at, id)`,
+        поэтому время ответа не зависит от количества фотографий в альбоме.
+        """
         context = super().get_context_data(**kwargs)
-        obj: Photo = self.get_object()
-
-        album_photos = Photo.published.filter(album=obj.album)
-        next_photos = list(
-            filter(
-                lambda photo: photo.datetime_taken > obj.datetime_taken,
-                sorted(album_photos, key=lambda photo: photo.datetime_taken),
-            ),
-        )
-        previous_photos = list(
-            filter(
-                lambda photo: photo.datetime_taken < obj.datetime_taken,
-                sorted(album_photos, key=lambda photo: photo.datetime_taken, reverse=True),
-            ),
+        obj: Photo = self.object
+
+        album_photos = CursorPaginator(
+            Photo.published.filter(album_id=obj.album_id),
+            per_page=1,
+            ordering_field="taken_at",
+            descending=False,
         )
-        context["next_photo"] = next_photos[0] if next_photos else None
-        context["previous_photo"] = previous_photos[0] if previous_photos else None
+        context["next_photo"] = album_photos.next_object(obj)
+        context["previous_photo"] = album_photos.previous_object(obj)
         context["tags"] = obj.tags.all()
         return context
 
 
+@method_decorator(cache_public_page("gallery"), "dispatch")
 class PhotoListView(ListView):
-    """Отображение списка фотографий."""
+    """Отображение списка фотографий.
+
+    Фотографии выводятся от новых к старым с разбивкой на страницы по курсору `?after=<taken_at>,<pk>`:
+    сортировка и выборка страницы выполняются в базе данных без подсчета общего количества фотографий.
+    """
 
     model = Photo
     template_name = "gallery/photo_list.html"
     paginate_by = 40
+    ordering_field = "taken_at"
 
-    def get_queryset(self) -> list[Photo]:  # type: ignore[override]
-        """Отсортировать набор фотографий от новых к старым."""
-        photos = Photo.published.all()
-        return sorted(photos, key=lambda photo: photo.datetime_taken, reverse=True)
+    def get_queryset(self) -> "QuerySet[Photo]":
+        """Набор публичных фотографий."""
+        return Photo.published.prefetch_related("renditions")
+
+    def paginate_queryset(self, queryset: "QuerySet[Photo]", page_size: int) -> tuple:  # type: ignore[override]
+        """Получить страницу фотографий по курсору из параметров запроса."""
+        paginator = CursorPaginator(queryset, page_size, ordering_field=self.ordering_field)
+        page = paginator.get_page(after=self.request.GET.get("after"), before=self.request.GET.get("before"))
+        return (paginator, page, page.object_list, page.has_other_pages())
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         """Добавить в контекст набор всхе тэгов фотографии."""
@@ -85,6 +114,36 @@ class PhotoListView(ListView):
         return context
 
 
+class GallerySearchView(PhotoListView):
+    """Поиск по фотографиям, альбомам и тэгам галереи по параметру запроса `?q=`.
+
+    Найденные фотографии выводятся от новых к старым с разбивкой на страницы по курсору, как в списке
+    фотографий, а над ними - первые найденные альбомы и тэги. Каждый тип результатов выбирается одним
+    запросом по индексам, поэтому время ответа не зависит от количества фотографий в галерее.
+    Страница кэшируется так же, как список фотографий, отдельно для каждого запроса.
+    """
+
+    template_name = "gallery/search.html"
+
+    def get_query(self) -> str:
+        """Поисковый запрос из параметров запроса."""
+        return self.request.GET.get("q", "").strip()
+
+    def get_queryset(self) -> "QuerySet[Photo]":
+        """Найденные публичные фотографии."""
+        return search_photos(self.get_query(), super().get_queryset())
+
+    def get_context_data(self, **kwargs) -> dict[str, Any]:
+        """Добавить в контекст поисковый запрос, найденные альбомы и тэги."""
+        context = super().get_context_data(**kwargs)
+        query = self.get_query()
+        context["query"] = query
+        context["albums"] = search_albums(query, Album.published.prefetch_related("cover__renditions"))
+        context["found_tags"] = search_tags(query)
+        return context
+
+
+@method_decorator(cache_public_page("gallery"), "dispatch")
 class AlbumDetailView(DetailView):
     """Представление для показа альбома."""
 
@@ -96,21 +155,24 @@ class AlbumDetailView(DetailView):
         context = super().get_context_data(**kwargs)
         album: Album = context["album"]
 
-        # Получить коллекцию фотографий из даного альбома.
-        photos: QuerySet[Photo] = album.photo_set.filter(public=True)
-
-        # Добавить фотографии в контекст, отсортировав от старых к новым.
-        context["photos"] = sorted(photos, key=lambda photo: photo.datetime_taken)
+        # Получить коллекцию фотографий из даного альбома, отсортировав от старых к новым.
+        photos: QuerySet[Photo] = (
+            album.photo_set.filter(public=True)
+            .order_by("taken_at", "pk")
+            .prefetch_related("renditions")
+        )
+        context["photos"] = photos
         context["tags"] = album.tags.all()
         return context
 
 
+@method_decorator(cache_public_page("gallery"), "dispatch")
 class AlbumListView(ListView):
     """Представление для показа списка альбомов."""
 
     model = Album
     template_name = "gallery/album_list.html"
-    queryset = Album.published.all()
+    queryset = Album.published.prefetch_related("cover__renditions")
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         """Добавить все тэги в контекст ответа."""
@@ -119,6 +181,7 @@ class AlbumListView(ListView):
         return context
 
 
+@method_decorator(cache_public_page("gallery"), "dispatch")
 class TagDetailView(DetailView):
     """Представление для просмотра фотографий и альбомов по тэгу."""
 
@@ -142,8 +205,8 @@ class TagDetailView(DetailView):
 
         # Добавить полученные альбомы и фотографии в контекст.
         # Отсортирофать альбомы и фотографии от новых к старым.
-        context["albums"] = sorted(albums, key=lambda album: album.created_at, reverse=True)
-        context["photos"] = sorted(photos, key=lambda photo: photo.datetime_taken, reverse=True)
+        context["albums"] = albums.order_by("-created_at").select_related("cover").prefetch_related("cover__renditions")
+        context["photos"] = photos.order_by("-taken_at", "-pk").prefetch_related("renditions")
         context["tags"] = Tag.objects.all()
         return context
 
@@ -162,7 +225,7 @@ class UploadFormView(FormView):
         context["tags"] = Tag.objects.all()
         return context
 
-    def post(self, request: HttpRequest, *args: tuple, **kwargs: dict) -> HttpResponse:  # noqa: ARG002
+    def post(self, request: HttpRequest, *args: tuple, **kwargs: dict) -> HttpResponseBase:  # type: ignore[override]  # noqa: ARG002
         """Проверить форму на валидность после отправки."""
         form_class = self.get_form_class()
         form = self.get_form(form_class)
@@ -170,31 +233,31 @@ class UploadFormView(FormView):
             return self.form_valid(form)
         return self.form_invalid(form)
 
-    def form_valid(self, form: UploadForm) -> HttpResponse:
-        """Верифицировать и создать каждую загруженную фотографию."""
+    def form_valid(self, form: UploadForm) -> HttpResponseBase:  # type: ignore[override]
+        """Верифицировать и создать загруженные фотографии.
+
+        Если клиент принимает ответ в формате NDJSON, то результат загрузки каждого файла
+        отправляется отдельной строкой по мере готовности. Иначе выполняется перенаправление
+        на страницу галереи с сообщениями о результатах загрузки и предупреждениями о похожих фотографиях.
+        """
         # Получение данных из отправленной формы.
         data: dict = form.cleaned_data
         photos = data["photos"]
         album: Album = data["album"]
+        results = upload_photos(photos, album)
+
+        if NDJSON_CONTENT_TYPE in self.request.headers.get("Accept", ""):
+            lines = (f"{result.model_dump_json()}\n" for result in results)
+            return StreamingHttpResponse(lines, content_type=NDJSON_CONTENT_TYPE)
 
-        # Цикл для каждой фотографии из отправленной формы.
         counter = 0  # инициализация счетчика загруженных фотографий
-        for photo in photos:
-            try:
-                image = Image.open(photo)
-                image.verify()
-                Photo.objects.create(image=photo, album=album)
-                message = f"Загружена фотография {photo} в альбом {album}"
-                logger.debug(message)
+        for result in results:
+            if result.uploaded:
                 counter += 1
-            except UnidentifiedImageError:  # noqa: PERF203
-                message = f'Загруженный файл "{photo}" не является изображением'
-                messages.add_message(self.request, messages.ERROR, message)
-                logger.exception(message)
-            except Exception as error:
-                message = f'Ошибка загрузки фотографии в альбом "{album}": "{error}"'
-                messages.add_message(self.request, messages.ERROR, message)
-                logger.exception(message)
+                if result.duplicates:
+                    messages.add_message(self.request, messages.WARNING, result.message)
+            else:
+                messages.add_message(self.request, messages.ERROR, result.message)
 
         #  Если хотя бы одна фотография заружена в альбом.
         if counter:
@@ -209,3 +272,75 @@ class UploadFormView(FormView):
             logger.info(message)
 
         return super().form_valid(form)
+
+
+def chunked_upload_response(upload: ChunkedUpload, status: int = HTTPStatus.OK) -> JsonResponse:
+    """Ответ с состоянием загрузки по частям."""
+    state = ChunkedUploadState(
+        id=str(upload.pk),
+        file_name=upload.file_name,
+        size=upload.size,
+        received=upload.received,
+        chunk_size=settings.GALLERY_UPLOAD_CHUNK_SIZE,
+        parts=[part["PartNumber"] for part in upload.parts],
+        completed=upload.completed,
+    )
+    return JsonResponse(state.model_dump(), status=status)
+
+
+@method_decorator(staff_member_required, "dispatch")
+class ChunkedUploadView(View):
+    """Начало загрузки файла фотографии по частям.
+
+    Тело запроса - JSON с идентификатором альбома, именем и размером файла. В ответе возвращается
+    идентификатор загрузки и размер части, которыми клиент передает файл.
+    """
+
+    def post(self, request: HttpRequest) -> JsonResponse:  # noqa: D102
+        try:
+            data = ChunkedUploadStart.model_validate_json(request.body)
+        except SchemaValidationError as error:
+            return JsonResponse({"error": str(error)}, status=HTTPStatus.BAD_REQUEST)
+        album = get_object_or_404(Album, pk=data.album)
+        upload = start_chunked_upload(album, data.file_name, data.size)
+        return chunked_upload_response(upload, HTTPStatus.CREATED)
+
+
+@method_decorator(staff_member_required, "dispatch")
+class ChunkedUploadDetailView(View):
+    """Состояние загрузки по частям (для возобновления загрузки) и ее отмена."""
+
+    def get(self, request: HttpRequest, pk: str) -> JsonResponse:  # noqa: ARG002, D102
+        return chunked_upload_response(get_object_or_404(ChunkedUpload, pk=pk))
+
+    def delete(self, request: HttpRequest, pk: str) -> HttpResponse:  # noqa: ARG002, D102
+        abort_chunked_upload(get_object_or_404(ChunkedUpload, pk=pk))
+        return HttpResponse(status=HTTPStatus.NO_CONTENT)
+
+
+@method_decorator(staff_member_required, "dispatch")
+class ChunkedUploadPartView(View):
+    """Загрузка части файла. Тело запроса передается в хранилище потоком, не загружаясь в память целиком."""
+
+    def put(self, request: HttpRequest, pk: str, part_number: int) -> JsonResponse:  # noqa: D102
+        upload = get_object_or_404(ChunkedUpload, pk=pk)
+        size = int(request.headers.get("Content-Length") or 0)
+        try:
+            upload = upload_chunk(upload, part_number, request, size)  # type: ignore[arg-type]
+        except ValidationError as error:
+            return JsonResponse({"error": error.message}, status=HTTPStatus.BAD_REQUEST)
+        return chunked_upload_response(upload)
+
+
+@method_decorator(staff_member_required, "dispatch")
+class ChunkedUploadCompleteView(View):
+    """Завершение загрузки по частям: файл собирается в хранилище, и для него создается фотография."""
+
+    def post(self, request: HttpRequest, pk: str) -> JsonResponse:  # noqa: ARG002, D102
+        upload = get_object_or_404(ChunkedUpload.objects.select_related("album", "photo"), pk=pk)
+        try:
+            result = complete_chunked_upload(upload)
+        except ValidationError as error:
+            return JsonResponse({"error": error.message}, status=HTTPStatus.CONFLICT)
+        status = HTTPStatus.CREATED if result.uploaded else HTTPStatus.BAD_REQUEST
+        return JsonResponse(result.model_dump(), status=status)
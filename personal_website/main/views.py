@@ -4,8 +4,10 @@ from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 
 from blog.models import Category, Series
+from personal_website.cache import cache_public_page
 
 
+@cache_public_page("blog")
 def main(request: HttpRequest) -> HttpResponse:
     """Показ главной страницы сайта."""
     categories = Category.objects.filter(public=True).exclude(image="")
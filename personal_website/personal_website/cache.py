@@ -0,0 +1,109 @@
+"""
+Кэширование страниц и фрагментов шаблонов.
+
+Закэшированные страницы и фрагменты не удаляются по отдельности: ключ кэша каждого раздела сайта
+содержит номер поколения раздела, который увеличивается сигналами при изменении объектов раздела.
+После этого старые записи больше не читаются и вытесняются из кэша по истечении времени хранения.
+"""
+
+import time
+from collections.abc import Callable
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.cache import cache_page
+
+# Разделы сайта, страницы которых кэшируются. Главная страница относится к блогу.
+CACHE_SECTIONS = ("blog", "gallery")
+
+
+def generation_key(section: str) -> str:
+    """Ключ кэша, в котором хранится номер поколения раздела."""
+    return f"cache-generation:{section}"
+
+
+def get_generations(*sections: str) -> dict[str, int]:
+    """Получить номера поколений разделов одним запросом к кэшу.
+
+    Если номер поколения отсутствует в кэше (например, был вытеснен), то начальным номером становится
+    текущее время в наносекундах, чтобы не совпасть ни с одним из ранее использованных номеров.
+    """
+    keys = {generation_key(section): section for section in sections}
+    generations = cache.get_many(keys)
+    for key in keys.keys() - generations.keys():
+        cache.add(key, time.time_ns(), timeout=None)
+        generations[key] = cache.get(key, 0)
+    return {section: generations[key] for key, section in keys.items()}
+
+
+def generation_cache_key(section: str, key: str) -> str:
+    """Ключ кэша, который перестает использоваться после изменения объектов раздела."""
+    generation = get_generations(section)[section]
+    return f"{key}:{section}{generation}"
+
+
+def bump_generation(*sections: str) -> None:
+    """Увеличить номера поколений разделов, после чего закэшированные страницы разделов перестают использоваться."""
+    for section in sections:
+        key = generation_key(section)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def cache_versions(request: HttpRequest) -> dict[str, SimpleLazyObject | int]:  # noqa: ARG001
+    """Контекстный процессор с номерами поколений разделов и временем хранения для тэга `{% cache %}`.
+
+    Номера поколений запрашиваются из кэша только при обращении к ним из шаблона.
+    """
+    return {
+        "cache_versions": SimpleLazyObject(lambda: get_generations(*CACHE_SECTIONS)),
+        "cache_timeout": settings.CACHE_MIDDLEWARE_SECONDS,
+    }
+
+
+def is_anonymous_request(request: HttpRequest) -> bool:
+    """Запрос без cookie сессии и сообщений: пользователь не авторизован и у него нет непоказанных сообщений.
+
+    Проверяются только cookie запроса, без чтения сессии, поэтому ответ не получает заголовок `Vary: Cookie`.
+    """
+    return settings.SESSION_COOKIE_NAME not in request.COOKIES and CookieStorage.cookie_name not in request.COOKIES
+
+
+def cache_public_page(*sections: str) -> Callable:
+    """Декоратор, кэширующий страницу целиком для неавторизованных пользователей.
+
+    Страница кэшируется отдельно для каждого поколения переданных разделов. Для авторизованных
+    пользователей страница не кэшируется, так как содержит персональные элементы (форму комментария,
+    ссылки для персонала), так же как и страница с непоказанными сообщениями. Браузеру запрещается
+    хранить страницу без проверки, чтобы изменения были видны сразу после публикации.
+
+    Шаблоны страниц проверяют пользователя, из-за чего пустая сессия запроса помечается прочитанной
+    и `SessionMiddleware` добавляет к ответу `Vary: Cookie`. Страница одинакова для всех запросов без сессии,
+    поэтому, если сессия не изменялась, отметка о чтении снимается.
+    """
+
+    def decorator(view_func: Callable[..., HttpResponse]) -> Callable[..., HttpResponse]:
+        @wraps(view_func)
+        def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            if request.method not in ("GET", "HEAD") or not is_anonymous_request(request):
+                return view_func(request, *args, **kwargs)
+            generations = get_generations(*sections)
+            key_prefix = "-".join(f"{section}{generation}" for section, generation in generations.items())
+            cached_view = cache_page(settings.CACHE_MIDDLEWARE_SECONDS, key_prefix=key_prefix)(view_func)
+            response = cached_view(request, *args, **kwargs)
+            patch_cache_control(response, max_age=0, must_revalidate=True)
+            session = getattr(request, "session", None)
+            if session is not None and not session.modified:
+                session.accessed = False
+            return response
+
+        return wrapper
+
+    return decorator
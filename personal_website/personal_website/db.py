@@ -0,0 +1,82 @@
+"""
+Вспомогательные средства для работы с базой данных, общие для приложений проекта.
+
+Основная база данных проекта - PostgreSQL, но в SourceCraft CI/CD используется SQLite. Индексы и расширения,
+которые есть только в PostgreSQL (GIN, pg_trgm), добавляются в миграции операциями из этого модуля:
+в PostgreSQL они выполняются как обычно, а в других базах данных изменяют только состояние моделей.
+Так же изменяются поля моделей с такими индексами: SQLite изменяет поле пересозданием таблицы вместе
+со всеми индексами модели, в том числе индексами, которых в SQLite нет.
+
+Выражение `RowValue` строит конструктор строки `(a, b)`, который поддерживают и PostgreSQL, и SQLite.
+Сравнение строк `(taken_at, id) < (%s, %s)` PostgreSQL выполняет поиском по составному индексу.
+"""
+
+from django.db import connection
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.operations import AddIndex, AlterField
+from django.db.migrations.state import ProjectState
+from django.db.models import Func
+
+
+def is_postgresql() -> bool:
+    """Основная база данных - PostgreSQL."""
+    return connection.vendor == "postgresql"
+
+
+class RowValue(Func):
+    """Конструктор строки из нескольких выражений для сравнения строк: `(a, b) < (c, d)`."""
+
+    function = ""
+    template = "(%(expressions)s)"
+
+
+class PostgreSQLAddIndex(AddIndex):
+    """Добавление индекса, который создается только в PostgreSQL, например, GinIndex."""
+
+    def database_forwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        """Создать индекс, если миграция применяется к PostgreSQL."""
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        """Удалить индекс, если миграция откатывается в PostgreSQL."""
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class PostgreSQLAlterField(AlterField):
+    """Изменение поля модели, которое выполняется в базе данных только в PostgreSQL."""
+
+    def database_forwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        """Изменить поле, если миграция применяется к PostgreSQL."""
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        """Вернуть прежнее поле, если миграция откатывается в PostgreSQL."""
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
@@ -0,0 +1,32 @@
+"""Промежуточное ПО проекта."""
+
+from collections.abc import Callable
+from contextvars import ContextVar
+
+from django.http import HttpRequest, HttpResponse
+
+# Результаты проверки наличия файлов в хранилище в пределах обработки одного запроса.
+# Вне запроса (например, в management-командах) кэш не используется.
+file_exists_cache: ContextVar[dict[str, bool] | None] = ContextVar("file_exists_cache", default=None)
+
+
+class FileExistsCacheMiddleware:
+    """Кэширование проверок наличия файлов в хранилище на время обработки запроса.
+
+    Шаблоны списков фотографий и альбомов проверяют наличие файла для каждой карточки.
+    Для S3 хранилища каждая проверка - это отдельный сетевой запрос, поэтому результаты
+    проверок запоминаются до конца запроса и могут быть получены заранее одним пакетом
+    (см. тэг `prefetch_files_exist`).
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """Сохранить следующий обработчик в цепочке промежуточного ПО."""
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Создать пустой кэш перед обработкой запроса и удалить его после формирования ответа."""
+        token = file_exists_cache.set({})
+        try:
+            return self.get_response(request)
+        finally:
+            file_exists_cache.reset(token)
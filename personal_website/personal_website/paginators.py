@@ -0,0 +1,219 @@
+"""
+Постраничная разбивка наборов объектов по курсору (keyset pagination).
+
+В отличие от стандартного `django.core.paginator.Paginator` не выполняет `COUNT(*)` и не использует `OFFSET`:
+следующая страница выбирается сравнением строк `(поле, pk) < (значение поля, pk)` с последним объектом
+предыдущей страницы. При наличии индекса `(поле, pk)` страница выбирается поиском по индексу и чтением
+`per_page + 1` записей в порядке индекса, поэтому время получения страницы не зависит от ее номера
+и от количества объектов. Поле сортировки не должно допускать пустых значений: сортировка с `NULLS LAST`
+не совпадает с порядком индекса, а условие на пустые значения не выполняется поиском по индексу.
+
+Курсор передается в параметрах запроса в виде `?after=<значение поля>,<pk>` или `?before=<значение поля>,<pk>`.
+
+Общее количество объектов страницам не нужно. Если его нужно вывести, то паджинатору передается ключ кэша
+`count_cache_key`: количество считается одним запросом `COUNT(*)` при первом обращении и затем читается из кэша,
+поэтому может отставать от базы данных до смены ключа (например, номера поколения раздела в ключе)
+или до истечения времени хранения.
+
+Examples:
+    ```
+    paginator = CursorPaginator(Photo.published.all(), per_page=40, ordering_field="taken_at")
+    page = paginator.get_page(after=request.GET.get("after"), before=request.GET.get("before"))
+    ```
+"""
+
+from collections.abc import Sequence
+from typing import Any, overload
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import F, Model, QuerySet, Value
+from django.db.models.expressions import OrderBy
+from django.db.models.lookups import GreaterThan, LessThan
+from django.utils.functional import cached_property
+
+from personal_website.db import RowValue
+
+
+class CursorPage(Sequence):
+    """Страница объектов, полученная по курсору."""
+
+    def __init__(
+        self,
+        object_list: list[Model],
+        paginator: "CursorPaginator",
+        next_cursor: str | None = None,
+        previous_cursor: str | None = None,
+    ) -> None:
+        """Сохранить объекты страницы и курсоры соседних страниц."""
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self) -> str:
+        """Строковое представление страницы содержит количество объектов на странице."""
+        return f"<CursorPage: {len(self)} objects>"
+
+    def __len__(self) -> int:
+        """Количество объектов на странице."""
+        return len(self.object_list)
+
+    @overload
+    def __getitem__(self, index: int) -> Model: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Model]: ...
+
+    def __getitem__(self, index: int | slice) -> Model | list[Model]:
+        """Объект страницы по индексу."""
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        """Существует следующая страница."""
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        """Существует предыдущая страница."""
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        """Существует следующая или предыдущая страница."""
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Разбивка набора объектов на страницы по курсору `(поле сортировки, pk)`.
+
+    Объекты сортируются по полю `ordering_field` (по умолчанию от больших значений к меньшим),
+    при равенстве значений - по первичному ключу. Поле сортировки должно быть обязательным (`NOT NULL`).
+    """
+
+    cursor_separator = ","
+
+    def __init__(
+        self,
+        object_list: QuerySet,
+        per_page: int,
+        ordering_field: str,
+        descending: bool = True,  # noqa: FBT001, FBT002
+        count_cache_key: str | None = None,
+    ) -> None:
+        """Определить набор объектов, размер страницы, поле сортировки и ключ кэша общего количества объектов."""
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering_field = ordering_field
+        self.descending = descending
+        self.count_cache_key = count_cache_key
+        self.field = object_list.model._meta.get_field(ordering_field)  # noqa: SLF001
+        self.pk_field = object_list.model._meta.pk  # noqa: SLF001
+
+    @cached_property
+    def approximate_count(self) -> int | None:
+        """Общее количество объектов из кэша или None, если ключ кэша не задан.
+
+        При отсутствии значения в кэше количество считается запросом `COUNT(*)` и сохраняется в кэш
+        на время хранения страниц.
+        """
+        if self.count_cache_key is None:
+            return None
+        timeout = settings.CACHE_MIDDLEWARE_SECONDS
+        count: int | None = cache.get_or_set(self.count_cache_key, self.object_list.count, timeout)
+        return count
+
+    def encode_cursor(self, obj: Model) -> str:
+        """Сформировать курсор из значения поля сортировки и первичного ключа объекта."""
+        return f"{self.field.value_to_string(obj)}{self.cursor_separator}{obj.pk}"
+
+    def decode_cursor(self, cursor: str) -> tuple[Any, Any]:
+        """Получить значение поля сортировки и первичный ключ из курсора.
+
+        Raises:
+            ValueError: Курсор имеет неверный формат.
+        """
+        value, separator, pk = cursor.rpartition(self.cursor_separator)
+        if not separator or not value or not pk:
+            msg = f"Неверный формат курсора: {cursor}"
+            raise ValueError(msg)
+        try:
+            decoded_value = self.field.to_python(value)
+            decoded_pk = self.pk_field.to_python(pk)
+        except ValidationError as error:
+            msg = f"Неверный формат курсора: {cursor}"
+            raise ValueError(msg) from error
+        return decoded_value, decoded_pk
+
+    def get_ordering(self, reverse: bool = False) -> tuple[OrderBy, OrderBy]:  # noqa: FBT001, FBT002
+        """Порядок сортировки объектов (или обратный порядок), совпадающий с порядком индекса `(поле, pk)`."""
+        field, pk = F(self.ordering_field), F("pk")
+        if self.descending != reverse:
+            return field.desc(), pk.desc()
+        return field.asc(), pk.asc()
+
+    def _after(self, value: Any, pk: Any, reverse: bool = False) -> LessThan | GreaterThan:  # noqa: ANN401, FBT001, FBT002
+        """Условие выбора объектов после курсора в прямом (или обратном) порядке сортировки.
+
+        Условие - сравнение строк `(поле, pk) < (значение, pk)`, которое выполняется поиском по индексу.
+        """
+        lookup = LessThan if self.descending != reverse else GreaterThan
+        row = RowValue(F(self.ordering_field), F("pk"), output_field=self.field)
+        cursor = RowValue(
+            Value(value, output_field=self.field),
+            Value(pk, output_field=self.pk_field),
+            output_field=self.field,
+        )
+        return lookup(row, cursor)
+
+    def next_object(self, obj: Model) -> Model | None:
+        """Объект, следующий за данным объектом в порядке сортировки (один запрос с поиском по индексу)."""
+        value = self.field.value_from_object(obj)
+        queryset = self.object_list.filter(self._after(value, obj.pk))
+        return queryset.order_by(*self.get_ordering()).first()
+
+    def previous_object(self, obj: Model) -> Model | None:
+        """Объект, предшествующий данному объекту в порядке сортировки (один запрос с поиском по индексу)."""
+        value = self.field.value_from_object(obj)
+        queryset = self.object_list.filter(self._after(value, obj.pk, reverse=True))
+        return queryset.order_by(*self.get_ordering(reverse=True)).first()
+
+    def get_page(self, after: str | None = None, before: str | None = None) -> CursorPage:
+        """Получить страницу объектов после курсора `after` или перед курсором `before`.
+
+        Если курсор не передан или имеет неверный формат, то возвращается первая страница.
+        """
+        if before:
+            try:
+                value, pk = self.decode_cursor(before)
+            except ValueError:
+                return self.get_page()
+            queryset = self.object_list.filter(self._after(value, pk, reverse=True))
+            objects = list(queryset.order_by(*self.get_ordering(reverse=True))[: self.per_page + 1])
+            if not objects:
+                return self.get_page()
+            has_previous = len(objects) > self.per_page
+            objects = objects[: self.per_page][::-1]
+            return CursorPage(
+                objects,
+                self,
+                next_cursor=self.encode_cursor(objects[-1]),
+                previous_cursor=self.encode_cursor(objects[0]) if has_previous else None,
+            )
+
+        queryset = self.object_list
+        if after:
+            try:
+                value, pk = self.decode_cursor(after)
+            except ValueError:
+                after = None
+            else:
+                queryset = queryset.filter(self._after(value, pk))
+        objects = list(queryset.order_by(*self.get_ordering())[: self.per_page + 1])
+        has_next = len(objects) > self.per_page
+        objects = objects[: self.per_page]
+        return CursorPage(
+            objects,
+            self,
+            next_cursor=self.encode_cursor(objects[-1]) if has_next else None,
+            previous_cursor=self.encode_cursor(objects[0]) if after and objects else None,
+        )
@@ -2,6 +2,7 @@
 
 import os
 import sys
+from importlib.util import find_spec
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -75,6 +76,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "personal_website.middleware.FileExistsCacheMiddleware",
 ]
 
 # При запуске тестов нужно отключить WhiteNoise, так как при запуске тестов режим дебага отключен.
@@ -167,6 +169,9 @@ STORAGES = {
             "file_overwrite": True,
             "default_acl": "public-read",
             "querystring_auth": False,
+            "client_pool_size": int(os.getenv("AWS_S3_CLIENT_POOL_SIZE", default="10")),
+            "retry_mode": os.getenv("AWS_S3_RETRY_MODE", default="standard"),
+            "max_attempts": int(os.getenv("AWS_S3_MAX_ATTEMPTS", default="3")),
         },
     },
 }
@@ -213,6 +218,30 @@ else:
         },
     }
 
+# Настройки кэша. Бэкенд выбирается переменной окружения CACHE_BACKEND: locmem, file или redis.
+# По умолчанию используется Redis, если задан REDIS_URL и установлен пакет redis, иначе - файловый кэш.
+# Кэш должен быть общим для всех процессов Gunicorn и пула построения копий изображений: номер поколения раздела,
+# увеличенный в одном процессе, должен сбросить страницы во всех процессах. Поэтому кэш в памяти процесса (locmem)
+# по умолчанию не используется. При запуске тестов кэш отключен, чтобы страницы не сохранялись между тестами.
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_BACKENDS = {
+    "dummy": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    "locmem": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": PROJECT_NAME},
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("CACHE_LOCATION", default=PROJECT_DIR / "cache"),
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", default="10000"))},
+    },
+    "redis": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL},
+}
+REDIS_AVAILABLE = bool(REDIS_URL) and find_spec("redis") is not None
+CACHE_BACKEND = "dummy" if TEST else os.getenv("CACHE_BACKEND", default="redis" if REDIS_AVAILABLE else "file")
+CACHES = {"default": CACHE_BACKENDS[CACHE_BACKEND]}
+
+# Время хранения страниц и фрагментов шаблонов в кэше в секундах.
+# Кэш сбрасывается сигналами при изменении объектов, поэтому время хранения ограничивает только расход памяти.
+CACHE_MIDDLEWARE_SECONDS = int(os.getenv("CACHE_TIMEOUT", default="3600"))
+
 # Настройки используемого шаблонизатора. Здесь также указан относительный путь до папки с шаблонами проекта.
 TEMPLATES = [
     {
@@ -228,6 +257,7 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
                 "django.template.context_processors.i18n",
+                "personal_website.cache.cache_versions",
             ],
             "libraries": {
                 "file_tags": "personal_website.templatetags.file_tags",
@@ -388,3 +418,40 @@ GALLERY_PREVIEW_SIZE = 1000
 
 # Качество сжатия миниатюр и предварительного просмотра.
 GALLERY_RESIZE_QUALITY = 100
+
+# Ширина в пикселах адаптивных копий фотографий, из которых браузер выбирает подходящую по атрибуту srcset.
+GALLERY_RESPONSIVE_WIDTHS = (320, 640, 1000, 2000)
+
+# Форматы адаптивных копий в порядке предпочтения. Последний формат используется как запасной вариант
+# для браузеров, не поддерживающих остальные.
+# Форматы, которые не поддерживает установленная версия Pillow, пропускаются.
+GALLERY_RESPONSIVE_FORMATS = ("AVIF", "WEBP", "JPEG")
+
+# Качество сжатия адаптивных копий.
+GALLERY_RESPONSIVE_QUALITY = 80
+
+# Количество процессов для построения уменьшенных копий фотографий.
+# При значении 0 копии строятся синхронно в процессе, сохранившем фотографию (используется при тестировании).
+GALLERY_RENDITION_WORKERS = 0 if TEST else int(os.getenv("GALLERY_RENDITION_WORKERS", default="2"))
+
+# Количество потоков для проверки изображений, чтения EXIF и записи файлов в хранилище при пакетной загрузке.
+GALLERY_UPLOAD_WORKERS = int(os.getenv("GALLERY_UPLOAD_WORKERS", default="4"))
+
+# Количество фотографий, сохраняемых в базу данных одним запросом при пакетной загрузке.
+GALLERY_UPLOAD_BATCH_SIZE = 20
+
+# Размер части файла при загрузке фотографий по частям. Для S3 все части, кроме последней, должны быть не меньше 5 МиБ.
+GALLERY_UPLOAD_CHUNK_SIZE = int(os.getenv("GALLERY_UPLOAD_CHUNK_SIZE", default=str(8 * 1024 * 1024)))
+
+# Количество потоков для копирования файлов в хранилище при перемещении фотографий в другой альбом.
+GALLERY_MOVE_WORKERS = int(os.getenv("GALLERY_MOVE_WORKERS", default="8"))
+
+# Наибольшее количество пикселов загружаемого изображения: изображения больше отклоняются до распаковки.
+GALLERY_MAX_IMAGE_PIXELS = int(os.getenv("GALLERY_MAX_IMAGE_PIXELS", default=str(100_000_000)))
+
+# Наибольшее количество байт, которое читается из файла при проверке заголовков изображения.
+GALLERY_VALIDATION_READ_BUDGET = int(os.getenv("GALLERY_VALIDATION_READ_BUDGET", default=str(1024 * 1024)))
+
+# Наибольшее количество различающихся бит перцептивных хэшей, при котором фотографии считаются дубликатами.
+# Похожие фотографии находятся по индексу, если значение меньше количества полос хэша (4).
+GALLERY_DUPLICATE_DISTANCE = int(os.getenv("GALLERY_DUPLICATE_DISTANCE", default="3"))
@@ -1,11 +1,20 @@
 """Определение параметров хранения загружаемых файлов."""
 
+import hashlib
+import mimetypes
+import queue
 import shutil
+import threading
 import uuid
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cached_property
 from io import BytesIO
 from pathlib import Path
 from typing import IO, Any, Callable, Union
 
+from botocore.config import Config  # type: ignore[import-untyped]
 from botocore.exceptions import ClientError  # type: ignore[import-untyped]
 from django.conf import settings
 from django.core.files.base import ContentFile
@@ -14,6 +23,12 @@ from django.utils.text import slugify
 from faker_file.storages.filesystem import FileSystemStorage as FakerFileSystemStorage  # type: ignore[import-untyped]
 from storages.backends.s3boto3 import S3Boto3Storage  # type: ignore[import-untyped]
 
+# Размер блока, которым часть файла копируется из потока запроса во временный файл.
+MULTIPART_READ_SIZE = 64 * 1024
+
+# Наибольшее количество ключей в одном запросе S3 DeleteObjects.
+S3_DELETE_BATCH_SIZE = 1000
+
 
 class BaseStorageMixin:
     """Базовый миксин для хранилищ с реализацией общих методов."""
@@ -243,6 +258,15 @@ class CustomFileSystemStorage(BaseStorageMixin, FileSystemStorage):
         dst_path.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy2(src_path, dst_path)
 
+    def copy_object(self, src: Union[str, Path], dst: Union[str, Path]) -> None:
+        """Копирование файла внутри хранилища. Для файловой системы совпадает с `copy_file`."""
+        self.copy_file(src, dst)
+
+    def delete_many(self, names: Iterable[str]) -> None:
+        """Удалить несколько файлов. Отсутствующие файлы пропускаются."""
+        for name in names:
+            self.delete(name)
+
     def save_document(self, name: str, save_func: Callable[[BytesIO], None]) -> str:
         """
         Сохраняет документ, созданный функцией save_func, в хранилище.
@@ -274,6 +298,115 @@ class CustomFileSystemStorage(BaseStorageMixin, FileSystemStorage):
         abs_path = Path(self.path(relative_name))
         return abs_path.read_bytes()
 
+    def read_range(self, name: str, start: int, length: int) -> bytes:
+        """
+        Читает фрагмент файла, не загружая файл целиком.
+
+        Args:
+            name: Имя файла.
+            start: Смещение начала фрагмента в байтах.
+            length: Длина фрагмента в байтах.
+
+        Returns:
+            Фрагмент файла. Если файл заканчивается раньше, то фрагмент короче `length`.
+        """
+        relative_name = self._get_relative_name(name)
+        with Path(self.path(relative_name)).open("rb") as file:
+            file.seek(start)
+            return file.read(length)
+
+    def existing_files(self, names: Iterable[str]) -> set[str]:
+        """
+        Проверяет наличие нескольких файлов в хранилище.
+
+        Файлы локальной файловой системы проверяются по одному: пакетная проверка выполняется только в S3.
+
+        Args:
+            names (Iterable[str]): Имена файлов.
+
+        Returns:
+            set[str]: Имена файлов, которые существуют в хранилище.
+        """
+        return {name for name in names if self.exists(name)}
+
+    def _multipart_dir(self, upload_id: str) -> Path:
+        """Временная директория для частей файла, загружаемого по частям."""
+        return Path(settings.TEMP_ROOT) / "multipart" / upload_id
+
+    def create_multipart_upload(self, name: str) -> str:  # noqa: ARG002
+        """
+        Начинает загрузку файла по частям.
+
+        Части файла сохраняются во временную директорию `TEMP_ROOT` и объединяются при завершении загрузки.
+
+        Args:
+            name (str): Имя файла, который будет сохранен в хранилище после завершения загрузки.
+
+        Returns:
+            str: Идентификатор загрузки.
+        """
+        upload_id = uuid.uuid4().hex
+        self._multipart_dir(upload_id).mkdir(parents=True, exist_ok=True)
+        return upload_id
+
+    def upload_part(self, name: str, upload_id: str, part_number: int, content: IO[bytes]) -> str:  # noqa: ARG002
+        """
+        Сохраняет часть файла. Содержимое копируется потоком, не загружаясь в память целиком.
+
+        Повторная загрузка части с тем же номером заменяет ранее загруженную часть.
+
+        Args:
+            name (str): Имя файла.
+            upload_id (str): Идентификатор загрузки.
+            part_number (int): Номер части, начиная с 1.
+            content (IO[bytes]): Содержимое части.
+
+        Returns:
+            str: Контрольная сумма MD5 содержимого части.
+        """
+        part_path = self._multipart_dir(upload_id) / f"{part_number:05d}.part"
+        checksum = hashlib.md5(usedforsecurity=False)
+        with part_path.open("wb") as file:
+            while chunk := content.read(MULTIPART_READ_SIZE):
+                checksum.update(chunk)
+                file.write(chunk)
+        return checksum.hexdigest()
+
+    def complete_multipart_upload(self, name: str, upload_id: str, parts: list[dict[str, Any]]) -> str:
+        """
+        Завершает загрузку файла по частям: объединяет части в файл хранилища и удаляет временные файлы.
+
+        Файл записывается под переданным именем, как и в S3, поэтому свободное имя выбирается до начала загрузки.
+
+        Args:
+            name (str): Имя файла.
+            upload_id (str): Идентификатор загрузки.
+            parts (list[dict[str, Any]]): Части файла с ключами `PartNumber` и `ETag` в порядке следования.
+
+        Returns:
+            str: Имя сохраненного файла.
+        """
+        relative_name = self._get_relative_name(name)
+        target_path = Path(self.path(relative_name))
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        upload_dir = self._multipart_dir(upload_id)
+        with target_path.open("wb") as target:
+            for part in parts:
+                with (upload_dir / f"{part['PartNumber']:05d}.part").open("rb") as source:
+                    shutil.copyfileobj(source, target)
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        return relative_name
+
+    def abort_multipart_upload(self, name: str, upload_id: str) -> None:  # noqa: ARG002
+        """
+        Отменяет загрузку файла по частям и удаляет загруженные части.
+
+        Args:
+            name (str): Имя файла.
+            upload_id (str): Идентификатор загрузки.
+        """
+        shutil.rmtree(self._multipart_dir(upload_id), ignore_errors=True)
+
     def joinpath(self, *paths: Union[str, Path]) -> str:
         """
         Объединяет пути в один путь.
@@ -398,9 +531,114 @@ class CustomFileSystemStorage(BaseStorageMixin, FileSystemStorage):
         return Path(path).is_absolute()
 
 
+class S3ClientPool:
+    """
+    Пул клиентов boto3 S3, которые повторно используются потоками процесса.
+
+    Клиент выдается потоку на время выполнения операции (`lease`) и затем возвращается в пул,
+    поэтому установленные соединения (в том числе TLS) переиспользуются разными потоками
+    вместо создания отдельного клиента и соединения в каждом потоке. Клиенты создаются по мере
+    необходимости, но не более `max_size`: если все клиенты заняты, поток ожидает освобождения клиента.
+    Повторный запрос клиента потоком, который уже получил клиент, возвращает тот же клиент.
+    """
+
+    def __init__(self, factory: Callable[[], Any], max_size: int) -> None:
+        """
+        Args:
+            factory: Функция создания нового клиента.
+            max_size: Наибольшее количество клиентов в пуле.
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self._idle: queue.LifoQueue[Any] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.created = 0
+        self.reused = 0
+        self.waited = 0
+        self.in_use = 0
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        """Получить клиент из пула на время выполнения блока `with`."""
+        held = getattr(self._local, "client", None)
+        if held is not None:
+            yield held
+            return
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.waited += 1
+            self._slots.acquire()
+        try:
+            try:
+                client = self._idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                # Клиент создается без блокировки пула, чтобы другие потоки в это время получали
+                # и возвращали свободные клиенты. Количество клиентов ограничено семафором.
+                client = self.factory()
+                reused = False
+            with self._lock:
+                if reused:
+                    self.reused += 1
+                else:
+                    self.created += 1
+                self.in_use += 1
+            self._local.client = client
+            try:
+                yield client
+            finally:
+                self._local.client = None
+                with self._lock:
+                    self.in_use -= 1
+                self._idle.put(client)
+        finally:
+            self._slots.release()
+
+    def metrics(self) -> dict[str, int]:
+        """
+        Показатели использования пула для подбора его размера под нагрузкой.
+
+        Returns:
+            dict[str, int]: Размер пула, количество выданных (`in_use`) и свободных (`idle`) клиентов,
+                количество созданных клиентов, повторных выдач клиентов и ожиданий свободного клиента.
+        """
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "in_use": self.in_use,
+                "idle": self._idle.qsize(),
+                "created": self.created,
+                "reused": self.reused,
+                "waited": self.waited,
+            }
+
+
 class CustomS3Storage(BaseStorageMixin, S3Boto3Storage):
     """Расширенная S3 система хранения с дополнительными методами для работы с файлами."""
 
+    client_config: Config
+    client_pool: S3ClientPool
+
+    def get_default_settings(self) -> dict[str, Any]:
+        """
+        Параметры хранилища по умолчанию, дополненные параметрами пула клиентов и соединений.
+
+        Параметры пула задаются в OPTIONS хранилища наравне с параметрами django-storages:
+        `client_pool_size` - наибольшее количество клиентов и соединений с S3,
+        `tcp_keepalive` - поддержание простаивающих соединений,
+        `retry_mode` и `max_attempts` - режим и количество попыток выполнения запроса.
+        """
+        return {
+            **super().get_default_settings(),
+            "client_pool_size": 10,
+            "tcp_keepalive": True,
+            "retry_mode": "standard",
+            "max_attempts": 3,
+        }
+
     def save(self, name: str, content: Any, *args, **kwargs) -> str:  # noqa: ANN401
         """
         Сохраняет файл в S3 хранилище.
@@ -453,8 +691,14 @@ class CustomS3Storage(BaseStorageMixin, S3Boto3Storage):
             tuple[list[str], list[str]]: Кортеж из двух списков: файлов и подкаталогов.
         """
         try:
-            paginator = self.connection.meta.client.get_paginator("list_objects_v2")
-            pages = paginator.paginate(Bucket=self.bucket_name, Prefix=prefix, Delimiter="/")
+            with self.client_pool.lease() as client:
+                pages = list(
+                    client.get_paginator("list_objects_v2").paginate(
+                        Bucket=self.bucket_name,
+                        Prefix=prefix,
+                        Delimiter="/",
+                    ),
+                )
 
             files = []
             dirs = []
@@ -488,8 +732,95 @@ class CustomS3Storage(BaseStorageMixin, S3Boto3Storage):
             return (files, dirs)
 
     def __init__(self, *args, **kwargs) -> None:
-        """Инициализация хранилища с клиентом Minio."""
+        """
+        Инициализация хранилища.
+
+        К настройкам клиента boto3 добавляются поддержание соединений (TCP keep-alive), режим повторных
+        попыток и размер пула соединений, чтобы соединения клиентов пула не закрывались между запросами.
+        """
         super().__init__(*args, **kwargs)
+        self.client_config = self.client_config.merge(
+            Config(
+                max_pool_connections=self.client_pool_size,
+                tcp_keepalive=self.tcp_keepalive,
+                retries={"mode": self.retry_mode, "max_attempts": self.max_attempts},
+            ),
+        )
+        self.client_pool = S3ClientPool(self._create_client, self.client_pool_size)
+
+    def _create_client(self) -> Any:  # noqa: ANN401
+        """
+        Создать клиент boto3 S3 с параметрами хранилища.
+
+        Каждый клиент создается из новой сессии boto3 (`_create_session`), поэтому клиенты
+        можно создавать одновременно в разных потоках: сессия boto3 не является потокобезопасной.
+        """
+        return self._create_session().client(
+            "s3",
+            region_name=self.region_name,
+            use_ssl=self.use_ssl,
+            endpoint_url=self.endpoint_url,
+            config=self.client_config,
+            verify=self.verify,
+        )
+
+    @cached_property
+    def _resource_class(self) -> type:
+        """Класс ресурса boto3 S3, экземпляры которого связываются с клиентами пула."""
+        return type(
+            self._create_session().resource(
+                "s3",
+                region_name=self.region_name,
+                use_ssl=self.use_ssl,
+                endpoint_url=self.endpoint_url,
+                config=self.client_config,
+                verify=self.verify,
+            ),
+        )
+
+    @property
+    def connection(self) -> Any:  # noqa: ANN401
+        """
+        Ресурс boto3 S3, связанный с клиентом из пула.
+
+        Через `connection` и `bucket` работают унаследованные методы django-storages. Внутри `lease`
+        ресурс использует клиент, выданный потоку, поэтому такие запросы учитываются в `metrics()`.
+        Клиенты boto3 потокобезопасны, поэтому файл S3 может читать данные через свой клиент
+        и после того, как клиент вернулся в пул.
+        """
+        with self.client_pool.lease() as client:
+            return self._resource_class(client=client)
+
+    @property
+    def bucket(self) -> Any:  # noqa: ANN401
+        """Бакет S3, связанный с клиентом из пула. В отличие от django-storages, бакет не кэшируется в хранилище."""
+        return self.connection.Bucket(self.bucket_name)
+
+    def _open(self, name: str, mode: str = "rb") -> Any:  # noqa: ANN401
+        """Открыть файл S3 с клиентом из пула."""
+        with self.client_pool.lease():
+            return super()._open(name, mode)
+
+    def _save(self, name: str, content: Any) -> str:  # noqa: ANN401
+        """Загрузить файл в S3 через клиент из пула."""
+        with self.client_pool.lease():
+            return super()._save(name, content)
+
+    def size(self, name: str) -> int:
+        """Размер файла по метаданным объекта, полученным через клиент из пула."""
+        with self.client_pool.lease():
+            return super().size(name)
+
+    def url(
+        self,
+        name: str,
+        parameters: dict[str, Any] | None = None,
+        expire: int | None = None,
+        http_method: str | None = None,
+    ) -> str:
+        """Ссылка на файл, подписанная клиентом из пула."""
+        with self.client_pool.lease():
+            return super().url(name, parameters, expire, http_method)
 
     @property
     def base_location(self) -> str:
@@ -555,9 +886,10 @@ class CustomS3Storage(BaseStorageMixin, S3Boto3Storage):
         relative_name = self._normalize_s3_path(relative_name)
 
         try:
-            obj = self.connection.Object(self.bucket_name, relative_name)
+            with self.client_pool.lease() as client:
+                response = client.head_object(Bucket=self.bucket_name, Key=relative_name)
             # Получаем время последнего изменения из метаданных объекта
-            modified_time = obj.last_modified
+            modified_time = response["LastModified"]
             # Преобразуем в локальное время Django
             if timezone.is_naive(modified_time):
                 modified_time = timezone.make_aware(modified_time)
@@ -645,25 +977,26 @@ class CustomS3Storage(BaseStorageMixin, S3Boto3Storage):
             relative_path = self._get_relative_name(str(path)).rstrip("/") + "/"
             relative_path = self._normalize_s3_path(relative_path)
 
-            # Получаем список всех объектов с данным префиксом
-            paginator = self.connection.meta.client.get_paginator("list_objects_v2")
-            pages = paginator.paginate(Bucket=self.bucket_name, Prefix=relative_path)
-
-            # Собираем все ключи для удаления
-            delete_keys = []
-            for page in pages:
-                if "Contents" in page:
-                    delete_keys.extend({"Key": obj["Key"]} for obj in page["Contents"])
-
-            # Удаляем все объекты
-            if delete_keys:
-                # S3 позволяет удалять до 1000 объектов за один запрос
-                for i in range(0, len(delete_keys), 1000):
-                    batch = delete_keys[i : i + 1000]
-                    self.connection.meta.client.delete_objects(
-                        Bucket=self.bucket_name,
-                        Delete={"Objects": batch},
-                    )
+            with self.client_pool.lease() as client:
+                # Получаем список всех объектов с данным префиксом
+                paginator = client.get_paginator("list_objects_v2")
+                pages = paginator.paginate(Bucket=self.bucket_name, Prefix=relative_path)
+
+                # Собираем все ключи для удаления
+                delete_keys = []
+                for page in pages:
+                    if "Contents" in page:
+                        delete_keys.extend({"Key": obj["Key"]} for obj in page["Contents"])
+
+                # Удаляем все объекты
+                if delete_keys:
+                    # S3 позволяет удалять до 1000 объектов за один запрос
+                    for i in range(0, len(delete_keys), S3_DELETE_BATCH_SIZE):
+                        batch = delete_keys[i : i + S3_DELETE_BATCH_SIZE]
+                        client.delete_objects(
+                            Bucket=self.bucket_name,
+                            Delete={"Objects": batch},
+                        )
         except Exception as error:
             if not ignore_errors:
                 error_message = f"Не удалось удалить директорию {path}: {error}"
@@ -778,27 +1111,28 @@ class CustomS3Storage(BaseStorageMixin, S3Boto3Storage):
         dst_key = self._get_relative_name(str(dst))
         dst_key = self._normalize_s3_path(dst_key)
 
-        try:
-            # Копируем объект с новым ключом
-            copy_source = {"Bucket": self.bucket_name, "Key": src_key}
-            self.connection.meta.client.copy_object(
-                CopySource=copy_source,
-                Bucket=self.bucket_name,
-                Key=dst_key,
-            )
-        except Exception as error:
-            error_message = f"Не удалось скопировать файл из {src_key} в {dst_key}: {error}"
-            raise ClientError(error_message) from error
-
-        try:
-            # Удаляем исходный объект
-            self.connection.meta.client.delete_object(
-                Bucket=self.bucket_name,
-                Key=src_key,
-            )
-        except Exception as error:
-            error_message = f"Не удалось удалить исходный файл {src_key}: {error}"
-            raise ClientError(error_message) from error
+        with self.client_pool.lease() as client:
+            try:
+                # Копируем объект с новым ключом
+                copy_source = {"Bucket": self.bucket_name, "Key": src_key}
+                client.copy_object(
+                    CopySource=copy_source,
+                    Bucket=self.bucket_name,
+                    Key=dst_key,
+                )
+            except Exception as error:
+                error_message = f"Не удалось скопировать файл из {src_key} в {dst_key}: {error}"
+                raise ClientError(error_message) from error
+
+            try:
+                # Удаляем исходный объект
+                client.delete_object(
+                    Bucket=self.bucket_name,
+                    Key=src_key,
+                )
+            except Exception as error:
+                error_message = f"Не удалось удалить исходный файл {src_key}: {error}"
+                raise ClientError(error_message) from error
 
     def delete(self, name: str, missing_ok: bool = True) -> None:  # noqa: FBT001, FBT002
         """
@@ -812,10 +1146,11 @@ class CustomS3Storage(BaseStorageMixin, S3Boto3Storage):
         relative_name = self._normalize_s3_path(relative_name)
 
         try:
-            self.connection.meta.client.delete_object(
-                Bucket=self.bucket_name,
-                Key=relative_name,
-            )
+            with self.client_pool.lease() as client:
+                client.delete_object(
+                    Bucket=self.bucket_name,
+                    Key=relative_name,
+                )
         except Exception:
             if not missing_ok:
                 raise
@@ -844,11 +1179,12 @@ class CustomS3Storage(BaseStorageMixin, S3Boto3Storage):
 
             # Копируем объект с новым ключом
             copy_source = {"Bucket": self.bucket_name, "Key": src_key}
-            self.connection.meta.client.copy_object(
-                CopySource=copy_source,
-                Bucket=self.bucket_name,
-                Key=dst_key,
-            )
+            with self.client_pool.lease() as client:
+                client.copy_object(
+                    CopySource=copy_source,
+                    Bucket=self.bucket_name,
+                    Key=dst_key,
+                )
         # Файл не существует в S3, пытаемся обработать как локальный файл
         # Проверяем, является ли путь локальным (не начинается с s3://)
         # и существует ли файл в локальной файловой системе
@@ -867,6 +1203,48 @@ class CustomS3Storage(BaseStorageMixin, S3Boto3Storage):
             error_message = f"Файл {src_str} не найден в S3 и не является локальным файлом."
             raise FileNotFoundError(error_message)
 
+    def copy_object(self, src: Union[str, Path], dst: Union[str, Path]) -> None:
+        """
+        Копирование объекта внутри бакета на стороне S3 (CopyObject) без проверки существования источника.
+
+        Args:
+            src (Union[str, Path]): Путь к исходному файлу в хранилище.
+            dst (Union[str, Path]): Путь назначения для файла.
+        """
+        src_key = self._normalize_s3_path(self._get_relative_name(str(src))).lstrip("/")
+        dst_key = self._normalize_s3_path(self._get_relative_name(str(dst))).lstrip("/")
+        with self.client_pool.lease() as client:
+            client.copy_object(
+                CopySource={"Bucket": self.bucket_name, "Key": src_key},
+                Bucket=self.bucket_name,
+                Key=dst_key,
+            )
+
+    def delete_many(self, names: Iterable[str]) -> None:
+        """
+        Удалить несколько файлов запросами DeleteObjects, не более 1000 ключей в каждом.
+
+        Args:
+            names (Iterable[str]): Имена файлов для удаления.
+
+        Raises:
+            ClientError: Если S3 не удалось удалить часть объектов.
+        """
+        keys = [self._normalize_s3_path(self._get_relative_name(name)).lstrip("/") for name in names]
+        errors: list[dict[str, str]] = []
+        with self.client_pool.lease() as client:
+            for start in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+                batch = keys[start : start + S3_DELETE_BATCH_SIZE]
+                response = client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+                errors.extend(response.get("Errors", []))
+        if errors:
+            failed = ", ".join(error["Key"] for error in errors)
+            error_message = f"Не удалось удалить файлы: {failed}"
+            raise ClientError({"Error": {"Message": error_message}}, "DeleteObjects")
+
     def read_bytes(self, name: str) -> bytes:
         """
         Читает содержимое файла в виде байтов.
@@ -879,8 +1257,41 @@ class CustomS3Storage(BaseStorageMixin, S3Boto3Storage):
         """
         relative_name = self._get_relative_name(name)
         relative_name = self._normalize_s3_path(relative_name)
-        obj = self.connection.Object(self.bucket_name, relative_name)
-        return obj.get()["Body"].read()
+        with self.client_pool.lease() as client:
+            return client.get_object(Bucket=self.bucket_name, Key=relative_name)["Body"].read()
+
+    def read_range(self, name: str, start: int, length: int) -> bytes:
+        """
+        Читает фрагмент файла запросом GET с заголовком Range, не загружая объект целиком.
+
+        Args:
+            name: Имя файла.
+            start: Смещение начала фрагмента в байтах.
+            length: Длина фрагмента в байтах.
+
+        Returns:
+            Фрагмент файла. Если файл заканчивается раньше, то фрагмент короче `length`.
+
+        Raises:
+            FileNotFoundError: Если файл не существует.
+        """
+        key = self._normalize_s3_path(self._get_relative_name(name))
+        try:
+            with self.client_pool.lease() as client:
+                response = client.get_object(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    Range=f"bytes={start}-{start + length - 1}",
+                )
+                return response["Body"].read()
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code")
+            if code == "InvalidRange":
+                # Начало фрагмента находится за концом файла.
+                return b""
+            if code in ("NoSuchKey", "404"):
+                raise FileNotFoundError(key) from error
+            raise
 
     def exists(self, name: str) -> bool:
         """
@@ -895,12 +1306,115 @@ class CustomS3Storage(BaseStorageMixin, S3Boto3Storage):
         try:
             relative_name = self._get_relative_name(name)
             relative_name = self._normalize_s3_path(relative_name)
-            self.connection.Object(self.bucket_name, relative_name).load()
+            with self.client_pool.lease() as client:
+                client.head_object(Bucket=self.bucket_name, Key=relative_name)
         except Exception:  # noqa: BLE001
             return False
         else:
             return True
 
+    def existing_files(self, names: Iterable[str]) -> set[str]:
+        """
+        Проверяет наличие нескольких файлов в хранилище.
+
+        Наличие каждого файла проверяется запросом HEAD, а запросы выполняются параллельно в потоках,
+        каждый из которых получает клиент из пула, поэтому одновременно выполняется не больше запросов,
+        чем клиентов в пуле. В отличие от `list_objects_v2` по каталогам, количество запросов не зависит
+        от количества файлов в каталогах и от того, в скольких каталогах находятся проверяемые файлы.
+
+        Args:
+            names (Iterable[str]): Имена файлов.
+
+        Returns:
+            set[str]: Имена файлов, которые существуют в хранилище.
+        """
+        names = list(dict.fromkeys(names))
+        if len(names) <= 1:
+            return {name for name in names if self.exists(name)}
+        with ThreadPoolExecutor(max_workers=min(self.client_pool.max_size, len(names))) as executor:
+            return {name for name, exists in zip(names, executor.map(self.exists, names), strict=True) if exists}
+
+    def create_multipart_upload(self, name: str) -> str:
+        """
+        Начинает загрузку файла по частям (S3 multipart upload).
+
+        Args:
+            name (str): Имя файла.
+
+        Returns:
+            str: Идентификатор загрузки.
+        """
+        key = self._normalize_s3_path(self._get_relative_name(name))
+        content_type = mimetypes.guess_type(key)[0] or "application/octet-stream"
+        with self.client_pool.lease() as client:
+            response = client.create_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=key,
+                ContentType=content_type,
+            )
+        return response["UploadId"]
+
+    def upload_part(self, name: str, upload_id: str, part_number: int, content: IO[bytes]) -> str:
+        """
+        Загружает часть файла. Все части, кроме последней, должны быть не меньше 5 МиБ.
+
+        Args:
+            name (str): Имя файла.
+            upload_id (str): Идентификатор загрузки.
+            part_number (int): Номер части, начиная с 1.
+            content (IO[bytes]): Содержимое части.
+
+        Returns:
+            str: ETag загруженной части.
+        """
+        key = self._normalize_s3_path(self._get_relative_name(name))
+        with self.client_pool.lease() as client:
+            response = client.upload_part(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=content.read(),
+            )
+        return response["ETag"]
+
+    def complete_multipart_upload(self, name: str, upload_id: str, parts: list[dict[str, Any]]) -> str:
+        """
+        Завершает загрузку файла по частям. Объект собирается из частей на стороне S3.
+
+        Args:
+            name (str): Имя файла.
+            upload_id (str): Идентификатор загрузки.
+            parts (list[dict[str, Any]]): Части файла с ключами `PartNumber` и `ETag` в порядке следования.
+
+        Returns:
+            str: Имя сохраненного файла.
+        """
+        key = self._normalize_s3_path(self._get_relative_name(name))
+        with self.client_pool.lease() as client:
+            client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": [{"PartNumber": part["PartNumber"], "ETag": part["ETag"]} for part in parts]},
+            )
+        return key
+
+    def abort_multipart_upload(self, name: str, upload_id: str) -> None:
+        """
+        Отменяет загрузку файла по частям и удаляет загруженные части.
+
+        Args:
+            name (str): Имя файла.
+            upload_id (str): Идентификатор загрузки.
+        """
+        key = self._normalize_s3_path(self._get_relative_name(name))
+        try:
+            with self.client_pool.lease() as client:
+                client.abort_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+        except ClientError:
+            return
+
     def relative_to(self, path: Union[str, Path], other: Union[str, Path]) -> str:
         """
         Вычисляет относительный путь от 'other' к 'path'.
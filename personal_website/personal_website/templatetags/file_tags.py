@@ -5,16 +5,28 @@
 
     {% load file_tags %}
 
+Результаты проверок кэшируются на время обработки запроса (см. `FileExistsCacheMiddleware`).
+Перед циклом по списку объектов наличие всех файлов можно проверить одним пакетом,
+тогда фильтр `file_exists` внутри цикла не обращается к хранилищу.
+
 Examples:
     ```
-    {% if photo.image.name|file_exists %}
-        ...
-    {% endif %}
+    {% prefetch_files_exist photos "image.name" %}
+    {% for photo in photos %}
+        {% if photo.image.name|file_exists %}
+            ...
+        {% endif %}
+    {% endfor %}
     ```
 """
 
+from collections.abc import Iterable
+from operator import attrgetter
+from typing import Any
+
 from django import template
 
+from personal_website.middleware import file_exists_cache
 from personal_website.storages import StorageType, select_storage
 
 register = template.Library()
@@ -31,4 +43,38 @@ def file_exists(file_name: str) -> bool:
     Returns:
         bool: существует файл по указанному пути или нет.
     """
-    return storage.exists(file_name)
+    cache = file_exists_cache.get()
+    if cache is None:
+        return storage.exists(file_name)
+    if file_name not in cache:
+        cache[file_name] = storage.exists(file_name)
+    return cache[file_name]
+
+
+@register.simple_tag
+def prefetch_files_exist(objects: Iterable[Any], attribute: str) -> str:
+    """Проверяет наличие файлов списка объектов в хранилище одним пакетом и сохраняет результат в кэше запроса.
+
+    Args:
+        objects (Iterable[Any]): объекты, например, фотографии или альбомы.
+        attribute (str): путь к атрибуту объекта с именем файла, например, "image.name" или "cover.image.name".
+
+    Returns:
+        str: пустая строка, тэг ничего не выводит в шаблон.
+    """
+    cache = file_exists_cache.get()
+    if cache is None:
+        return ""
+    get_name = attrgetter(attribute)
+    names = set()
+    for obj in objects:
+        try:
+            name = get_name(obj)
+        except AttributeError:
+            continue
+        if name and name not in cache:
+            names.add(name)
+    if names:
+        existing = storage.existing_files(names)
+        cache.update({name: name in existing for name in names})
+    return ""
@@ -0,0 +1,77 @@
+"""Тесты кэширования страниц и сброса кэша сигналами."""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog.factories import CategoryFactory
+from gallery.factories import TagFactory
+from gallery.models import Tag
+from personal_website.cache import bump_generation, get_generations
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "test"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PageCacheTests(TestCase):
+    """Тесты кэширования страниц для неавторизованных пользователей."""
+
+    def setUp(self) -> None:
+        """Очистить кэш перед каждым тестом."""
+        cache.clear()
+        return super().setUp()
+
+    def test_generation_bump(self) -> None:
+        """Номер поколения раздела увеличивается, номера других разделов не меняются."""
+        before = get_generations("blog", "gallery")
+        bump_generation("gallery")
+        after = get_generations("blog", "gallery")
+        self.assertEqual(after["gallery"], before["gallery"] + 1)
+        self.assertEqual(after["blog"], before["blog"])
+
+    def test_page_cached_for_anonymous(self) -> None:
+        """Повторный запрос страницы неавторизованным пользователем не выполняет запросов к базе данных."""
+        self.client.get("/gallery/")
+        with self.assertNumQueries(0):
+            response = self.client.get("/gallery/")
+        self.assertIn("must-revalidate", response["Cache-Control"])
+
+    def test_signal_invalidates_page(self) -> None:
+        """После сохранения объекта раздела страница раздела формируется заново."""
+        self.client.get("/gallery/")
+        tag = TagFactory()
+        self.assertContains(self.client.get("/gallery/"), tag.name)
+
+        with self.subTest("Удаление объекта сбрасывает кэш"):
+            Tag.objects.filter(pk=tag.pk).delete()
+            self.assertNotContains(self.client.get("/gallery/"), tag.name)
+
+        with self.subTest("Изменение объекта другого раздела не сбрасывает кэш раздела"):
+            generation = get_generations("gallery")["gallery"]
+            CategoryFactory()
+            self.assertEqual(get_generations("gallery")["gallery"], generation)
+
+    def test_anonymous_page_without_vary_cookie(self) -> None:
+        """Страница для неавторизованного пользователя не зависит от cookie и отдается без `Vary: Cookie`."""
+        for _ in range(2):
+            response = self.client.get("/blog/")
+            self.assertNotIn("Cookie", response.get("Vary", ""))
+
+    def test_page_not_cached_with_messages(self) -> None:
+        """Страница с непоказанными сообщениями не берется из кэша."""
+        self.client.get("/gallery/")
+        self.client.cookies["messages"] = "message"
+        with CaptureQueriesContext(connection) as context:
+            self.client.get("/gallery/")
+        self.assertTrue(context.captured_queries)
+
+    def test_page_not_cached_for_authenticated(self) -> None:
+        """Для авторизованного пользователя страница не кэшируется, но используются закэшированные фрагменты."""
+        user = User.objects.create_superuser(username="staff_username", password="staff_password")
+        self.client.force_login(user)
+        self.client.get("/gallery/")
+        # Сессия, пользователь и альбомы. Список тэгов берется из кэша фрагмента.
+        with self.assertNumQueries(3):
+            self.client.get("/gallery/")
@@ -0,0 +1,135 @@
+"""Тесты постраничной разбивки по курсору."""
+
+import datetime
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from blog.factories import ArticleFactory
+from blog.models import Article
+from personal_website.paginators import CursorPaginator
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "test"}}
+
+
+class CursorPaginatorTests(TestCase):
+    """Тесты разбивки набора объектов на страницы по курсору."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Создать статьи с разными и совпадающими датами публикации."""
+        published_at = now()
+        for i in range(9):
+            ArticleFactory(published_at=published_at - datetime.timedelta(days=i // 2))
+        return super().setUpTestData()
+
+    def setUp(self) -> None:
+        """Ожидаемый порядок статей: от новых к старым, при совпадении даты - по убыванию первичного ключа."""
+        self.paginator = CursorPaginator(Article.objects.all(), per_page=3, ordering_field="published_at")
+        self.expected = list(Article.objects.order_by(*self.paginator.get_ordering()))
+        return super().setUp()
+
+    def collect_pages(self) -> list[list[Article]]:
+        """Пройти все страницы по курсору `after`."""
+        pages = []
+        page = self.paginator.get_page()
+        pages.append(list(page))
+        while page.has_next():
+            page = self.paginator.get_page(after=page.next_cursor)
+            pages.append(list(page))
+        return pages
+
+    def test_forward_pagination(self) -> None:
+        """Последовательный переход по страницам возвращает все объекты в правильном порядке без повторов."""
+        pages = self.collect_pages()
+        self.assertEqual([len(page) for page in pages], [3, 3, 3])
+        self.assertEqual([article for page in pages for article in page], self.expected)
+
+    def test_backward_pagination(self) -> None:
+        """Переход на предыдущую страницу возвращает те же объекты, что были на ней при прямом переходе."""
+        first_page = self.paginator.get_page()
+        second_page = self.paginator.get_page(after=first_page.next_cursor)
+        third_page = self.paginator.get_page(after=second_page.next_cursor)
+        self.assertFalse(first_page.has_previous())
+        self.assertFalse(third_page.has_next())
+
+        previous_page = self.paginator.get_page(before=third_page.previous_cursor)
+        self.assertEqual(list(previous_page), list(second_page))
+        self.assertTrue(previous_page.has_previous())
+
+        first_again = self.paginator.get_page(before=previous_page.previous_cursor)
+        self.assertEqual(list(first_again), list(first_page))
+        self.assertFalse(first_again.has_previous())
+
+    def test_invalid_cursor(self) -> None:
+        """При неверном курсоре возвращается первая страница."""
+        first_page = self.paginator.get_page()
+        for cursor in ("abc", ",1", "not-a-date,1", "2024-01-01T00:00:00,abc"):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(list(self.paginator.get_page(after=cursor)), list(first_page))
+                self.assertEqual(list(self.paginator.get_page(before=cursor)), list(first_page))
+
+    def test_no_count_query(self) -> None:
+        """Получение страницы выполняется одним запросом без подсчета общего количества объектов."""
+        first_page = self.paginator.get_page()
+        with self.assertNumQueries(1) as context:
+            self.paginator.get_page(after=first_page.next_cursor)
+        self.assertNotIn("COUNT(", context.captured_queries[0]["sql"].upper())
+
+    def test_row_value_condition(self) -> None:
+        """Страница выбирается сравнением строк `(поле, pk)` в порядке индекса `(поле, pk)` без условий на NULL."""
+        first_page = self.paginator.get_page()
+        with CaptureQueriesContext(connection) as context:
+            self.paginator.get_page(after=first_page.next_cursor)
+        sql = context.captured_queries[0]["sql"]
+        self.assertIn('("blog_article"."published_at", "blog_article"."id") < (', sql)
+        self.assertIn('ORDER BY "blog_article"."published_at" DESC, "blog_article"."id" DESC', sql)
+        self.assertNotIn("NULL", sql.upper())
+
+    def test_neighbour_objects(self) -> None:
+        """Соседние объекты определяются в порядке сортировки, в том числе среди объектов с одинаковой датой."""
+        for index, article in enumerate(self.expected):
+            with self.subTest(index=index):
+                previous_article = self.expected[index - 1] if index > 0 else None
+                next_article = self.expected[index + 1] if index < len(self.expected) - 1 else None
+                self.assertEqual(self.paginator.previous_object(article), previous_article)
+                self.assertEqual(self.paginator.next_object(article), next_article)
+
+    def test_neighbour_object_query(self) -> None:
+        """Соседний объект выбирается одним запросом: сравнением строк `(поле, pk)` и чтением одной записи."""
+        article = self.expected[4]
+        with CaptureQueriesContext(connection) as context:
+            self.paginator.next_object(article)
+            self.paginator.previous_object(article)
+        next_sql, previous_sql = (query["sql"] for query in context.captured_queries)
+        self.assertIn('("blog_article"."published_at", "blog_article"."id") < (', next_sql)
+        self.assertIn('ORDER BY "blog_article"."published_at" DESC, "blog_article"."id" DESC LIMIT 1', next_sql)
+        self.assertIn('("blog_article"."published_at", "blog_article"."id") > (', previous_sql)
+        self.assertIn('ORDER BY "blog_article"."published_at" ASC, "blog_article"."id" ASC LIMIT 1', previous_sql)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_approximate_count(self) -> None:
+        """Общее количество объектов считается один раз и затем читается из кэша; без ключа кэша не считается."""
+        cache.clear()
+        with self.assertNumQueries(0):
+            self.assertIsNone(self.paginator.approximate_count)
+        paginator = CursorPaginator(
+            Article.objects.all(),
+            per_page=3,
+            ordering_field="published_at",
+            count_cache_key="articles-count",
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.approximate_count, len(self.expected))
+        ArticleFactory()
+        paginator = CursorPaginator(
+            Article.objects.all(),
+            per_page=3,
+            ordering_field="published_at",
+            count_cache_key="articles-count",
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(paginator.approximate_count, len(self.expected))
@@ -1,20 +1,27 @@
 """Тесты файловых хранилищ."""
 
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from operator import itemgetter
 from pathlib import Path
+from unittest.mock import MagicMock
 
 import boto3  # type: ignore[import-untyped]
 from botocore.client import Config  # type: ignore[import-untyped]
+from botocore.exceptions import ClientError  # type: ignore[import-untyped]
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.storage import FileSystemStorage
 from django.test import SimpleTestCase, override_settings
 
 from personal_website.storages import (
+    S3_DELETE_BATCH_SIZE,
     CustomFileSystemStorage,
     CustomS3Storage,
     FakerFileStorageAdapter,
+    S3ClientPool,
     StorageType,
     select_storage,
 )
@@ -116,6 +123,50 @@ class TestCustomFileSystemStorage(SimpleTestCase):
         self.storage.delete(saved_name)
         self.assertFalse(self.storage.exists(saved_name))
 
+    def test_existing_files(self) -> None:
+        """Тест пакетной проверки наличия файлов."""
+        saved_name = self.storage.save("existing/test_file.txt", ContentFile(b"Test content"))
+        missing_name = "existing/missing_file.txt"
+
+        result = self.storage.existing_files([saved_name, missing_name])
+        self.assertEqual(result, {saved_name})
+
+        self.storage.delete(saved_name)
+
+    def test_multipart_upload(self) -> None:
+        """Тест загрузки файла по частям: части объединяются в порядке номеров, временные файлы удаляются."""
+        name = "multipart/test_file.txt"
+        upload_id = self.storage.create_multipart_upload(name)
+        parts = [
+            {"PartNumber": number, "ETag": self.storage.upload_part(name, upload_id, number, BytesIO(content))}
+            for number, content in ((2, b" content"), (1, b"Test"))
+        ]
+
+        parts.sort(key=itemgetter("PartNumber"))
+        saved_name = self.storage.complete_multipart_upload(name, upload_id, parts)
+        self.assertEqual(self.storage.read_bytes(saved_name), b"Test content")
+        self.assertFalse((Path(settings.TEMP_ROOT) / "multipart" / upload_id).exists())
+
+        self.storage.delete(saved_name)
+
+    def test_read_range(self) -> None:
+        """Тест чтения фрагмента файла: фрагмент за концом файла короче запрошенного."""
+        saved_name = self.storage.save("range/test_file.txt", ContentFile(b"Test content"))
+        self.assertEqual(self.storage.read_range(saved_name, 5, 4), b"cont")
+        self.assertEqual(self.storage.read_range(saved_name, 10, 100), b"nt")
+        self.assertEqual(self.storage.read_range(saved_name, 100, 10), b"")
+        self.storage.delete(saved_name)
+
+    def test_copy_object_and_delete_many(self) -> None:
+        """Тест копирования файла внутри хранилища и удаления нескольких файлов."""
+        saved_name = self.storage.save("copy/source.txt", ContentFile(b"Test content"))
+        self.storage.copy_object(saved_name, "copy/nested/target.txt")
+        self.assertEqual(self.storage.read_bytes("copy/nested/target.txt"), b"Test content")
+
+        self.storage.delete_many([saved_name, "copy/nested/target.txt", "copy/missing.txt"])
+        self.assertFalse(self.storage.exists(saved_name))
+        self.assertFalse(self.storage.exists("copy/nested/target.txt"))
+
 
 @unittest.skipUnless(S3_AVAILABLE, "S3 storage is not available")
 class TestCustomS3Storage(SimpleTestCase):
@@ -191,6 +242,17 @@ class TestCustomS3Storage(SimpleTestCase):
         self.storage.delete(saved_name)
         self.assertFalse(self.storage.exists(saved_name))
 
+    def test_existing_files(self) -> None:
+        """Тест пакетной проверки наличия файлов в S3."""
+        saved_names = [self.storage.save(f"existing/test_file_{i}.txt", ContentFile(b"Test")) for i in range(3)]
+        missing_names = ["existing/missing_file.txt", "other/missing_file.txt"]
+
+        result = self.storage.existing_files(saved_names + missing_names)
+        self.assertEqual(result, set(saved_names))
+
+        for saved_name in saved_names:
+            self.storage.delete(saved_name)
+
     def test_path_returns_s3_uri(self) -> None:
         """Тест возврата S3 URI для файла."""
         filename = "test_file.txt"
@@ -267,6 +329,113 @@ class TestCustomS3Storage(SimpleTestCase):
         self.storage.rmdir("test/directory")
 
 
+class TestCustomS3StorageRequests(SimpleTestCase):
+    """Тесты запросов S3 хранилища с подмененным клиентом, не требующие доступного S3."""
+
+    def setUp(self) -> None:  # noqa: D102
+        self.storage = CustomS3Storage(bucket_name="test-bucket")
+
+    def test_delete_many_batches(self) -> None:
+        """Тест удаления нескольких файлов пачками не более 1000 ключей в запросе DeleteObjects."""
+        client = MagicMock()
+        client.delete_objects.return_value = {}
+        self.storage.client_pool = S3ClientPool(lambda: client, max_size=1)
+        names = [f"photos/{number}.jpg" for number in range(S3_DELETE_BATCH_SIZE + 1)]
+        self.storage.delete_many(names)
+        batches = [call.kwargs["Delete"]["Objects"] for call in client.delete_objects.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [S3_DELETE_BATCH_SIZE, 1])
+        self.assertEqual(batches[1], [{"Key": f"photos/{S3_DELETE_BATCH_SIZE}.jpg"}])
+
+    def test_read_range(self) -> None:
+        """Тест чтения фрагмента объекта запросом GET с заголовком Range."""
+        client = MagicMock()
+        client.get_object.return_value = {"Body": BytesIO(b"cont")}
+        self.storage.client_pool = S3ClientPool(lambda: client, max_size=1)
+        self.assertEqual(self.storage.read_range("range/test_file.txt", 5, 4), b"cont")
+        self.assertEqual(client.get_object.call_args.kwargs["Range"], "bytes=5-8")
+
+        error = ClientError({"Error": {"Code": "InvalidRange"}}, "GetObject")
+        client.get_object.side_effect = error
+        self.assertEqual(self.storage.read_range("range/test_file.txt", 100, 4), b"")
+
+    def test_existing_files_head_requests(self) -> None:
+        """Тест пакетной проверки: по запросу HEAD на файл из разных каталогов без чтения списков каталогов."""
+        client = MagicMock()
+        missing = {"gallery/italy/missing.jpg", "blog/missing.png"}
+
+        def head_object(Bucket: str, Key: str) -> dict:  # noqa: ARG001, N803
+            if Key in missing:
+                raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+            return {}
+
+        client.head_object.side_effect = head_object
+        self.storage.client_pool = S3ClientPool(lambda: client, max_size=2)
+        names = ["gallery/italy/1.jpg", "gallery/italy/missing.jpg", "gallery/nepal/1.jpg", "blog/missing.png"]
+
+        existing = self.storage.existing_files([*names, names[0]])
+        self.assertEqual(existing, {"gallery/italy/1.jpg", "gallery/nepal/1.jpg"})
+        self.assertEqual(client.head_object.call_count, len(names))
+        client.get_paginator.assert_not_called()
+        self.assertLessEqual(self.storage.client_pool.metrics()["created"], 2)
+
+    def test_inherited_methods_use_pool(self) -> None:
+        """Тест методов django-storages: загрузка, открытие, размер и ссылка получают клиент из пула."""
+        client = MagicMock()
+        client.head_object.return_value = {"ContentLength": 4}
+        client.generate_presigned_url.return_value = "https://s3.example.com/pool/test_file.txt"
+        self.storage.client_pool = S3ClientPool(lambda: client, max_size=1)
+
+        self.assertEqual(self.storage._save("pool/test_file.txt", ContentFile(b"data")), "pool/test_file.txt")  # noqa: SLF001
+        self.assertEqual(client.upload_fileobj.call_args.kwargs["Key"], "pool/test_file.txt")
+        self.assertIs(self.storage._open("pool/test_file.txt").obj.meta.client, client)  # noqa: SLF001
+        self.assertEqual(self.storage.size("pool/test_file.txt"), 4)
+        self.assertEqual(self.storage.url("pool/test_file.txt"), "https://s3.example.com/pool/test_file.txt")
+
+        metrics = self.storage.client_pool.metrics()
+        self.assertEqual(metrics["created"], 1)
+        self.assertEqual(metrics["reused"], 3)
+        self.assertEqual(metrics["in_use"], 0)
+
+    def test_client_config(self) -> None:
+        """Тест параметров клиента: размер пула соединений, keep-alive и режим повторных попыток."""
+        storage = CustomS3Storage(bucket_name="test-bucket", client_pool_size=4, retry_mode="adaptive")
+        self.assertEqual(storage.client_config.max_pool_connections, 4)
+        self.assertTrue(storage.client_config.tcp_keepalive)
+        self.assertEqual(storage.client_config.retries["mode"], "adaptive")
+        self.assertEqual(storage.client_pool.max_size, 4)
+
+
+class TestS3ClientPool(SimpleTestCase):
+    """Тесты пула клиентов S3."""
+
+    def test_clients_reused(self) -> None:
+        """Клиенты создаются по мере необходимости и повторно используются разными потоками."""
+        pool = S3ClientPool(object, max_size=2)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            clients = list(executor.map(lambda _: self.lease_client(pool), range(20)))
+        metrics = pool.metrics()
+        self.assertLessEqual(len(set(map(id, clients))), 2)
+        self.assertEqual(metrics["created"] + metrics["reused"], 20)
+        self.assertLessEqual(metrics["created"], 2)
+        self.assertEqual(metrics["in_use"], 0)
+        self.assertEqual(metrics["idle"], metrics["created"])
+
+    def test_nested_lease(self) -> None:
+        """Повторный запрос клиента в том же потоке возвращает тот же клиент без ожидания."""
+        pool = S3ClientPool(object, max_size=1)
+        with pool.lease() as client, pool.lease() as nested:
+            self.assertIs(client, nested)
+            self.assertEqual(pool.metrics()["in_use"], 1)
+        self.assertEqual(pool.metrics()["in_use"], 0)
+
+    @staticmethod
+    def lease_client(pool: S3ClientPool) -> object:
+        """Получить клиент из пула и вернуть его после небольшой задержки."""
+        with pool.lease() as client:
+            time.sleep(0.001)
+            return client
+
+
 class TestFakerFileStorageAdapter(SimpleTestCase):
     """Тесты для адаптера FakerFileStorageAdapter."""
 
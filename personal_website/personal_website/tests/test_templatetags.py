@@ -1,13 +1,18 @@
 """Тесты кастомных тэгов."""
 
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
 
+from django.template import Context, Template
 from django.test import SimpleTestCase
 from faker import Faker
 from faker_file.providers.txt_file import TxtFileProvider  # type:ignore[import-untyped]
 
+from personal_website.middleware import file_exists_cache
 from personal_website.storages import FakerFileStorageAdapter
-from personal_website.templatetags.file_tags import file_exists
+from personal_website.templatetags import file_tags
+from personal_website.templatetags.file_tags import file_exists, prefetch_files_exist
 
 fake = Faker()
 
@@ -21,3 +26,51 @@ class TestFileExistsTag(SimpleTestCase):
         faker_storage = FakerFileStorageAdapter(rel_path=reletive_path)
         txt_file: str = TxtFileProvider(fake).txt_file(storage=faker_storage, raw=False)
         self.assertTrue(file_exists(txt_file))
+
+    def test_file_exists_cached_in_request(self) -> None:
+        """В пределах запроса результат проверки наличия файла берется из кэша."""
+        token = file_exists_cache.set({})
+        try:
+            with patch.object(file_tags.storage, "exists", return_value=True) as exists:
+                self.assertTrue(file_exists("cached/file.txt"))
+                self.assertTrue(file_exists("cached/file.txt"))
+            exists.assert_called_once_with("cached/file.txt")
+        finally:
+            file_exists_cache.reset(token)
+
+
+class TestPrefetchFilesExistTag(SimpleTestCase):
+    """Тесты тэга пакетной проверки наличия файлов в хранилище."""
+
+    def setUp(self) -> None:  # noqa: D102
+        reletive_path = Path(__file__).resolve().stem
+        faker_storage = FakerFileStorageAdapter(rel_path=reletive_path)
+        self.file_name: str = TxtFileProvider(fake).txt_file(storage=faker_storage, raw=False)
+        self.objects = [
+            SimpleNamespace(file=SimpleNamespace(name=self.file_name)),
+            SimpleNamespace(file=SimpleNamespace(name=f"{reletive_path}/missing.txt")),
+            SimpleNamespace(file=None),
+        ]
+
+    def test_prefetch_files_exist(self) -> None:
+        """После пакетной проверки фильтр не обращается к хранилищу."""
+        token = file_exists_cache.set({})
+        try:
+            prefetch_files_exist(self.objects, "file.name")
+            with patch.object(file_tags.storage, "exists") as exists:
+                self.assertTrue(file_exists(self.file_name))
+                self.assertFalse(file_exists(self.objects[1].file.name))
+            exists.assert_not_called()
+        finally:
+            file_exists_cache.reset(token)
+
+    def test_prefetch_files_exist_without_request(self) -> None:
+        """Вне запроса тэг ничего не кэширует."""
+        with patch.object(file_tags.storage, "existing_files") as existing_files:
+            self.assertEqual(prefetch_files_exist(self.objects, "file.name"), "")
+        existing_files.assert_not_called()
+
+    def test_prefetch_files_exist_in_template(self) -> None:
+        """Тэг ничего не выводит в шаблон."""
+        template = Template('{% load file_tags %}{% prefetch_files_exist objects "file.name" %}')
+        self.assertEqual(template.render(Context({"objects": self.objects})), "")
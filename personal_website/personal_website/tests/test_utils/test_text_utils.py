@@ -2,9 +2,19 @@
 
 import random
 
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
 
-from personal_website.utils import generate_random_text, get_slug, has_cyrillic
+from gallery.factories import TagFactory
+from gallery.models import Tag
+from personal_website.utils import (
+    assign_unique_slugs,
+    generate_random_text,
+    get_slug,
+    get_unique_slug,
+    get_unique_slugs,
+    has_cyrillic,
+    html_to_text,
+)
 
 
 class TestGenerateRandomText(SimpleTestCase):
@@ -40,6 +50,15 @@ class HasCyrrillicTests(SimpleTestCase):
         self.assertTrue(cyrillic)
 
 
+class HtmlToTextTests(SimpleTestCase):
+    """Тестирование утилиты получения простого текста из HTML."""
+
+    def test_html_to_text(self) -> None:
+        """Тэги удаляются, мнемоники раскрываются, а слова соседних абзацев не склеиваются."""
+        content = "<h2>Заголовок</h2><p>Первый <b>абзац</b>&nbsp;&laquo;текста&raquo;</p><p>Второй<br>абзац</p>"
+        self.assertEqual(html_to_text(content), "Заголовок Первый абзац «текста» Второй абзац")
+
+
 class TranslitSlugTests(SimpleTestCase):
     """Тестирование утилиты создания транслитерированных текстов."""
 
@@ -54,3 +73,42 @@ class TranslitSlugTests(SimpleTestCase):
         text = "Tuscany"
         slug = get_slug(text)
         self.assertEqual(slug, "tuscany")
+
+
+class UniqueSlugTests(TestCase):
+    """Тестирование утилит создания уникальных слагов."""
+
+    def test_suffix_not_cumulative(self) -> None:
+        """Номер добавляется к исходному слагу, а не к предыдущему варианту."""
+        for _ in range(3):
+            Tag.objects.create(name="IMG_0001")
+        slugs = set(Tag.objects.values_list("slug", flat=True))
+        self.assertEqual(slugs, {"img_0001", "img_0001-2", "img_0001-3"})
+
+    def test_single_query(self) -> None:
+        """Занятые слаги получаются одним запросом."""
+        for _ in range(5):
+            Tag.objects.create(name="Tuscany")
+        with self.assertNumQueries(1):
+            slug = get_unique_slug(Tag(), "Tuscany")
+        self.assertEqual(slug, "tuscany-6")
+
+    def test_similar_slugs_ignored(self) -> None:
+        """Слаги, которые только начинаются с исходного слага, не считаются занятыми."""
+        TagFactory(name="Tuscany trip")
+        TagFactory(name="Tuscany 2013")
+        self.assertEqual(get_unique_slug(Tag(), "Tuscany"), "tuscany")
+
+    def test_batch(self) -> None:
+        """Слаги нескольких объектов уникальны между собой и с сохраненными объектами."""
+        TagFactory(name="Tuscany")
+        with self.subTest("Получение слагов"):
+            slugs = get_unique_slugs(Tag, ["Tuscany", "Langtang", "Tuscany", "Тоскана"])
+            self.assertEqual(slugs, ["tuscany-2", "langtang", "tuscany-3", "toskana"])
+
+        with self.subTest("Заполнение слагов объектов перед bulk_create"):
+            tags = [Tag(name="Tuscany"), Tag(name="Tuscany"), Tag(name="Other", slug="custom")]
+            with self.assertNumQueries(1):
+                assign_unique_slugs(tags, "name")
+            self.assertEqual([tag.slug for tag in tags], ["tuscany-2", "tuscany-3", "custom"])
+            Tag.objects.bulk_create(tags)
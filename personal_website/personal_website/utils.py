@@ -1,10 +1,12 @@
 """Коллекция вспомогательных фукнций и классов."""
 
 import datetime
+import html
 import locale
 import logging
 import re
 import shutil
+from collections.abc import Sequence
 from pathlib import Path
 
 import boto3  # type: ignore[import-untyped]
@@ -13,6 +15,7 @@ from botocore.exceptions import ClientError  # type: ignore[import-untyped]
 from django.conf import settings
 from django.db.models import Model
 from django.utils import timezone
+from django.utils.html import strip_tags
 from django.utils.text import slugify
 from faker import Faker
 from pytils import translit  # type: ignore[import-untyped]
@@ -21,6 +24,9 @@ from personal_website.storages import select_storage
 
 fake = Faker(locale="ru_RU")
 
+# Тэги, на границах которых заканчивается слово: переносы строк и закрывающие тэги блочных элементов.
+BLOCK_TAGS_PATTERN = re.compile(r"<(?:br|hr|/p|/div|/li|/h[1-6]|/td|/th|/tr|/blockquote|/pre)\b[^>]*>", re.IGNORECASE)
+
 
 def str_to_bool(val: str) -> bool:
     """Адаптированная имплементация функции strtobool из стандартной библиотеки distutils."""
@@ -105,6 +111,14 @@ def has_cyrillic(text: str) -> bool:
     return bool(re.search("[а-яА-Я]", text))
 
 
+def html_to_text(content: str) -> str:
+    """Получить из HTML простой текст: без тэгов, с раскрытыми мнемониками и схлопнутыми пробелами.
+
+    Блочные элементы отделяются пробелом, чтобы слова соседних абзацев не склеивались.
+    """
+    return " ".join(html.unescape(strip_tags(BLOCK_TAGS_PATTERN.sub(" ", content))).split())
+
+
 def get_slug(text: str) -> str:
     """Создает слаг из текста."""
     if has_cyrillic(text):
@@ -112,16 +126,51 @@ def get_slug(text: str) -> str:
     return slugify(text)
 
 
+def get_unique_slugs(model: type[Model], texts: Sequence[str], max_length: int = 50) -> list[str]:
+    """Создает слаги, уникальные для данного класса и между собой, для нескольких текстов.
+
+    Все занятые слаги вида `slug` и `slug-N` получаются одним запросом, после чего для каждого
+    текста в памяти выбирается следующий свободный номер: `slug`, `slug-2`, `slug-3` и т. д.
+    """
+    bases = [get_slug(text[:max_length]) for text in texts]
+    if not bases:
+        return []
+    pattern = "|".join(re.escape(base) for base in set(bases))
+    taken = set(model.objects.filter(slug__regex=rf"^({pattern})(-[0-9]+)?$").values_list("slug", flat=True))
+
+    slugs = []
+    next_numbers: dict[str, int] = {}
+    for base in bases:
+        slug = base
+        n = next_numbers.get(base, 1)
+        while slug in taken:
+            n += 1
+            slug = f"{base}-{n}"
+        next_numbers[base] = n
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
 def get_unique_slug(instance: Model, text: str, max_length: int = 50) -> str:
     """Создает уникальный слаг, уникальный для данного класса."""
-    model = instance.__class__
-    truncated_text = text if len(text) <= max_length else text[:max_length]
-    slug = get_slug(truncated_text)
-    n = 1
-    while model.objects.filter(slug=slug).exists():
-        n += 1
-        slug = f"{slug}-{n}"
-    return slug
+    return get_unique_slugs(instance.__class__, [text], max_length)[0]
+
+
+def assign_unique_slugs(instances: Sequence[Model], source: str, max_length: int = 50) -> None:
+    """Заполняет уникальные слаги несохраненных объектов одного класса одним запросом, например перед `bulk_create`.
+
+    Args:
+        instances (Sequence[Model]): Объекты одного класса. Объекты с заполненным слагом не изменяются.
+        source (str): Атрибут объекта, из текста которого создается слаг.
+        max_length (int): Наибольшая длина текста, из которого создается слаг.
+    """
+    pending = [instance for instance in instances if not getattr(instance, "slug", "")]
+    if not pending:
+        return
+    texts = [getattr(instance, source) for instance in pending]
+    for instance, slug in zip(pending, get_unique_slugs(pending[0].__class__, texts, max_length), strict=True):
+        instance.slug = slug
 
 
 def generate_random_text(word_count: int) -> str: